@@ -0,0 +1,101 @@
+"""
+Memoria asignada por "rerun" en el camino de lectura EnergyDataService -> gráficos.
+
+Simula lo que hacen las páginas Energy Performance (horaria y diaria) y
+Life Cycle Impact en cada rerun de Streamlit, sin renderizar, y mide con
+tracemalloc el pico de memoria y los bloques asignados.
+
+Uso:
+    python benchmarks/bench_allocations.py [--reruns 20] [--json]
+"""
+import argparse
+import json
+import statistics
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.services.energy_data_service import EnergyDataService  # noqa: E402
+from src.summary import EnergySummary  # noqa: E402
+from src.plotter import LastDateEnergyPlotter  # noqa: E402
+from src.environmental_indicators.ei_service import EnvironmentalIndicatorsService  # noqa: E402
+from src.environmental_indicators.indicators import GRID_MIX_INDICATORS  # noqa: E402
+
+START_DATE = "2022-06-01"
+DAYS = 7
+INDICATORS = GRID_MIX_INDICATORS
+
+
+def rerun_energy_performance(service, mode):
+    surplus = service.get_surplus_calculator()
+    service.get_daily_full()
+    if mode == "hourly":
+        df_plot = surplus.get_last_hours_from(START_DATE, hours=DAYS * 24)
+        totals = surplus.get_window_totals(START_DATE, hours=DAYS * 24)
+    else:
+        df_plot = surplus.get_daily_aggregated_from(START_DATE, days=DAYS)
+        totals = surplus.get_window_totals(START_DATE, days=DAYS)
+    EnergySummary(df=df_plot, mode=mode, totals=totals)
+    LastDateEnergyPlotter(df_plot, mode=mode)
+
+
+def rerun_life_cycle_impact(service):
+    service.get_daily_full()
+    df_daily = service.get_daily_filtered(START_DATE, DAYS)
+    ei_service = EnvironmentalIndicatorsService(df_daily_energy=df_daily, df_mix_grid=service.get_grid_mix())
+    ei_service.calculate_EI(INDICATORS, start_date=START_DATE, days=DAYS)
+
+
+SCENARIOS = {
+    "energy_performance_hourly": lambda service: rerun_energy_performance(service, "hourly"),
+    "energy_performance_daily": lambda service: rerun_energy_performance(service, "daily"),
+    "life_cycle_impact": rerun_life_cycle_impact,
+}
+
+
+def measure(service, scenario, reruns: int) -> dict:
+    scenario(service)  # calentar cachés (matriz de intensidad, imports perezosos)
+
+    peaks = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(reruns):
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        scenario(service)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - start)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    diff = after.compare_to(before, "filename")
+    return {
+        "peak_kib_per_rerun": round(statistics.median(peaks) / 1024, 1),
+        "net_blocks_per_rerun": round(sum(stat.count_diff for stat in diff) / reruns, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="salida JSON")
+    args = parser.parse_args()
+
+    service = EnergyDataService()
+    service.get_surplus_calculator()
+
+    results = {name: measure(service, scenario, args.reruns) for name, scenario in SCENARIOS.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, stats in results.items():
+        print(f"{name:<28} peak {stats['peak_kib_per_rerun']:>8} KiB/rerun   "
+              f"net blocks/rerun {stats['net_blocks_per_rerun']}")
+
+
+if __name__ == "__main__":
+    main()
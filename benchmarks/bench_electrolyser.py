@@ -0,0 +1,119 @@
+"""
+Coste del despacho del electrolizador (src/optimization/electrolyser.py) sobre la serie completa.
+
+Para cada configuración mide Electrolyser.simulate y reporta las paradas por
+depósito lleno (las que obligan al recorrido hora a hora de _tank_from) y en
+cuántos tramos se agrupan. Como comparación mide la alternativa descartada:
+reanudar la recurrencia vectorizada tramo a tramo entre paradas (segment_scan).
+
+Uso:
+    python benchmarks/bench_electrolyser.py [--repeat 5] [--json]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.services.energy_data_service import EnergyDataService  # noqa: E402
+from src.optimization.electrolyser import Electrolyser, LHV_H2_KWH_PER_KG  # noqa: E402
+from src.optimization.recurrence import clamped_cumsum  # noqa: E402
+
+CONFIGURATIONS = [
+    dict(rated_power_kw=1000.0, min_load=0.1, tank_kg=500.0, offtake_kg_per_hour=2.0),
+    dict(rated_power_kw=3000.0, min_load=0.3, tank_kg=200.0, offtake_kg_per_hour=1.0),
+    dict(rated_power_kw=3000.0, min_load=0.3, tank_kg=2000.0, offtake_kg_per_hour=5.0),
+]
+
+
+def best_of(repeat: int, func) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def segment_scan(electrolyser: Electrolyser, export):
+    """Alternativa descartada: recurrencia vectorizada por tramos entre paradas (misma salida, paso de 1 h)"""
+    surplus = np.nan_to_num(np.asarray(export, dtype=np.float64))
+    rated = electrolyser.rated_power_kw
+    load = np.minimum(surplus, rated) / rated
+    load[load < electrolyser.min_load] = 0.0
+    kg_at_rated = rated / LHV_H2_KWH_PER_KG
+    h2 = kg_at_rated * electrolyser._output_at(load)
+    min_kg = kg_at_rated * float(electrolyser._output_at(electrolyser.min_load))
+    offtake, capacity = electrolyser.offtake_kg_per_hour, electrolyser.tank_kg
+
+    produced, tank = np.empty_like(h2), np.empty_like(h2)
+    level, hour, n = electrolyser.initial_tank * capacity, 0, len(h2)
+    while hour < n:
+        window = 24
+        while hour < n:
+            end = min(hour + window, n)
+            seg_tank = clamped_cumsum(h2[hour:end] - offtake, initial=level, lower=0.0, upper=capacity)
+            unclamped = np.concatenate(([level], seg_tank[:-1])) + h2[hour:end] - offtake
+            seg_produced = h2[hour:end] - np.maximum(unclamped - capacity, 0.0)
+            stops = np.flatnonzero((seg_produced < h2[hour:end]) & (seg_produced < min_kg))
+            stop = hour + stops[0] if len(stops) else end
+            produced[hour:stop], tank[hour:stop] = seg_produced[:stop - hour], seg_tank[:stop - hour]
+            level = tank[stop - 1] if stop > hour else level
+            hour = stop
+            if len(stops):
+                break
+            window *= 2
+        if hour < n:
+            produced[hour] = 0.0
+            tank[hour] = level = max(level - offtake, 0.0)
+            hour += 1
+    return produced, tank
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="salida JSON")
+    args = parser.parse_args()
+
+    export = EnergyDataService().get_surplus_calculator().hourly_columns()["ExportToGrid"]
+    export = np.asarray(export, dtype=np.float64)
+
+    results = []
+    for config in CONFIGURATIONS:
+        electrolyser = Electrolyser(**config)
+        flows = electrolyser.simulate(export)
+
+        kg_at_rated = electrolyser.rated_power_kw / LHV_H2_KWH_PER_KG
+        running = export >= electrolyser.min_load * electrolyser.rated_power_kw
+        stops = np.flatnonzero(running & (flows["H2Production"] == 0))
+        produced, tank = segment_scan(electrolyser, export)
+        results.append({
+            **config,
+            "hours": len(export),
+            "stops": len(stops),
+            "stop_runs": int(1 + np.count_nonzero(np.diff(stops) > 1)) if len(stops) else 0,
+            "simulate_ms": best_of(args.repeat, lambda: electrolyser.simulate(export)) * 1e3,
+            "segment_scan_ms": best_of(args.repeat, lambda: segment_scan(electrolyser, export)) * 1e3,
+            "segment_scan_matches": bool(np.allclose(produced, flows["H2Production"], atol=1e-9 * kg_at_rated)
+                                         and np.allclose(tank, flows["H2Tank"], atol=1e-9 * kg_at_rated)),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(export)} h")
+    for row in results:
+        print(f"{row['rated_power_kw']:>6.0f} kW  min {row['min_load']:.1f}  tank {row['tank_kg']:>6.0f} kg  "
+              f"stops {row['stops']:>5} ({row['stop_runs']:>4} runs)  "
+              f"simulate {row['simulate_ms']:>7.1f} ms  segment scan {row['segment_scan_ms']:>7.1f} ms  "
+              f"{'ok' if row['segment_scan_matches'] else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
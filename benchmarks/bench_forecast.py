@@ -0,0 +1,81 @@
+"""
+Backtest de los modelos de previsión (src/forecasting) sobre todas las fechas de inicio.
+
+Prevé 1-7 días desde cada fecha de inicio de true_data.csv (solo con el
+histórico anterior), reporta MAE/RMSE por modelo, objetivo y día de
+antelación, y mide el tiempo con 1, 2, 4, ... procesos comprobando que
+los resultados en paralelo coinciden con los de un solo proceso.
+
+Uso:
+    python benchmarks/bench_forecast.py [--horizon 7] [--workers 1 2 4 8] [--chunk-days 92] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.services.energy_data_service import EnergyDataService  # noqa: E402
+from src.forecasting.models import HourlyHistory, MAX_HORIZON_DAYS  # noqa: E402
+from src.forecasting.backtest import run_backtest, summarise_backtest  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--horizon", type=int, default=MAX_HORIZON_DAYS, help="días previstos por fecha de inicio")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[n for n in (1, 2, 4, 8, 16, 32) if n <= (os.cpu_count() or 1)])
+    parser.add_argument("--chunk-days", type=int, default=92, help="fechas de inicio por tarea")
+    parser.add_argument("--json", action="store_true", help="salida JSON")
+    args = parser.parse_args()
+
+    history = HourlyHistory.from_calculator(EnergyDataService().get_surplus_calculator())
+
+    timings, reference = [], None
+    for workers in args.workers:
+        t0 = time.perf_counter()
+        df = run_backtest(history, horizon_days=args.horizon, workers=workers, chunk_days=args.chunk_days)
+        seconds = time.perf_counter() - t0
+
+        if reference is None:
+            reference = df
+        timings.append({
+            "workers": workers,
+            "seconds": seconds,
+            "matches_first": bool(np.allclose(df[["MAE", "RMSE"]], reference[["MAE", "RMSE"]], equal_nan=True)),
+        })
+
+    base = timings[0]["seconds"] * timings[0]["workers"]
+    for row in timings:
+        row["speedup"] = base / row["seconds"]
+        row["efficiency"] = row["speedup"] / row["workers"]
+
+    summary = summarise_backtest(reference)
+    if args.json:
+        print(json.dumps({
+            "timings": timings,
+            "summary": summary.to_dict(orient="records"),
+            "by_lead_day": reference.to_dict(orient="records"),
+        }, indent=2))
+        return
+
+    print(f"{args.horizon}-day backtest over {len(history)} h of history, {os.cpu_count()} CPUs")
+    for row in timings:
+        print(f"workers {row['workers']:>3}  {row['seconds']:>7.2f} s  speedup {row['speedup']:>5.2f}  "
+              f"efficiency {row['efficiency']:.0%}  {'ok' if row['matches_first'] else 'MISMATCH'}")
+
+    print("\nWhole horizon (kWh per hour)")
+    print(summary.to_string(index=False, float_format="{:,.1f}".format))
+    print("\nBy lead day (kWh per hour)")
+    print(reference.pivot_table(index="LeadDay", columns=["Target", "Model"], values="MAE")
+          .to_string(float_format="{:,.1f}".format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Tiempo de arranque en frío de app.py (perfil `python -X importtime`).
+
+Ejecuta app.py en un proceso nuevo (modo bare de Streamlit, página
+Introduction), lee el informe de -X importtime y muestra el tiempo total de
+imports, los módulos más caros y las librerías pesadas que se cargaron.
+Sale con código 1 si el total supera el presupuesto.
+
+Uso:
+    python benchmarks/bench_import_time.py [--budget-ms 1500] [--top 15] [--json]
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Librerías que la página de inicio no necesita (deben cargarse de forma perezosa)
+HEAVY_MODULES = ["plotly.express", "matplotlib", "folium", "streamlit_folium", "deep_translator"]
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_app_start() -> tuple:
+    """(filas del informe [(módulo, propio_us, acumulado_us, nivel)], segundos de pared)"""
+    code = "import runpy; runpy.run_path('app.py', run_name='__main__')"
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=1500, help="presupuesto de imports (ms)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="salida JSON")
+    args = parser.parse_args()
+
+    rows, wall = profile_app_start()
+    total_ms = sum(cumulative for _, _, cumulative, level in rows if level == 0) / 1000
+    loaded = set(module for module, *_ in rows)
+    heavy = [module for module in HEAVY_MODULES if module in loaded]
+    top = sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]
+
+    report = {
+        "import_ms": round(total_ms, 1),
+        "wall_ms": round(wall * 1000, 1),
+        "budget_ms": args.budget_ms,
+        "modules": len(rows),
+        "heavy_loaded": heavy,
+        "top": [{"module": module, "cumulative_ms": round(cumulative / 1000, 1)} for module, _, cumulative, _ in top],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"imports {report['import_ms']} ms (budget {args.budget_ms} ms), "
+              f"wall {report['wall_ms']} ms, {report['modules']} modules")
+        print(f"heavy modules loaded at start: {', '.join(heavy) or 'none'}")
+        for row in report["top"]:
+            print(f"  {row['cumulative_ms']:>8.1f} ms  {row['module']}")
+
+    if total_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
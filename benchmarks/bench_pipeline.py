@@ -0,0 +1,312 @@
+"""
+Tiempos del pipeline de datos sin Streamlit: carga -> surplus -> diario -> EI.
+
+Mide cada etapa sobre los CSV de data/ y sobre datos sintéticos escalados
+(10×, 100× filas y N sitios): tiempo (mediana de --repeat, y la primera
+ejecución en frío), pico de RSS del proceso tras la etapa y filas/seg.
+Cada conjunto de datos se mide en un subproceso propio para que el pico de
+RSS de uno no contamine al siguiente.
+
+Uso:
+    python benchmarks/bench_pipeline.py [--scales 1 10 100] [--sites 4] [--repeat 3]
+        [--output benchmarks/results/pipeline.json]
+        [--compare baseline.json --tolerance 0.25]
+
+Con --compare, termina con código 1 si alguna etapa es más lenta que la
+referencia en más de --tolerance (fracción); sirve para detectar regresiones.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: sin ru_maxrss
+    resource = None
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.data_loader import DataLoader  # noqa: E402
+from src.services.energy_data_service import EnergyDataService  # noqa: E402
+from src.streaming_surplus import StreamingSurplusAggregator  # noqa: E402
+from src.surplus_calculator import SurplusCalculator  # noqa: E402
+from src.environmental_indicators.ei_service import EnvironmentalIndicatorsService  # noqa: E402
+from src.environmental_indicators.grid_mix_loader import GridMixStore, parse_grid_mix_csv  # noqa: E402
+from src.environmental_indicators.indicators import GRID_MIX_INDICATORS  # noqa: E402
+
+DEMAND_COL = EnergyDataService.DEMAND_COL
+PRODUCTION_COL = EnergyDataService.PRODUCTION_COL
+DATETIME_FORMAT = EnergyDataService.DATETIME_FORMAT
+
+DATA_DIR = ROOT / "data"
+ENERGY_CSV = DATA_DIR / "true_data.csv"
+GRID_MIX_CSV = DATA_DIR / "percentage_mix_grid_unified.csv"
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results" / "pipeline.json"
+
+WINDOW_DAYS = 7
+# Los datos escalados empiezan aquí para que 100× (~400 años) quepa en datetime64[ns]
+SYNTHETIC_START = pd.Timestamp("1700-01-01")
+
+
+# --------------------------------------------------
+# Datos sintéticos
+# --------------------------------------------------
+def write_scaled_dataset(scale: int, out_dir: Path) -> dict:
+    """
+    Repite `scale` veces las filas de data/ sobre un rango horario continuo
+    (y el mix diario sobre los mismos días). Devuelve las rutas de los CSV.
+    """
+    if scale == 1:
+        return {"energy_csv": str(ENERGY_CSV), "grid_mix_csv": str(GRID_MIX_CSV)}
+
+    df = pd.read_csv(ENERGY_CSV)
+    df = pd.DataFrame({col: np.tile(df[col].to_numpy(), scale) for col in df.columns if col != "Datetime"})
+    df.insert(0, "Datetime", pd.date_range(SYNTHETIC_START, periods=len(df), freq="h"))
+
+    mix = pd.read_csv(GRID_MIX_CSV, sep=";", dtype=str)
+    days = pd.date_range(SYNTHETIC_START, df["Datetime"].iloc[-1].normalize(), freq="D")
+    reps = -(-len(days) // len(mix))
+    mix = pd.DataFrame({col: np.tile(mix[col].to_numpy(), reps)[:len(days)] for col in mix.columns if col != "Datetime"})
+    mix.insert(0, "Datetime", days.strftime("%Y-%m-%d"))
+
+    energy_csv = out_dir / f"energy_x{scale}.csv"
+    grid_mix_csv = out_dir / f"grid_mix_x{scale}.csv"
+    df.to_csv(energy_csv, index=False, date_format=DATETIME_FORMAT)
+    mix.to_csv(grid_mix_csv, index=False, sep=";")
+    return {"energy_csv": str(energy_csv), "grid_mix_csv": str(grid_mix_csv)}
+
+
+def write_sites_dataset(sites: int, out_dir: Path) -> dict:
+    """CSV de contador con `sites` sitios (columna Site), cada uno con las filas de data/"""
+    df = pd.read_csv(ENERGY_CSV, usecols=["Datetime", DEMAND_COL, PRODUCTION_COL])
+    df = pd.concat([df.assign(Site=f"site_{i}") for i in range(sites)], ignore_index=True)
+
+    energy_csv = out_dir / f"energy_{sites}_sites.csv"
+    df.to_csv(energy_csv, index=False)
+    return {"energy_csv": str(energy_csv), "grid_mix_csv": str(GRID_MIX_CSV), "sites": sites}
+
+
+# --------------------------------------------------
+# Medición (dentro del subproceso)
+# --------------------------------------------------
+def peak_rss_mb():
+    """Pico de memoria residente del proceso hasta ahora (None si no se puede medir)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB; macOS: bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_stage(results: dict, name: str, fn, rows: int, repeat: int):
+    """Ejecuta fn() `repeat` veces y guarda tiempos, RSS y filas/seg; devuelve el último resultado"""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - t0)
+
+    seconds = statistics.median(times)
+    results[name] = {
+        "seconds": seconds,
+        "cold_seconds": times[0],
+        "rows": rows,
+        "rows_per_second": rows / seconds if seconds > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    return value
+
+
+def bench_single_site(spec: dict, repeat: int) -> dict:
+    stages = {}
+    value_cols = [DEMAND_COL, PRODUCTION_COL]
+
+    def load(use_cache):
+        return DataLoader(
+            spec["energy_csv"],
+            datetime_col="Datetime",
+            usecols=["Datetime"] + value_cols,
+            dtype={col: "float64" for col in value_cols},
+            datetime_format=DATETIME_FORMAT,
+            use_cache=use_cache
+        ).load()
+
+    df = run_stage(stages, "load_csv", lambda: load(False), 0, repeat)
+    rows = len(df)
+    stages["load_csv"].update(rows=rows, rows_per_second=rows / stages["load_csv"]["seconds"])
+
+    load(True)  # escribe el snapshot Parquet
+    run_stage(stages, "load_cached", lambda: load(True), rows, repeat)
+
+    demand = df[["Datetime", DEMAND_COL]].rename(columns={DEMAND_COL: "Demand"})
+    production = df[["Datetime", PRODUCTION_COL]].rename(columns={PRODUCTION_COL: "Production"})
+
+    def surplus():
+        calculator = SurplusCalculator(demand, production)
+        calculator.calculate()
+        return calculator
+
+    calculator = run_stage(stages, "surplus_calculate", surplus, rows, repeat)
+    df_daily = run_stage(stages, "daily_aggregate_all", calculator.get_daily_aggregated_all, rows, repeat)
+
+    start_date = df_daily["Datetime"].iloc[len(df_daily) // 2]
+    run_stage(
+        stages, "daily_aggregate_window",
+        lambda: calculator.get_daily_aggregated_from(start_date, days=WINDOW_DAYS),
+        WINDOW_DAYS * 24, repeat
+    )
+
+    grid_mix = run_stage(
+        stages, "grid_mix_load",
+        lambda: GridMixStore(parse_grid_mix_csv(spec["grid_mix_csv"])), len(df_daily), repeat
+    )
+
+    # EI sobre todo el rango (la UI usa ventanas de días: es el peor caso)
+    ei_service = EnvironmentalIndicatorsService(df_daily_energy=df_daily, df_mix_grid=grid_mix)
+    run_stage(
+        stages, "ei_daily_tables",
+        lambda: ei_service.calculate_daily_EI_tables(GRID_MIX_INDICATORS, days=len(df_daily)),
+        len(df_daily), repeat
+    )
+    run_stage(
+        stages, "ei_grid_reference",
+        lambda: ei_service.calculate_grid_reference_impacts(GRID_MIX_INDICATORS),
+        len(df_daily), repeat
+    )
+    return {"rows": rows, "days": len(df_daily), "stages": stages}
+
+
+def bench_sites(spec: dict, repeat: int) -> dict:
+    stages = {}
+
+    def ingest():
+        return StreamingSurplusAggregator().ingest_csv(
+            spec["energy_csv"], DEMAND_COL, PRODUCTION_COL,
+            site_col="Site", datetime_format=DATETIME_FORMAT
+        )
+
+    aggregator = run_stage(stages, "stream_ingest", ingest, 0, repeat)
+    rows = aggregator.rows_processed
+    stages["stream_ingest"].update(rows=rows, rows_per_second=rows / stages["stream_ingest"]["seconds"])
+
+    df_daily = run_stage(stages, "daily_all_sites", aggregator.get_daily_all_sites, rows, repeat)
+
+    grid_mix = GridMixStore(parse_grid_mix_csv(spec["grid_mix_csv"]))
+
+    def ei_per_site():
+        return {
+            site: EnvironmentalIndicatorsService(
+                df_daily_energy=aggregator.get_daily(site), df_mix_grid=grid_mix
+            ).calculate_EI(GRID_MIX_INDICATORS, days=len(df_daily))
+            for site in aggregator.sites
+        }
+
+    run_stage(stages, "ei_per_site", ei_per_site, len(df_daily), repeat)
+    return {"rows": rows, "days": len(df_daily), "sites": len(aggregator.sites), "stages": stages}
+
+
+def worker(spec: dict, repeat: int) -> dict:
+    if "sites" in spec:
+        return bench_sites(spec, repeat)
+    return bench_single_site(spec, repeat)
+
+
+# --------------------------------------------------
+# Orquestación
+# --------------------------------------------------
+def run_dataset(name: str, spec: dict, repeat: int) -> dict:
+    completed = subprocess.run(
+        [sys.executable, __file__, "--worker", json.dumps(spec), "--repeat", str(repeat)],
+        check=True, capture_output=True, text=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["dataset"] = name
+    return result
+
+
+def compare(results: dict, baseline_path: str, tolerance: float, min_seconds: float) -> list:
+    """Etapas más lentas que la referencia en más de `tolerance` (se ignoran las muy cortas)"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["datasets"]
+
+    regressions = []
+    for name, dataset in results["datasets"].items():
+        for stage, stats in dataset["stages"].items():
+            reference = baseline.get(name, {}).get("stages", {}).get(stage)
+            if reference is None or reference["seconds"] < min_seconds:
+                continue
+            ratio = stats["seconds"] / reference["seconds"]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{name}/{stage}: {reference['seconds']:.4f}s -> {stats['seconds']:.4f}s ({ratio:.2f}×)")
+    return regressions
+
+
+def print_table(results: dict):
+    print(f"{'dataset':<10} {'stage':<24} {'median s':>10} {'cold s':>10} {'rows/s':>14} {'peak RSS MB':>12}")
+    for name, dataset in results["datasets"].items():
+        for stage, stats in dataset["stages"].items():
+            rate = f"{stats['rows_per_second']:,.0f}" if stats["rows_per_second"] else "-"
+            print(f"{name:<10} {stage:<24} {stats['seconds']:>10.4f} {stats['cold_seconds']:>10.4f} "
+                  f"{rate:>14} {stats['peak_rss_mb'] or '-':>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="múltiplos de las filas de data/")
+    parser.add_argument("--sites", type=int, default=4, help="sitios del conjunto multi-sitio (0 = ninguno)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="resultados en JSON")
+    parser.add_argument("--compare", help="JSON de referencia (de una ejecución anterior)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="lentitud admitida frente a la referencia")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="no comparar etapas más cortas")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(json.loads(args.worker), args.repeat)))
+        return
+
+    results = {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "datasets": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as tmp:
+        tmp = Path(tmp)
+        specs = {f"x{scale}": write_scaled_dataset(scale, tmp) for scale in args.scales}
+        if args.sites:
+            specs[f"{args.sites}_sites"] = write_sites_dataset(args.sites, tmp)
+
+        for name, spec in specs.items():
+            results["datasets"][name] = run_dataset(name, spec, args.repeat)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    print_table(results)
+    print(f"\nresults -> {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance, args.min_seconds)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Escalado del barrido de dimensionado (src/optimization/sweep.py) con el número de procesos.
+
+Evalúa la misma rejilla PV × batería con 1, 2, 4, ... procesos y reporta
+escenarios/seg, aceleración y eficiencia frente a un proceso. Comprueba además
+que los resultados en paralelo coinciden con los de un solo proceso.
+
+Uso:
+    python benchmarks/bench_sweep.py [--scenarios 256] [--workers 1 2 4 8 16 32] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.services.energy_data_service import EnergyDataService  # noqa: E402
+from src.environmental_indicators.indicators import GRID_MIX_INDICATORS  # noqa: E402
+from src.optimization.sweep import build_sweep_arrays, run_sweep, sweep_combinations, sweep_frame  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", type=int, default=256, help="tamaño aproximado de la rejilla")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[n for n in (1, 2, 4, 8, 16, 32) if n <= (os.cpu_count() or 1)])
+    parser.add_argument("--json", action="store_true", help="salida JSON")
+    args = parser.parse_args()
+
+    service = EnergyDataService()
+    arrays, pv_factor = build_sweep_arrays(
+        service.get_surplus_calculator(), service.get_grid_mix(), GRID_MIX_INDICATORS
+    )
+
+    side = max(1, int(round(np.sqrt(args.scenarios))))
+    combinations = sweep_combinations(np.linspace(0.5, 3.0, side), np.linspace(0, 20000, side))
+
+    results, reference = [], None
+    for workers in args.workers:
+        t0 = time.perf_counter()
+        df = sweep_frame(run_sweep(arrays, pv_factor, combinations, workers=workers))
+        seconds = time.perf_counter() - t0
+
+        if reference is None:
+            reference = df
+        results.append({
+            "workers": workers,
+            "scenarios": len(combinations),
+            "seconds": seconds,
+            "scenarios_per_second": len(combinations) / seconds,
+            "matches_first": bool(np.allclose(df.to_numpy(), reference.to_numpy(), equal_nan=True)),
+        })
+
+    base = results[0]["seconds"] * results[0]["workers"]
+    for row in results:
+        row["speedup"] = base / row["seconds"]
+        row["efficiency"] = row["speedup"] / row["workers"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(combinations)} scenarios × {len(arrays['Demand'])} h, {os.cpu_count()} CPUs")
+    for row in results:
+        print(f"workers {row['workers']:>3}  {row['seconds']:>7.2f} s  {row['scenarios_per_second']:>8.1f} sc/s  "
+              f"speedup {row['speedup']:>5.2f}  efficiency {row['efficiency']:.0%}  "
+              f"{'ok' if row['matches_first'] else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
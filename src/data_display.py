@@ -1,15 +1,18 @@
 import streamlit as st
-import plotly.graph_objects as go
 import io
 import pandas as pd
 
+from src.utils.lazy_imports import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+
 class DataDisplay:
     """
     Handles dataframe and Plotly figure visualization with download options in Streamlit.
     Safely handles Plotly image export (requires kaleido).
     """
 
-    def __init__(self, df: pd.DataFrame = None, plotly_fig: go.Figure = None, mode: str = "hourly"):
+    def __init__(self, df: pd.DataFrame = None, plotly_fig: "go.Figure" = None, mode: str = "hourly"):
         """
         :param df: dataframe para exibição e download em CSV
         :param plotly_fig: figura Plotly para exibição e download (JPG/HTML)
@@ -1,16 +1,74 @@
+import time
+
 import pandas as pd
 
+from src.utils.frame_cache import load_cached_frame
+
 class DataLoader:
-    def __init__(self, csv_path: str, datetime_col: str):
+    # Subir al cambiar _parse_csv (invalida los snapshots Parquet ya escritos)
+    PARSER_VERSION = 1
+
+    def __init__(self, csv_path: str, datetime_col: str, usecols=None, dtype=None, datetime_format=None,
+                 use_cache: bool = True):
+        """
+        usecols: columnas a leer (None = todas)
+        dtype: mapa explícito de tipos por columna, evita la inferencia de pandas
+        datetime_format: formato fijo de la columna de fechas (p.ej. "%Y-%m-%d %H:%M:%S")
+        use_cache: reutilizar el snapshot Parquet del CSV (ver src/utils/frame_cache.py)
+        """
         self.csv_path = csv_path
         self.datetime_col = datetime_col
+        self.usecols = usecols
+        self.dtype = dtype
+        self.datetime_format = datetime_format
+        self.use_cache = use_cache
         self.df = None
 
+        # Métricas de la última carga
+        self.load_seconds = None
+        self.rows_per_second = None
+
     def load(self):
-        self.df = pd.read_csv(self.csv_path)
-        self.df[self.datetime_col] = pd.to_datetime(self.df[self.datetime_col])
+        t0 = time.perf_counter()
+
+        self.df = load_cached_frame(
+            self.csv_path,
+            self._parse_csv,
+            key=repr((self.PARSER_VERSION, self.datetime_col, self.usecols, self.dtype, self.datetime_format)),
+            use_cache=self.use_cache
+        )
+
+        self.load_seconds = time.perf_counter() - t0
+        self.rows_per_second = len(self.df) / self.load_seconds if self.load_seconds > 0 else float("inf")
         return self.df
 
+    def _parse_csv(self, csv_path):
+        """Lectura de texto del CSV (solo cuando no hay snapshot válido)"""
+        df = pd.read_csv(csv_path, usecols=self.usecols, dtype=self.dtype)
+        df[self.datetime_col] = pd.to_datetime(df[self.datetime_col], format=self.datetime_format)
+        return df
+
+    def iter_chunks(self, chunksize: int = 100_000):
+        """
+        Lectura en streaming: devuelve el CSV en trozos de `chunksize` filas,
+        con las mismas columnas, tipos y formato de fecha que load().
+        No guarda nada en self.df, así que la memoria no crece con el fichero.
+        """
+        reader = pd.read_csv(self.csv_path, usecols=self.usecols, dtype=self.dtype, chunksize=chunksize)
+        for chunk in reader:
+            chunk[self.datetime_col] = pd.to_datetime(chunk[self.datetime_col], format=self.datetime_format)
+            yield chunk
+
+    def get_load_metrics(self) -> dict:
+        """Devuelve las métricas de la última carga (filas, segundos y filas/seg)"""
+        if self.df is None:
+            raise ValueError("Call load() first.")
+        return {
+            "rows": len(self.df),
+            "seconds": self.load_seconds,
+            "rows_per_second": self.rows_per_second,
+        }
+
     def get_series(self, value_col: str, rename_to: str):
         return (
             self.df[[self.datetime_col, value_col]]
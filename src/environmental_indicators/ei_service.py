@@ -1,6 +1,11 @@
 import pandas as pd
 import numpy as np
 
+from src.environmental_indicators.grid_mix_loader import GridMixStore, get_grid_mix_store
+from src.environmental_indicators.grid_mix_calculator import get_intensity_matrix
+from src.utils.time_index import to_epoch_ns, position_of
+
+
 class EnvironmentalIndicatorsService:
     """
     Servicio para calcular indicadores ambientales diarios a partir
@@ -8,32 +13,54 @@ class EnvironmentalIndicatorsService:
     Devuelve tablas listas para Streamlit.
     """
 
-    def __init__(self, df_daily_energy: pd.DataFrame, csv_mix_grid: str):
+    def __init__(self, df_daily_energy: pd.DataFrame, csv_mix_grid: str = None, df_mix_grid=None):
         """
         df_daily_energy: DataFrame diario con columnas ['Datetime','SelfConsumption','GridConsumption','ExportToGrid']
         csv_mix_grid: CSV con porcentajes diarios de mix energético
+        df_mix_grid: mix ya parseado (GridMixStore o DataFrame); si se pasa, no se lee el CSV
         """
-        self.df_daily_energy = df_daily_energy.copy()
+        # Solo lectura: no se copia (puede ser una vista del diario compartido)
+        self.df_daily_energy = df_daily_energy
 
         # --------------------------
-        # Cargar CSV de mix
-        # --------------------------
-        df_mix = pd.read_csv(csv_mix_grid, sep=";")
-
-        # --------------------------
-        # Convertir porcentajes a float
-        # --------------------------
-        for col in df_mix.columns:
-            if col != "Datetime":
-                df_mix[col] = df_mix[col].replace("-", "0").str.replace(",", ".").astype(float)
-
+        # Mix de red: inyectado o store compartido del proceso
         # --------------------------
-        # Asegurarse de que 'Datetime' es datetime
-        # --------------------------
-        df_mix["Datetime"] = pd.to_datetime(df_mix["Datetime"], dayfirst=False)
-        # Creamos columna solo con fecha
-        df_mix["date"] = df_mix["Datetime"].dt.date
-        self.df_mix_grid = df_mix
+        if df_mix_grid is None:
+            if csv_mix_grid is None:
+                raise ValueError("Provide csv_mix_grid or df_mix_grid.")
+            df_mix_grid = get_grid_mix_store(csv_mix_grid)
+        elif isinstance(df_mix_grid, pd.DataFrame):
+            df_mix_grid = GridMixStore(df_mix_grid)
+
+        self.grid_mix = df_mix_grid
+        self.df_mix_grid = df_mix_grid.df
+
+    METRICS_INFO = {
+        "GWP100": "kg CO2-Eq.",
+        "ADP_fossil": "MJ, net calorific value",
+        "ADP_elements": "kg Sb-Eq",
+        "UDP": "m3 world Eq deprived"
+    }
+
+    def calculate_EI(self, indicators: list, start_date=None, days=7) -> dict:
+        """
+        Motor EI de una sola pasada sobre la ventana seleccionada. Devuelve:
+        - "tables": tablas diarias por métrica (igual que calculate_daily_EI_tables)
+        - "grid_reference": impactos de referencia solo-red por métrica
+          (igual que calculate_grid_reference_impacts, sobre la misma ventana)
+        - "factors": factores por kWh {métrica: {"PV Solar Factor", "Mix Grid Factor"}}
+        """
+        df = self._select_window(start_date, days)
+        impacts = self._compute_impacts(df, indicators)
+        tables = self._build_tables(df, impacts)
+
+        return {
+            "tables": tables,
+            "grid_reference": {
+                metric: values["reference"] for metric, values in impacts.items()
+            },
+            "factors": self._impact_factors(df, tables),
+        }
 
     def calculate_daily_EI_tables(self, indicators: list, start_date=None, days=7):
         """
@@ -46,73 +73,104 @@ class EnvironmentalIndicatorsService:
         start_date: fecha inicial (string 'YYYY-MM-DD' o datetime)
         days: horizonte en días
         """
+        df = self._select_window(start_date, days)
+        return self._build_tables(df, self._compute_impacts(df, indicators))
 
-        df = self.df_daily_energy.copy()
-        df = df.sort_values("Datetime")
+    def calculate_EI_totals(self, indicators: list, start_date=None, days=7) -> dict:
+        """
+        Totales de la ventana por métrica (sin redondeo), para comparar escenarios:
+        {métrica: {"Self Consumption", "Export to Grid", "Import from Grid", "Electrolyser",
+                   "Net Impact", "Grid Reference"}}
+        """
+        df = self._select_window(start_date, days)
+        totals = {}
+        for metric, values in self._compute_impacts(df, indicators).items():
+            grid = float(np.nansum(values["grid"]))
+            self_consumption = float(np.sum(values["self"]))
+            export = float(np.sum(values["export"]))
+            electrolyser = float(np.sum(values.get("electrolyser", 0.0)))
+            totals[metric] = {
+                "Self Consumption": self_consumption,
+                "Export to Grid": export,
+                "Import from Grid": grid,
+                "Electrolyser": electrolyser,
+                "Net Impact": grid + self_consumption + electrolyser - export,
+                "Grid Reference": values["reference"],
+            }
+        return totals
 
-        # --------------------------
-        # Filtrar por fechas
-        # --------------------------
+    # Python
+    def calculate_grid_reference_impacts(self, indicators: list):
+        """
+        Calculate the grid reference impacts assuming all energy demand is supplied by the grid.
+        Returns a dictionary with impacts for each indicator.
+        """
+        impacts = self._compute_impacts(self.df_daily_energy, indicators)
+        return {metric: values["reference"] for metric, values in impacts.items()}
+
+    # --------------------------------------------------
+    # Motor interno
+    # --------------------------------------------------
+    def _select_window(self, start_date, days):
+        """Días ordenados desde start_date, como máximo `days` (vista si ya venían ordenados)"""
+        df = self.df_daily_energy
+        if not df["Datetime"].is_monotonic_increasing:
+            df = df.sort_values("Datetime")
         if start_date is not None:
-            df = df[df["Datetime"] >= pd.to_datetime(start_date)]
-        df = df.head(days)
+            start = position_of(to_epoch_ns(df["Datetime"]), start_date)
+            df = df.iloc[start:]
+        return df.head(days)
 
-        # --------------------------
-        # Merge diario usando solo la fecha
-        # --------------------------
-        df['date'] = df['Datetime'].dt.date
-        df_mix = self.df_mix_grid.copy()
-        df = df.merge(df_mix.drop(columns=['Datetime']), on='date', how='left')
+    def _compute_impacts(self, df, indicators: list) -> dict:
+        """
+        Impactos diarios por métrica con la matriz de intensidad precalculada:
+        grid/self/export (arrays por día) y la referencia solo-red (total).
+        Los días sin mix dan NaN en grid y se ignoran en la referencia.
+        Si el diario trae 'ElectrolyserInput' (energía FV a un electrolizador,
+        ver src/optimization/electrolyser.py) se contabiliza con el factor FV.
+        """
+        matrix = get_intensity_matrix(self.grid_mix, indicators)
+        intensity = matrix.lookup(df["Datetime"])
 
-        # --------------------------
-        # Crear columnas kWh por fuente
-        # --------------------------
-        for ind in indicators:
-            source_col = ind["energy_source"].replace("_kWh", "")
-            if source_col in df.columns:
-                df[ind["energy_source"]] = df["ImportfromGrid"] * df[source_col] / 100.0
-            else:
-                df[ind["energy_source"]] = 0.0  # Si no hay columna, ponemos 0
+        import_from_grid = df["ImportfromGrid"].to_numpy()
+        self_consumption = df["SelfConsumption"].to_numpy()
+        export_to_grid = df["ExportToGrid"].to_numpy()
+        electrolyser = df["ElectrolyserInput"].to_numpy() if "ElectrolyserInput" in df.columns else None
 
-        # --------------------------
-        # Inicializar diccionario de tablas
-        # --------------------------
-        tables = {}
-        metrics_info = {
-            "GWP100": "kg CO2-Eq.",
-            "ADP_fossil": "MJ, net calorific value",
-            "ADP_elements": "kg Sb-Eq",
-            "UDP": "m3 world Eq deprived"
-        }
+        # Total energy demand (kWh_reference)
+        kwh_reference = self_consumption + import_from_grid
+
+        impacts = {}
+        for j, metric in enumerate(matrix.metrics):
+            pv_factor = matrix.pv_factors[j]
+            impacts[metric] = {
+                "grid": import_from_grid * intensity[:, j],
+                "self": self_consumption * pv_factor,
+                "export": export_to_grid * pv_factor,
+                "reference": float(np.nansum(kwh_reference * intensity[:, j])),
+            }
+            if electrolyser is not None:
+                impacts[metric]["electrolyser"] = electrolyser * pv_factor
+        return impacts
+
+    def _build_tables(self, df, impacts: dict) -> dict:
+        """Tablas diarias listas para Streamlit a partir de los impactos"""
+        dates = df["Datetime"].dt.date.to_numpy()
 
-        for metric, unit in metrics_info.items():
+        tables = {}
+        for metric in self.METRICS_INFO:
+            values = impacts[metric]
             table = pd.DataFrame()
-            table["Date"] = df["Datetime"].dt.date
-
-            # GridConsumption
-            total_grid = sum([
-                df[ind["energy_source"]] * ind.get(metric, 0)
-                for ind in indicators
-                if ind.get(metric) is not None
-            ])
-
-            # SelfConsumption (solo PV Solar Power)
-            pv_factor = next((i[metric] for i in indicators if i["energy_source"]=="PV Solar Power_kWh"), 0)
-            total_self = df["SelfConsumption"] * pv_factor
-
-            # ExportToGrid (negativo)
-            total_export = df["ExportToGrid"] * pv_factor
-
-            # Balance
-            total_balance = total_grid + total_self - total_export
+            table["Date"] = dates
 
             # Guardar columnas SIN métricas/unidades en el nombre
-            table["Self Consumption"] = total_self
-            table["Export to Grid"] = total_export
-            table["Import from Grid"] = total_grid
-            table["Net Impact"] = total_balance
-
-            tables[metric] = table
+            table["Self Consumption"] = values["self"]
+            table["Export to Grid"] = values["export"]
+            table["Import from Grid"] = values["grid"]
+            table["Net Impact"] = values["grid"] + values["self"] - values["export"]
+            if "electrolyser" in values:
+                table.insert(3, "Electrolyser", values["electrolyser"])
+                table["Net Impact"] += values["electrolyser"]
 
             # Redondeo de valores (NO tocar ADP_elements)
             if metric != "ADP_elements":
@@ -120,35 +178,25 @@ class EnvironmentalIndicatorsService:
                     if col != "Date":
                         table[col] = table[col].round(1)
 
-        # Eliminamos columna auxiliar 'date'
-        df.drop(columns=['date'], inplace=True)
+            tables[metric] = table
 
         return tables
 
-    # Python
-    def calculate_grid_reference_impacts(self, indicators: list):
+    @staticmethod
+    def _impact_factors(df, tables: dict) -> dict:
         """
-        Calculate the grid reference impacts assuming all energy demand is supplied by the grid.
-        Returns a dictionary with impacts for each indicator.
+        Factores por kWh: impacto total de la tabla / energía total de la ventana.
+        NaN si no hubo energía de ese tipo.
         """
-        df = self.df_daily_energy.copy()
-        df['date'] = df['Datetime'].dt.date
-
-        # Merge with grid mix data
-        df = df.merge(self.df_mix_grid.drop(columns=['Datetime']), on='date', how='left')
-
-        # Total energy demand (kWh_reference)
-        df['kWh_reference'] = df['SelfConsumption'] + df['ImportfromGrid']
-
-        # Initialize dictionary for grid reference impacts
-        grid_reference_impacts = {metric: 0 for metric in ["GWP100", "ADP_fossil", "ADP_elements", "UDP"]}
-
-        # Calculate impacts for each indicator
-        for metric in grid_reference_impacts.keys():
-            total_impact = sum([
-                df['kWh_reference'] * df[ind["energy_source"].replace("_kWh", "")] / 100.0 * ind.get(metric, 0)
-                for ind in indicators if ind.get(metric) is not None
-            ])
-            grid_reference_impacts[metric] = total_impact.sum()
-
-        return grid_reference_impacts
\ No newline at end of file
+        total_self = df["SelfConsumption"].sum()
+        total_grid = df["ImportfromGrid"].sum()
+
+        factors = {}
+        for metric, table in tables.items():
+            total_self_impact = table["Self Consumption"].sum()
+            total_grid_impact = table["Import from Grid"].sum()
+            factors[metric] = {
+                "PV Solar Factor": total_self_impact / total_self if total_self > 0 else np.nan,
+                "Mix Grid Factor": total_grid_impact / total_grid if total_grid > 0 else np.nan,
+            }
+        return factors
@@ -1,12 +1,16 @@
-import numpy as np
 import streamlit as st
-import plotly.graph_objects as go
 import pandas as pd
 
 from src.utils.formating import style_impact_table
 from src.utils.formating import get_inverse_color
 from src.utils.formating import raw_style_impact_table
 from src.utils.formating import add_pv_multiheader
+from src.utils.i18n import t, register_page_strings
+from src.environmental_indicators.indicators import GRID_MIX_INDICATORS
+from src.environmental_indicators.lca_texts import interpretation_notes_markdown, methodology_markdown
+from src.utils.lazy_imports import lazy_import
+
+go = lazy_import("plotly.graph_objects")
 
 EI_METADATA = {
     "GWP100": {
@@ -53,6 +57,14 @@ EI_METADATA = {
     }
 }
 
+# Nombres de indicador de las tarjetas (se traducen con la página)
+register_page_strings("Life Cycle Impact", [meta["name"] for meta in EI_METADATA.values()])
+
+# Columnas de las tablas diarias de EnvironmentalIndicatorsService (por nombre:
+# con ElectrolyserInput se inserta "Electrolyser" y las posiciones cambian)
+IMPACT_COLUMNS = ["Self Consumption", "Export to Grid", "Import from Grid", "Net Impact"]
+ELECTROLYSER_COLUMN = "Electrolyser"
+
 NORMALIZATION_FACTORS = {
     "Climate Change (GWP100)": 7.55E+03,
     "Energy resources: non-renewable (ADP_fossil)": 6.50E+04,
@@ -61,11 +73,112 @@ NORMALIZATION_FACTORS = {
 }
 
 
+class ImpactResults:
+    """
+    Agregados del Life Cycle Impact calculados UNA vez por rerun:
+    totales por columna, referencia solo-red, valores normalizados,
+    ratios frente a la referencia, factores por kWh y totales de energía.
+    Todas las secciones del dashboard leen de aquí.
+    """
+
+    def __init__(self, df_tables: dict, df_daily_energy: pd.DataFrame, grid_reference_impacts: dict,
+                 factors: dict, energy_totals: dict = None):
+        """
+        factors: factores por kWh de EnvironmentalIndicatorsService.calculate_EI
+                 ({métrica: {"PV Solar Factor", "Mix Grid Factor"}}); no se recalculan
+        energy_totals: totales de energía de la ventana ya calculados (sumas acumuladas);
+                       si no se pasan, se suma df_daily_energy
+        """
+        if "Datetime" not in df_daily_energy.columns.str.strip():
+            raise KeyError("'Datetime' column not found in df_daily_energy")
+
+        # --- Totales de energía (kWh) de la ventana ---
+        if energy_totals is None:
+            energy_totals = df_daily_energy[["SelfConsumption", "ImportfromGrid", "ExportToGrid"]].sum()
+        self.total_self_kwh = energy_totals["SelfConsumption"]
+        self.total_grid_kwh = energy_totals["ImportfromGrid"]
+        self.total_export_kwh = energy_totals["ExportToGrid"]
+
+        self.indicators = list(df_tables.keys())
+        self.totals = {}
+        for indicator, table in df_tables.items():
+            # Una sola reducción por tabla: Self, Export, Grid, Net Impact
+            col_sums = table[IMPACT_COLUMNS].sum().to_numpy()
+            total_self, total_export, total_grid, total_net = col_sums
+            # Consumo FV del electrolizador (solo si la tabla lo incluye; ya está en Net Impact)
+            total_electrolyser = table[ELECTROLYSER_COLUMN].sum() if ELECTROLYSER_COLUMN in table else 0.0
+            reference = grid_reference_impacts.get(indicator, 0)
+            name = EI_METADATA.get(indicator, {}).get("name", indicator)
+            nf = NORMALIZATION_FACTORS.get(name, None)
+
+            self.totals[indicator] = {
+                "name": name,
+                "unit": EI_METADATA.get(indicator, {}).get("unit", ""),
+                "self": total_self,
+                "export": total_export,
+                "grid": total_grid,
+                "electrolyser": total_electrolyser,
+                # Net Impact: suma de la columna (tarjetas y %) y balance recalculado (tablas)
+                "net": total_net,
+                "balance": total_self + total_grid - total_export + total_electrolyser,
+                "reference": reference,
+                "normalized": total_net / nf if nf else None,
+                "avoided_pct": abs(total_grid) / reference * 100 if reference != 0 else 0,
+                "net_pct": total_net / reference * 100 if reference != 0 else 0,
+                "net_avoided": reference - total_net if reference != 0 else 0,
+                "pv_factor": factors[indicator]["PV Solar Factor"],
+                "grid_factor": factors[indicator]["Mix Grid Factor"],
+            }
+
+        self.df_raw_impacts = self._raw_impacts_frame()
+        self.df_calculation_results = self._calculation_results_frame()
+        self.df_impact_ratios = self._impact_ratios_frame()
+
+    def _raw_impacts_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {
+                "Indicator": t["name"],
+                "Reference Impact (Grid-Only)": t["reference"],
+                "Self Consumption": t["self"],
+                "Export to Grid": t["export"],
+                "Import from Grid": t["grid"],
+                "Net Impact": t["balance"],
+                "Units": t["unit"],
+            }
+            for t in self.totals.values()
+        ])
+
+    def _calculation_results_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {
+                "Indicator": t["name"],
+                "Relative Environmental Avoided of PV Grid Export (%)": t["avoided_pct"],
+                "Net Environmental Impact (%)": t["net_pct"],
+                "Net Environmental Impact Avoided (PV Installation)": t["net_avoided"],
+                "Units": t["unit"],
+            }
+            for t in self.totals.values()
+        ])
+
+    def _impact_ratios_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {
+                "Indicator": t["name"],
+                "PV Solar Factor": t["pv_factor"],
+                "Mix Grid Factor": t["grid_factor"],
+                "Units": f"{t['unit']} / 1 kWh",
+            }
+            for t in self.totals.values()
+        ])
+
+
 class ImpactAssessment:
-    def __init__(self, df_tables: dict, energy_tables: dict, grid_reference_impacts: dict, time_horizon_days=7, selected_date="2026-01-19"):
+    def __init__(self, df_tables: dict, energy_tables: dict, grid_reference_impacts: dict, factors: dict,
+                 time_horizon_days=7, selected_date="2026-01-19", energy_totals: dict = None):
         self.df_tables = df_tables
         self.df_daily_energy = energy_tables
         self.grid_reference_impacts = grid_reference_impacts  # Initialize grid_reference_impacts
+        self.factors = factors  # Factores por kWh (calculate_EI)
         self.time_horizon_days = time_horizon_days
         self.selected_date = selected_date
         self.colors = {
@@ -75,54 +188,11 @@ class ImpactAssessment:
             "Balance": "#AA4BFF"
         }
 
-        # Crear df_raw_impacts y df_calculation_results aquí
-        self.df_raw_impacts = self._compute_raw_impacts()
-        self.df_calculation_results = self._compute_calculation_results()
-
-    def _compute_raw_impacts(self):
-        raw_impacts = []
-        for indicator, table in self.df_tables.items():
-            self_impact = table.iloc[:, 1].sum()
-            export_impact = table.iloc[:, 2].sum()
-            grid_impact = table.iloc[:, 3].sum()
-            balance_impact = self_impact + grid_impact - export_impact
-            reference_impact = self.grid_reference_impacts.get(indicator, 0)
-
-            raw_impacts.append({
-                "Indicator": indicator,
-                "Reference Impact (Grid-Only)": reference_impact,
-                "Self Consumption": self_impact,
-                "Export to Grid": export_impact,
-                "Import from Grid": grid_impact,
-                "Net Impact": balance_impact
-            })
-
-        df = pd.DataFrame(raw_impacts)
-        df["Units"] = df["Indicator"].map(lambda x: f"{EI_METADATA.get(x, {}).get('unit', '')}")
-        df["Indicator"] = df["Indicator"].map(lambda x: EI_METADATA.get(x, {}).get("name", x))
-        return df
-
-    def _compute_calculation_results(self):
-        calculation_results = []
-        for indicator, table in self.df_tables.items():
-            impact_reference = self.grid_reference_impacts.get(indicator, 0)
-            impact_balance = table.iloc[:, 4].sum()
-
-            avoided_pct = (abs(table.iloc[:, 3].sum()) / impact_reference * 100 if impact_reference != 0 else 0)
-            net_pct = (impact_balance / impact_reference * 100 if impact_reference != 0 else 0)
-            net_pct_num = (impact_reference - impact_balance if impact_reference != 0 else 0)
-
-            calculation_results.append({
-                "Indicator": indicator,
-                "Relative Environmental Avoided of PV Grid Export (%)": avoided_pct,
-                "Net Environmental Impact (%)": net_pct,
-                "Net Environmental Impact Avoided (PV Installation)": net_pct_num
-            })
-
-        df = pd.DataFrame(calculation_results)
-        df["Units"] = df["Indicator"].map(lambda x: f"{EI_METADATA.get(x, {}).get('unit', '')}")
-        df["Indicator"] = df["Indicator"].map(lambda x: EI_METADATA.get(x, {}).get("name", x))
-        return df
+        # Agregados calculados una sola vez (tarjetas, normalizado, tablas, resumen)
+        self.results = ImpactResults(self.df_tables, self.df_daily_energy, self.grid_reference_impacts,
+                                     self.factors, energy_totals=energy_totals)
+        self.df_raw_impacts = self.results.df_raw_impacts
+        self.df_calculation_results = self.results.df_calculation_results
 
     def show_dashboard(self):
         # ==================================================
@@ -130,7 +200,7 @@ class ImpactAssessment:
         # ==================================================
 
         st.markdown(
-            "<h2 style='text-align:center'>Overall Net Environmental Impact</h2>",
+            f"<h2 style='text-align:center'>{t('Overall Net Environmental Impact')}</h2>",
             unsafe_allow_html=True
         )
         st.markdown(
@@ -138,17 +208,14 @@ class ImpactAssessment:
             unsafe_allow_html=True
         )
 
+        results = self.results
         balances, indicator_names, units, indicator_simple_names = [], [], [], []
 
-        # --- Calculamos balance total por indicador ---
-        for name, table in self.df_tables.items():
-            col_balance = table.columns[4]
-            unit = col_balance.split("(")[-1].replace(")", "")
-            balance_total = table.iloc[:, 4].sum()
-            balances.append(balance_total)
-            indicator_names.append(
-                EI_METADATA.get(name, {}).get("name", name)
-            )
+        # --- Balance total por indicador (precalculado en ImpactResults) ---
+        for name in self.df_tables:
+            unit = results.totals[name]["unit"]
+            balances.append(results.totals[name]["net"])
+            indicator_names.append(results.totals[name]["name"])
             indicator_simple_names.append(name)
 
             units.append(unit)
@@ -181,7 +248,7 @@ class ImpactAssessment:
                                 border-radius:12px;
                                 text-align:center;
                                 color:white">
-                        <strong>{name}</strong><br>
+                        <strong>{t(name)}</strong><br>
                         <span style="font-size:22px;font-weight:bold">{formatted}</span><br>
                         <small>{unit}</small>
                     </div>
@@ -190,7 +257,7 @@ class ImpactAssessment:
                 )
 
         with col_info:
-            st.markdown("<h3 style='text-align:center'>Model Information</h3>", unsafe_allow_html=True)
+            st.markdown(f"<h3 style='text-align:center'>{t('Model Information')}</h3>", unsafe_allow_html=True)
             st.markdown(
                 """
                 <div style="background-color:#2f3e46;
@@ -211,13 +278,11 @@ class ImpactAssessment:
         # ==================================================
         st.markdown("")
         normalized_balances = []
-        for simple_name, full_name, value in zip(indicator_simple_names, indicator_names, balances):
-            nf = NORMALIZATION_FACTORS.get(full_name, None)
-            if nf:
-                normalized_balances.append(value / nf)
-            else:
+        for simple_name, full_name in zip(indicator_simple_names, indicator_names):
+            norm_val = results.totals[simple_name]["normalized"]
+            if norm_val is None:
                 st.write(f"Normalization factor not found for {full_name}")
-                normalized_balances.append(None)
+            normalized_balances.append(norm_val)
 
         fig_norm = go.Figure(go.Bar(
             x=indicator_simple_names,
@@ -232,7 +297,7 @@ class ImpactAssessment:
         )
 
         st.markdown(
-            "<h3 style='text-align:center'>Normalized Environmental Impact (EF 3.1)</h3>",
+            f"<h3 style='text-align:center'>{t('Normalized Environmental Impact (EF 3.1)')}</h3>",
             unsafe_allow_html=True
         )
 
@@ -260,7 +325,7 @@ class ImpactAssessment:
                                 border-radius:12px;
                                 text-align:center;
                                 color:white">
-                        <strong>{name}</strong><br>
+                        <strong>{t(name)}</strong><br>
                         <span style="font-size:22px;font-weight:bold">{formatted_norm}</span><br>
                         <small>Normalized (EF 3.1)</small>
                     </div>
@@ -303,7 +368,7 @@ class ImpactAssessment:
         # 3. SUMMARY (CONTRIBUTION ANALYSIS)
         # ==================================================
         st.markdown("")
-        st.markdown(f"<h2 style='text-align:center'>Detailed Environmental Indicator Results</h2>", unsafe_allow_html=True)
+        st.markdown(f"<h2 style='text-align:center'>{t('Detailed Environmental Indicator Results')}</h2>", unsafe_allow_html=True)
         st.markdown(
             f"<h3 style='text-align:center'>{self.time_horizon_days}-day cumulative total from {self.selected_date}</h3>",
             unsafe_allow_html=True
@@ -328,37 +393,14 @@ class ImpactAssessment:
         summary = Summary(
             {selected_indicator: self.df_tables[selected_indicator]},
             self.time_horizon_days,
-            self.selected_date
+            self.selected_date,
+            totals={selected_indicator: results.totals[selected_indicator]}
         )
         summary.show_summary()
 
         # ==================================================
         # First Table: Raw Impacts
-        raw_impacts = []
-        for indicator, table in self.df_tables.items():
-            self_impact = table.iloc[:, 1].sum()
-            export_impact = table.iloc[:, 2].sum()
-            grid_impact = table.iloc[:, 3].sum()
-            balance_impact = self_impact + grid_impact - export_impact
-            reference_impact = self.grid_reference_impacts.get(indicator, 0)
-
-            raw_impacts.append({
-                "Indicator": indicator,
-                "Reference Impact (Grid-Only)": reference_impact,
-                "Self Consumption": self_impact,
-                "Export to Grid": export_impact,
-                "Import from Grid": grid_impact,
-                "Net Impact": balance_impact
-            })
-
-        # Crear DataFrame
-        df_raw_impacts = pd.DataFrame(raw_impacts)
-        df_raw_impacts['Units'] = df_raw_impacts['Indicator'].map(
-            lambda x: f"{EI_METADATA.get(x, {}).get('unit', '')}")
-
-        df_raw_impacts["Indicator"] = df_raw_impacts["Indicator"].map(
-            lambda x: EI_METADATA.get(x, {}).get("name", x)
-        )
+        df_raw_impacts = results.df_raw_impacts
 
         # -------------------------------
         # Agregar fila PV Solar Production
@@ -367,7 +409,7 @@ class ImpactAssessment:
         if {"Self Consumption", "Export to Grid"}.issubset(df_raw_impacts.columns):
             df_raw_impacts = add_pv_multiheader(df_raw_impacts.copy())
 
-        st.markdown("<h2 style='text-align:center'>Raw Environmental Impacts</h2>", unsafe_allow_html=True)
+        st.markdown(f"<h2 style='text-align:center'>{t('Raw Environmental Impacts')}</h2>", unsafe_allow_html=True)
         st.dataframe(
             raw_style_impact_table(
                 df_raw_impacts,
@@ -380,230 +422,36 @@ class ImpactAssessment:
 
         # ==================================================
         # Second Table: Ratio based on 1 kWh
-        # Fix Datetime column name if needed
-        self.df_daily_energy.columns = self.df_daily_energy.columns.str.strip()
-
-        if "Datetime" not in self.df_daily_energy.columns:
-            raise KeyError("'Datetime' column not found in df_daily_energy")
-
-        # Prepare energy data
-        energy_data = self.df_daily_energy[[
-            "Datetime", "SelfConsumption", "ImportfromGrid", "ExportToGrid"
-        ]].copy()
-
-        energy_data = energy_data.rename(columns={"Datetime": "Date"})
-        energy_data["Date"] = pd.to_datetime(energy_data["Date"], errors="coerce")
-        energy_data = energy_data.dropna(subset=["Date"])
-
-        # Calcular totales de kWh para cada caso
-        total_self = energy_data["SelfConsumption"].sum()
-        total_grid = energy_data["ImportfromGrid"].sum()
-        total_export = energy_data["ExportToGrid"].sum()
-
-        impact_ratios = []
-        # Iterate over environmental indicator tables
-        for indicator, table in self.df_tables.items():
-
-            # Ensure Date exists
-            if "Date" not in table.columns:
-                table = table.reset_index()
-
-            table["Date"] = pd.to_datetime(table["Date"], errors="coerce")
-            table = table.dropna(subset=["Date"])
-            # # write los nombres de las columnas
-            # st.write(f"### Columns in table for {indicator}: {table.columns.tolist()}")
-
-            # Extraer los impactos totales directamente de la tabla
-            total_self_impact = table.iloc[:, 1].sum()  # Columna de SelfConsumption Impact
-            # total_export_impact = table.iloc[:, 2].sum()  # Columna de ExportToGrid Impact
-            total_grid_impact = table.iloc[:, 3].sum()  # Columna de ImporttoGrid Impact
-
-            # Calcular los factores dividiendo el impacto total entre la energía total consumida
-            self_factor = total_self_impact / total_self if total_self > 0 else np.nan
-            grid_factor = total_grid_impact / total_grid if total_grid > 0 else np.nan
-            # export_factor = total_export_impact / total_export if total_export > 0 else np.nan
-
-            # Almacenar los factores en la lista
-            impact_ratios.append({
-                "Indicator": indicator,
-                "PV Solar Factor": self_factor,
-                # "Export to Grid": export_factor,
-                "Mix Grid Factor": grid_factor,
-            })
-
-        # Crear un DataFrame con los factores de impacto
-        df_impact_ratios = pd.DataFrame(impact_ratios)
-
-        # Agregar la columna 'Unit' con la unidad de cada indicador
-        df_impact_ratios['Units'] = df_impact_ratios['Indicator'].map(
-            lambda x: f"{EI_METADATA.get(x, {}).get('unit', '')} / 1 kWh"
-        )
-
-        df_impact_ratios["Indicator"] = df_impact_ratios["Indicator"].map(
-            lambda x: EI_METADATA.get(x, {}).get("name", x)
-        )
+        df_impact_ratios = results.df_impact_ratios
 
         # Mostrar la tabla con los valores formateados de 'ADP_elements'
-        st.markdown("<h2 style='text-align:center'>Impact Factors</h2>", unsafe_allow_html=True)
+        st.markdown(f"<h2 style='text-align:center'>{t('Impact Factors')}</h2>", unsafe_allow_html=True)
         st.dataframe(style_impact_table(df_impact_ratios, scientific_all=True), hide_index=True)
 
         # ==================================================
         # Third Table: Calculation Results
-        calculation_results = []
-        for indicator, table in self.df_tables.items():
-            impact_reference = self.grid_reference_impacts.get(indicator, 0)
-            impact_balance = table.iloc[:, 4].sum()
-
-            avoided_pct = (
-                abs(table.iloc[:, 3].sum()) / impact_reference * 100
-                if impact_reference != 0 else 0
-            )
-            net_pct = (
-                impact_balance / impact_reference * 100
-                if impact_reference != 0 else 0
-            )
-            net_pct_num = (
-                impact_reference - impact_balance
-                if impact_reference != 0 else 0
-            )
+        df_calculation_results = results.df_calculation_results
 
-            calculation_results.append({
-                "Indicator": indicator,
-                "Relative Environmental Avoided of PV Grid Export (%)": avoided_pct,
-                "Net Environmental Impact (%)": net_pct,
-                f"Net Environmental Impact Avoided (PV Installation)": net_pct_num
-            })
-
-        df_calculation_results = pd.DataFrame(calculation_results)
-        df_calculation_results['Units'] = df_calculation_results['Indicator'].map(
-            lambda x: f"{EI_METADATA.get(x, {}).get('unit', '')}")
-
-        df_calculation_results["Indicator"] = df_calculation_results["Indicator"].map(
-            lambda x: EI_METADATA.get(x, {}).get("name", x)
-        )
-
-        st.markdown("<h2 style='text-align:center'>Results Comparative calculations with the Reference Impact</h2>", unsafe_allow_html=True)
+        st.markdown(f"<h2 style='text-align:center'>{t('Results Comparative calculations with the Reference Impact')}</h2>", unsafe_allow_html=True)
         st.dataframe(df_calculation_results.style.format({
             "Relative Environmental Avoided of PV Grid Export (%)": "{:.1f}",
             "Net Environmental Impact (%)": "{:.1f}",
             "Net Environmental Impact Avoided (PV Installation)": "{:.2f}"
         }), hide_index=True)
         # st.write("### Notes on Interpretation")
-        st.markdown(r"""
-            - Percentages **greater than 100 %** indicate that the system avoids more environmental impact than it generates under the grid-only reference scenario.
-            - Negative values of **Net Environmental Impact** indicate a **net environmental benefit**.
-            - These indicators are **interpretative metrics** and are therefore presented within the **Interpretation phase**, in accordance with ISO 14040 and ISO 14044.
-                            """
-            )
+        st.markdown(interpretation_notes_markdown())
 
-        with st.expander("📘 Calculation methodology and interpretation criteria"):
-            st.markdown(
-                r"""
-        ### Relative Environmental Avoided of PV Grid Export (%)
-        
-        Represents the relative environmental benefit obtained by exporting photovoltaic
-        electricity to the grid, compared to a reference scenario where the same electricity
-        would be supplied entirely by the conventional grid mix.
-        
-        $$
-        \text{Impact Avoided of PV Grid Export} =
-        \frac{EI_{export}}{EI_{grid\ only}} \times 100
-        $$
-        
-        ---
-        
-        ### Net Environmental Impact (%)
-        
-        Represents the net environmental performance of the system after accounting for
-        self-consumption, grid imports, and avoided impacts due to electricity export.
-        
-        $$
-        \text{Net Impact} =
-        \frac{EI_{total}}{EI_{grid\ only}} \times 100
-        $$
-        
-        ---
-        
-        ### Net Environmental Impact Avoided (PV Installation)
-        
-        Represents the total environmental impact avoided through the installation of the PV solar plant.
-        
-        $$
-        \text{Net Impact Avoided (PV Installation)} = EI_{grid\ only} - EI_{total}
-        $$
-        
-        ---
-        
-        ### Environmental Impact Total
-        
-        The net environmental impact is calculated as:
-        
-        $$
-        EI_{total} = EI_{self} + EI_{grid} - EI_{export}
-        $$
-        
-        where:
-        
-        - $EI_{self}$: Environmental impact associated with self-consumed photovoltaic electricity
-        - $EI_{grid}$: Environmental impact associated with electricity imported from the grid
-        - $EI_{export}$: Avoided environmental impact due to electricity exported to the grid
-        - $EI_{grid\ only}$: Reference impact assuming the total electricity demand is supplied exclusively by the grid
-        
-        ---
-        
-        ### Environmental Impact of Grid-Only Scenario ($EI_{grid\ only}$)
-        
-        Represents the environmental impact assuming the total electricity demand is supplied exclusively by the grid.
-        
-        $$
-        EI_{grid\ only} = \sum \left( kWh_{reference} \times \frac{Mix_{source}}{100} \times EF_{source} \right)
-        $$
-        
-        where:
-        
-        - $kWh_{reference}$: Total electricity demand (self-consumption + grid consumption)
-        - $Mix_{source}$: Percentage contribution of each energy source in the grid mix
-        - $EF_{source}$: Environmental factor for each energy source (e.g., $kg\ CO_2\text{-}Eq/kWh$)
-        
-        ---
-        
-        ### Notes on Interpretation
-        
-        - Percentages **greater than 100 %** indicate that the system avoids more environmental
-          impact than it generates under the grid-only reference scenario.
-        - Negative values of **Net Environmental Impact** indicate a **net environmental benefit**.
-        - These indicators are **interpretative metrics** and are therefore presented within
-          the **Interpretation phase**, in accordance with ISO 14040 and ISO 14044.
-                """
-            )
+        with st.expander(t("📘 Calculation methodology and interpretation criteria")):
+            st.markdown(methodology_markdown())
 
         st.markdown("---")
 
         # Mostrar los valores totales en la interfaz
         st.markdown("<h2 style='text-align:center'>***** DEBUG *****</h2>", unsafe_allow_html=True)
-        st.write("Total Self Consumption (kWh):", total_self)
-        st.write("Total Import from Grid (kWh):", total_grid)
-        st.write("Total Export to Grid (kWh):", total_export)
-        indicators = [
-            {"energy_source": "Hydropower_kWh", "GWP100": 0.004345569, "ADP_fossil": 0.041796964,
-             "ADP_elements": 1.92e-08, "UDP": 0.002012897},
-            {"energy_source": "Nuclear_kWh", "GWP100": 0.006867669, "ADP_fossil": 13.22250307, "ADP_elements": 1.22e-07,
-             "UDP": 0.132012697},
-            {"energy_source": "Coal_kWh", "GWP100": 1.162411024, "ADP_fossil": 11.50390196, "ADP_elements": 2.53e-07,
-             "UDP": 0.080646243},
-            {"energy_source": "Combined Cycle_kWh", "GWP100": 0.542820929, "ADP_fossil": 8.762179906,
-             "ADP_elements": 3.96e-07, "UDP": 0.038174794},
-            {"energy_source": "Wind Power_kWh", "GWP100": 0.014954465, "ADP_fossil": 0.189552053,
-             "ADP_elements": 4.37e-07, "UDP": 0.006437735},
-            {"energy_source": "PV Solar Power_kWh", "GWP100": 0.04708697, "ADP_fossil": 0.675875675,
-             "ADP_elements": 3.07E-07, "UDP": 0.009741405},
-            {"energy_source": "Thermal Solar Power_kWh", "GWP100": 0.053462332, "ADP_fossil": 0.7623678,
-             "ADP_elements": 4.51E-07, "UDP": 0.010223263},
-            {"energy_source": "Cogeneration_kWh", "GWP100": 0.05309101, "ADP_fossil": 0.62826523674379,
-             "ADP_elements": 1.55E-07, "UDP": 0.050522554206717},
-            {"energy_source": "Fuel + Gas_kWh", "GWP100": 0.922840552, "ADP_fossil": 10.92181924,
-             "ADP_elements": 1.85E-07, "UDP": 0.054939536},
-        ]
+        st.write("Total Self Consumption (kWh):", results.total_self_kwh)
+        st.write("Total Import from Grid (kWh):", results.total_grid_kwh)
+        st.write("Total Export to Grid (kWh):", results.total_export_kwh)
+        indicators = GRID_MIX_INDICATORS
         st.write("Indicators:", indicators)
 
 
@@ -615,10 +463,15 @@ class Summary:
     - Unidades incluidas junto a los valores
     """
 
-    def __init__(self, df_tables: dict, time_horizon_days=7, selected_date="2026-01-19"):
+    def __init__(self, df_tables: dict, time_horizon_days=7, selected_date="2026-01-19", totals: dict = None):
+        """
+        totals: totales ya calculados por indicador (ImpactResults.totals);
+                si no se pasan, se suman las tablas
+        """
         self.df_tables = df_tables
         self.time_horizon_days = time_horizon_days
         self.selected_date = selected_date
+        self.totals = totals or {}
 
         # Colores adaptados a la interpretación
         self.colors = {
@@ -630,23 +483,23 @@ class Summary:
 
     def show_summary(self):
         for indicator_name, table in self.df_tables.items():
-            # Extraer las unidades desde los nombres de columna
-            col_self = table.columns[2]  # Self Consumption (unit)
-            col_grid = table.columns[1]  # Grid Consumption (unit)
-            col_export = table.columns[3]  # Export To Grid (unit)
-            col_balance = table.columns[4]  # Balance (unit)
-
-            unit_self = col_self.split('(')[-1].replace(')', '')
-            unit_grid = col_grid.split('(')[-1].replace(')', '')
-            unit_export = col_export.split('(')[-1].replace(')', '')
-            unit_balance = col_balance.split('(')[-1].replace(')', '')
-
-            # Totales acumulados
-            # st.write("columns name table:", table.columns.tolist())
-            total_self = table.iloc[:, 1].sum()
-            total_export = table.iloc[:, 2].sum()
-            total_grid = table.iloc[:, 3].sum()
-            total_balance = total_self + total_grid - total_export  # Balance neto considerando ahorro
+            # Las tablas no llevan unidades en los nombres de columna: vienen de EI_METADATA
+            unit_balance = EI_METADATA.get(indicator_name, {}).get("unit", "")
+
+            # Totales acumulados (columnas por nombre)
+            if indicator_name in self.totals:
+                totals = self.totals[indicator_name]
+                total_self = totals["self"]
+                total_export = totals["export"]
+                total_grid = totals["grid"]
+                total_electrolyser = totals.get("electrolyser", 0.0)
+            else:
+                total_self = table["Self Consumption"].sum()
+                total_export = table["Export to Grid"].sum()
+                total_grid = table["Import from Grid"].sum()
+                total_electrolyser = table[ELECTROLYSER_COLUMN].sum() if ELECTROLYSER_COLUMN in table else 0.0
+            # Balance neto considerando ahorro (y el consumo del electrolizador, si lo hay)
+            total_balance = total_self + total_grid - total_export + total_electrolyser
 
             # Labels y valores
             labels = ['Self Consumption 🔄', 'Export to Grid ➡️', 'Import from Grid ⬅️']
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from src.environmental_indicators.grid_mix_loader import GridMixStore
+
+
+METRICS = ["GWP100", "ADP_fossil", "ADP_elements", "UDP"]
+PV_SOURCE = "PV Solar Power_kWh"
+
+
+def _indicators_key(indicators: list) -> tuple:
+    """Clave hashable de la lista de indicadores (factores por fuente)"""
+    return tuple(tuple(sorted(ind.items())) for ind in indicators)
+
+
+class GridIntensityMatrix:
+    """
+    Intensidad diaria de la red: impacto por kWh importado, matriz día × métrica.
+
+        intensity[día, métrica] = Σ_fuente mix%[día, fuente] / 100 · factor[fuente, métrica]
+
+    El mix y los factores son fijos, así que la matriz se calcula una vez para
+    todo el rango del CSV y cualquier ventana se resuelve con un producto vectorizado.
+    """
+
+    def __init__(self, grid_mix: GridMixStore, indicators: list, metrics: list = METRICS):
+        df_mix = grid_mix.df
+        self.metrics = list(metrics)
+        self.days = pd.DatetimeIndex(df_mix.index)
+
+        values = np.zeros((len(df_mix), len(self.metrics)))
+        for j, metric in enumerate(self.metrics):
+            for ind in indicators:
+                if ind.get(metric) is None:
+                    continue
+                # Fuentes sin columna en el mix aportan 0
+                source_col = ind["energy_source"].replace("_kWh", "")
+                if source_col in df_mix.columns:
+                    values[:, j] += df_mix[source_col].to_numpy() / 100.0 * ind[metric]
+        self.values = values
+
+        # Factor PV (autoconsumo y exportación), por métrica
+        self.pv_factors = np.array([
+            next((ind[metric] for ind in indicators if ind["energy_source"] == PV_SOURCE), 0)
+            for metric in self.metrics
+        ], dtype=float)
+
+    def lookup(self, dates) -> np.ndarray:
+        """
+        Filas de intensidad para las fechas dadas (n × métricas).
+        Los días sin mix quedan en NaN, igual que el merge 'left' original.
+        """
+        positions = self.days.get_indexer(pd.DatetimeIndex(dates).normalize())
+        rows = self.values[positions]
+        rows[positions < 0] = np.nan
+        return rows
+
+    def to_frame(self) -> pd.DataFrame:
+        """Matriz como DataFrame (índice = día, columnas = métricas)"""
+        return pd.DataFrame(self.values, index=self.days, columns=self.metrics)
+
+
+def get_intensity_matrix(grid_mix: GridMixStore, indicators: list) -> GridIntensityMatrix:
+    """
+    Devuelve la matriz de intensidad del mix para estos indicadores,
+    memorizada en el propio GridMixStore (se calcula una vez por proceso).
+    """
+    key = ("intensity", _indicators_key(indicators))
+    if key not in grid_mix.derived_cache:
+        grid_mix.derived_cache[key] = GridIntensityMatrix(grid_mix, indicators)
+    return grid_mix.derived_cache[key]
@@ -0,0 +1,73 @@
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from src.utils.frame_cache import load_cached_frame, source_signature
+
+# Subir al cambiar parse_grid_mix_csv (invalida los snapshots Parquet ya escritos)
+GRID_MIX_PARSER_VERSION = 1
+
+
+def parse_grid_mix_csv(csv_mix_grid) -> pd.DataFrame:
+    """
+    Lee el CSV de mix (separador ';' y decimales con coma) y devuelve
+    porcentajes float y 'Datetime' como datetime.
+    """
+    df_mix = pd.read_csv(csv_mix_grid, sep=";")
+
+    # --------------------------
+    # Convertir porcentajes a float
+    # --------------------------
+    for col in df_mix.columns:
+        if col != "Datetime":
+            df_mix[col] = df_mix[col].replace("-", "0").str.replace(",", ".").astype(float)
+
+    # --------------------------
+    # Asegurarse de que 'Datetime' es datetime
+    # --------------------------
+    df_mix["Datetime"] = pd.to_datetime(df_mix["Datetime"], dayfirst=False)
+    return df_mix
+
+
+class GridMixStore:
+    """
+    Mix diario de la red ya parseado (% por fuente), indexado por fecha.
+    Se construye una vez por proceso y se comparte en solo lectura.
+    """
+
+    def __init__(self, df_mix: pd.DataFrame):
+        df_mix = df_mix.copy()
+
+        # Columna solo con fecha (clave de merge con los datos diarios)
+        if "date" not in df_mix.columns:
+            df_mix["date"] = df_mix["Datetime"].dt.date
+
+        df_mix.index = pd.DatetimeIndex(df_mix["Datetime"].dt.normalize(), name="Day")
+        self.df = df_mix
+
+        # Derivados precalculados (p.ej. matrices de intensidad, ver grid_mix_calculator)
+        self.derived_cache = {}
+
+    @property
+    def sources(self) -> list:
+        """Fuentes de energía disponibles en el mix"""
+        return [col for col in self.df.columns if col not in ("Datetime", "date")]
+
+    @classmethod
+    def from_csv(cls, csv_mix_grid) -> "GridMixStore":
+        return cls(load_cached_frame(csv_mix_grid, parse_grid_mix_csv, key=f"grid_mix.v{GRID_MIX_PARSER_VERSION}"))
+
+
+@lru_cache(maxsize=4)
+def _load_grid_mix_store(csv_mix_grid: str, signature: str) -> GridMixStore:
+    return GridMixStore.from_csv(csv_mix_grid)
+
+
+def get_grid_mix_store(csv_mix_grid) -> GridMixStore:
+    """
+    Devuelve el GridMixStore del CSV, memorizado por proceso.
+    Se vuelve a parsear solo si el CSV cambia (mtime/tamaño).
+    """
+    csv_mix_grid = str(Path(csv_mix_grid).resolve())
+    return _load_grid_mix_store(csv_mix_grid, source_signature(csv_mix_grid))
@@ -0,0 +1,23 @@
+# Factores de impacto por kWh de cada fuente del mix de red (EF v3.1, Ecoinvent v3.11).
+# "energy_source" es la columna del mix (con sufijo _kWh); la fuente fotovoltaica
+# da también el factor de la planta (ver grid_mix_calculator.PV_SOURCE).
+GRID_MIX_INDICATORS = [
+    {"energy_source": "Hydropower_kWh", "GWP100": 0.004345569, "ADP_fossil": 0.041796964,
+     "ADP_elements": 1.92e-08, "UDP": 0.002012897},
+    {"energy_source": "Nuclear_kWh", "GWP100": 0.006867669, "ADP_fossil": 13.22250307, "ADP_elements": 1.22e-07,
+     "UDP": 0.132012697},
+    {"energy_source": "Coal_kWh", "GWP100": 1.162411024, "ADP_fossil": 11.50390196, "ADP_elements": 2.53e-07,
+     "UDP": 0.080646243},
+    {"energy_source": "Combined Cycle_kWh", "GWP100": 0.542820929, "ADP_fossil": 8.762179906,
+     "ADP_elements": 3.96e-07, "UDP": 0.038174794},
+    {"energy_source": "Wind Power_kWh", "GWP100": 0.014954465, "ADP_fossil": 0.189552053,
+     "ADP_elements": 4.37e-07, "UDP": 0.006437735},
+    {"energy_source": "PV Solar Power_kWh", "GWP100": 0.04708697, "ADP_fossil": 0.675875675,
+     "ADP_elements": 3.07E-07, "UDP": 0.009741405},
+    {"energy_source": "Thermal Solar Power_kWh", "GWP100": 0.053462332, "ADP_fossil": 0.7623678,
+     "ADP_elements": 4.51E-07, "UDP": 0.010223263},
+    {"energy_source": "Cogeneration_kWh", "GWP100": 0.05309101, "ADP_fossil": 0.62826523674379,
+     "ADP_elements": 1.55E-07, "UDP": 0.050522554206717},
+    {"energy_source": "Fuel + Gas_kWh", "GWP100": 0.922840552, "ADP_fossil": 10.92181924,
+     "ADP_elements": 1.85E-07, "UDP": 0.054939536},
+]
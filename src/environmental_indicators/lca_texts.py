@@ -0,0 +1,280 @@
+"""
+Textos largos de la página Life Cycle Impact: cuerpos de las fases ISO 1-4 y
+la metodología de cálculo.
+
+La prosa pasa por t() (registrada en PAGE_SOURCES de src/utils/i18n.py); las
+fórmulas LaTeX, los nombres propios y las etiquetas HTML quedan fuera de los
+textos traducibles. Los textos con datos usan campos {nombre} que se rellenan
+después de traducir (las traducciones conservan los mismos campos).
+"""
+from src.utils.i18n import t
+
+
+ORGANISATION = "Comunidad de Regantes del Valle Inferior del Guadalquivir (Seville, Spain)"
+
+_LIST_STYLE = "list-style-position: inside; margin:0; padding:0;"
+_ITEM_STYLE = "margin:0; padding:0;"
+
+
+# --------------------------------------------------
+# Bloques HTML
+# --------------------------------------------------
+def _card(body: str, background: str, padding: int = 18, extra_style: str = "") -> str:
+    """Tarjeta oscura de las fases ISO (sin líneas en blanco: Markdown la trata como un solo bloque HTML)"""
+    return (
+        f'<div style="background-color:{background}; padding:{padding}px; border-radius:14px; color:white; '
+        f'box-shadow:0 4px 10px rgba(0,0,0,0.18); line-height:1.6;{extra_style}">'
+        f"{body}</div>"
+    )
+
+
+def _label(text: str) -> str:
+    return f'<strong style="font-size:20px">{text}</strong>'
+
+
+def _titled_list(title: str, items: list) -> str:
+    lis = "".join(f'<li style="{_ITEM_STYLE}">{item}</li>' for item in items)
+    return (
+        f'<div style="{_ITEM_STYLE}">'
+        f'<strong style="font-size:20px; display:block; margin-bottom:0;">{title}</strong>'
+        f'<ul style="{_LIST_STYLE}">{lis}</ul></div>'
+    )
+
+
+# --------------------------------------------------
+# Fase 1: objetivo y alcance
+# --------------------------------------------------
+def goal_html() -> str:
+    intro = t(
+        "The goal of this LCA study is to provide competent authorities of the {organisation} with "
+        "information on the environmental impacts associated with electricity generation and "
+        "consumption in the study area."
+    ).format(organisation=f"<strong>{ORGANISATION}</strong>")
+    includes = "".join(f"<li>{item}</li>" for item in (
+        t("Photovoltaic solar energy for self-consumption (6,000 kWp plant)"),
+        t("Export of surplus electricity to the grid"),
+        t("Electricity consumption from the conventional grid"),
+    ))
+    return _card(
+        f"{intro}<br><br>{t('This includes:')}<ul>{includes}</ul>"
+        + t("The results may be used in comparative assertions regarding the environmental performance "
+            "of different energy scenarios, intended for public disclosure.")
+        + "<br><br>"
+        + t("The primary objective is to support decision-making for optimizing the local energy system, "
+            "where environmental impacts are one of the decision criteria."),
+        background="#2f3e46"
+    )
+
+
+def scope_html() -> str:
+    return _card(
+        _label(t("Product system:")) + " "
+        + t("6,000 kWp photovoltaic solar plant in the {organisation}.").format(organisation=ORGANISATION)
+        + "<br><br>"
+        + _titled_list(t("Functions of the system:"), [
+            t("Provide electricity for self-consumption"),
+            t("Export surplus electricity to the grid"),
+            t("Supply electricity from the conventional grid when needed"),
+        ])
+        + "<br>"
+        + _label(t("Functional unit:")) + " " + t("1 kWh of electricity delivered to the system.") + "<br>"
+        + _label(t("System boundary:")) + " "
+        + t("Cradle-to-use, operational phase only (self-consumption, export, grid usage).") + "<br><br>"
+        + _titled_list(t("Impact categories:"), [
+            t("Global Warming Potential (GWP100)"),
+            t("Abiotic Depletion Potential - Fossil Fuels (ADP_fossil)"),
+            t("Abiotic Depletion Potential - Elements (ADP_elements)"),
+            t("User Deprivation Potential (UDP)"),
+        ])
+        + "<br>"
+        + _label(t("Methodology:")) + " " + t("Environmental Footprint (EF v3.1) with Ecoinvent v3.11 database.")
+        + "<br>"
+        + _label(t("Data requirements:")) + " "
+        + t("Hourly electricity generation and consumption data converted to daily totals. For grid "
+            "electricity, the daily contribution of each energy source was derived from the Red Eléctrica "
+            "de España data.")
+        + "<br>"
+        + _label(t("Assumptions & Limitations:")) + " "
+        + t("Only the operational phase is analyzed (daily, 3-day, or 7-day periods); upstream and "
+            "end-of-life stages are excluded; data are representative of the system and study area."),
+        background="#3d5a80"
+    )
+
+
+# --------------------------------------------------
+# Fase 2: inventario (LCI)
+# --------------------------------------------------
+def inventory_html() -> str:
+    return _card(
+        _titled_list(t("Impact categories:"), [
+            t("Global Warming Potential (GWP100): Contribution to climate change (kg CO2-Eq)."),
+            t("Abiotic Depletion Potential - Fossil Fuels (ADP_fossil): Depletion of fossil resources (MJ)."),
+            t("Abiotic Depletion Potential - Elements (ADP_elements): Scarcity of critical minerals (kg Sb-Eq)."),
+            t("User Deprivation Potential (UDP): Freshwater consumption (m³ world Eq deprived)."),
+        ])
+        + "<br>"
+        + _titled_list(t("Methodology:"), [
+            t("Environmental Footprint (EF v3.1) with Ecoinvent v3.11 database."),
+            t("Daily grid mix fractions derived from Red Eléctrica de España data."),
+        ])
+        + "<br>"
+        + _titled_list(t("Interpretation:"), [
+            t("Values greater than 100% indicate avoided impacts exceed generated impacts."),
+            t("Negative values represent a net environmental benefit."),
+            t("Reference scenario (Grid-only): All electricity demand is supplied exclusively by the "
+              "electrical grid. This scenario represents the baseline environmental impact (100%) used "
+              "for normalization."),
+            t("Self Consumption: Environmental impact associated with on-site photovoltaic electricity "
+              "generation that is directly consumed by the system."),
+            t("Import from Grid: Residual environmental impact caused when on-site solar generation is "
+              "insufficient and electricity must be imported from the grid."),
+            t("Export to Grid (Environmental Savings): Avoided environmental impact due to surplus "
+              "photovoltaic electricity exported to the grid, displacing conventional electricity "
+              "generation. This value represents an environmental benefit."),
+            t("Net Environmental Impact: The overall environmental footprint of the system, accounting "
+              "for both consumed impacts and avoided impacts. Values below 100% indicate an improvement "
+              "compared to the grid-only reference scenario."),
+        ]),
+        background="#2f3e46",
+        padding=20
+    )
+
+
+# --------------------------------------------------
+# Fase 4: interpretación
+# --------------------------------------------------
+def _colored(value: float, good: bool, fmt: str = "{:.2f}") -> str:
+    color = "#6AA84F" if good else "#D22C41"
+    return f"<span style='color:{color}; font-weight:bold'>{fmt.format(value)}</span>"
+
+
+def interpretation_html(time_horizon_days: int, selected_date, df_raw_impacts, df_calculation_results,
+                        units: dict) -> str:
+    """
+    Texto corrido de interpretación a partir de las tablas de ImpactResults.
+    units: {nombre del indicador: unidad}
+    """
+    avoided_label = f"<strong>{t('Relative Environmental Avoided of PV Grid Export (%)')}</strong>"
+    net_label = f"<strong>{t('Net Environmental Impact (%)')}</strong>"
+
+    body = (
+        f"<strong>{t('Analysis period:')}</strong> "
+        + t("{days} days, starting from {date}.").format(
+            days=time_horizon_days, date=f"<strong>{selected_date}</strong>")
+        + " "
+        + t("Negative net impact values indicate an {benefit}, meaning that photovoltaic (PV) electricity "
+            "exported to the grid helps reduce overall environmental burden.").format(
+            benefit=f'<strong style="color:#6AA84F;">{t("environmental benefit")}</strong>')
+        + "<br><br>"
+    )
+
+    for _, row in df_raw_impacts.iterrows():
+        indicator_name = row["Indicator"]
+        unit = units.get(indicator_name, row.get("Units", ""))
+
+        calc_row = df_calculation_results[df_calculation_results["Indicator"] == indicator_name]
+        avoided_pct = calc_row["Relative Environmental Avoided of PV Grid Export (%)"].values[0] if not calc_row.empty else 0
+        net_pct = calc_row["Net Environmental Impact (%)"].values[0] if not calc_row.empty else 0
+
+        values = {
+            key: _colored(row.get(column, 0), good=row.get(column, 0) < 0)
+            for key, column in (("self_val", "Self Consumption"), ("grid_val", "Import from Grid"),
+                                ("net_val", "Net Impact"), ("reference_val", "Reference Impact (Grid-Only)"))
+        }
+        # Exportación: siempre beneficio; % evitado: beneficio si > 0; % neto: beneficio si <= 100
+        values["export_val"] = _colored(row.get("Export to Grid", 0), good=True)
+
+        body += (
+            "<div style='margin-left:18px; margin-bottom:10px;'>"
+            f"- <strong>{t(indicator_name)}</strong>: "
+            + t("Total self-consumed PV impact = {self_val} {unit}, exported PV impact = {export_val} {unit}, "
+                "imported from grid = {grid_val} {unit}, resulting in a net environmental impact of "
+                "{net_val} {unit} compared to a grid-only reference impact of {reference_val} {unit}.").format(
+                unit=unit, **values)
+            + " "
+            + t("This corresponds to {avoided_pct} {avoided_label}, meaning the environmental impact avoided "
+                "thanks to PV export, and {net_pct} {net_label}, representing the total system impact "
+                "relative to the conventional grid scenario.").format(
+                avoided_pct=_colored(avoided_pct, good=avoided_pct > 0, fmt="{:.1f}%"),
+                avoided_label=avoided_label,
+                net_pct=_colored(net_pct, good=net_pct <= 100, fmt="{:.1f}%"),
+                net_label=net_label)
+            + "<br></div>"
+        )
+
+    body += (
+        f"<br><strong>{t('Interpretation for general audiences:')}</strong> "
+        + t("Percentage values above 0% indicate environmental savings. Values above 100% mean the PV system "
+            "avoids more environmental impact than the grid would have produced. A negative Net Environmental "
+            "Impact (%) means the solar installation delivers a net environmental benefit by offsetting more "
+            "impact than it generates.")
+    )
+    return _card(body, background="#2f3e46", padding=20, extra_style=" font-size:18px;")
+
+
+# --------------------------------------------------
+# Metodología (Markdown + LaTeX)
+# --------------------------------------------------
+def interpretation_notes_markdown() -> str:
+    return "\n".join(f"- {note}" for note in (
+        t("Percentages **greater than 100 %** indicate that the system avoids more environmental impact "
+          "than it generates under the grid-only reference scenario."),
+        t("Negative values of **Net Environmental Impact** indicate a **net environmental benefit**."),
+        t("These indicators are **interpretative metrics** and are therefore presented within the "
+          "**Interpretation phase**, in accordance with ISO 14040 and ISO 14044."),
+    ))
+
+
+def _formula(latex: str) -> str:
+    return f"$$\n{latex}\n$$"
+
+
+def _where(items: list) -> str:
+    """Lista 'where:' de símbolos LaTeX y su descripción traducida"""
+    return t("where:") + "\n\n" + "\n".join(f"- ${symbol}$: {text}" for symbol, text in items)
+
+
+def methodology_markdown() -> str:
+    """Cuerpo del expander de metodología: prosa traducida, fórmulas sin traducir"""
+    grid_only = r"EI_{grid\ only}"
+    sections = [
+        f"### {t('Relative Environmental Avoided of PV Grid Export (%)')}",
+        t("Represents the relative environmental benefit obtained by exporting photovoltaic electricity to "
+          "the grid, compared to a reference scenario where the same electricity would be supplied entirely "
+          "by the conventional grid mix."),
+        _formula(rf"\text{{{t('Impact Avoided of PV Grid Export')}}} = \frac{{EI_{{export}}}}{{{grid_only}}} \times 100"),
+        "---",
+        f"### {t('Net Environmental Impact (%)')}",
+        t("Represents the net environmental performance of the system after accounting for self-consumption, "
+          "grid imports, and avoided impacts due to electricity export."),
+        _formula(rf"\text{{{t('Net Impact')}}} = \frac{{EI_{{total}}}}{{{grid_only}}} \times 100"),
+        "---",
+        f"### {t('Net Environmental Impact Avoided (PV Installation)')}",
+        t("Represents the total environmental impact avoided through the installation of the PV solar plant."),
+        _formula(rf"\text{{{t('Net Impact Avoided (PV Installation)')}}} = {grid_only} - EI_{{total}}"),
+        "---",
+        f"### {t('Environmental Impact Total')}",
+        t("The net environmental impact is calculated as:"),
+        _formula(r"EI_{total} = EI_{self} + EI_{grid} - EI_{export}"),
+        _where([
+            (r"EI_{self}", t("Environmental impact associated with self-consumed photovoltaic electricity")),
+            (r"EI_{grid}", t("Environmental impact associated with electricity imported from the grid")),
+            (r"EI_{export}", t("Avoided environmental impact due to electricity exported to the grid")),
+            (grid_only, t("Reference impact assuming the total electricity demand is supplied exclusively by the grid")),
+        ]),
+        "---",
+        f"### {t('Environmental Impact of Grid-Only Scenario')} (${grid_only}$)",
+        t("Represents the environmental impact assuming the total electricity demand is supplied exclusively "
+          "by the grid."),
+        _formula(rf"{grid_only} = \sum \left( kWh_{{reference}} \times \frac{{Mix_{{source}}}}{{100}} \times EF_{{source}} \right)"),
+        _where([
+            (r"kWh_{reference}", t("Total electricity demand (self-consumption + grid consumption)")),
+            (r"Mix_{source}", t("Percentage contribution of each energy source in the grid mix")),
+            (r"EF_{source}", t("Environmental factor for each energy source (e.g., {unit})").format(
+                unit=r"$kg\ CO_2\text{-}Eq/kWh$")),
+        ]),
+        "---",
+        f"### {t('Notes on Interpretation')}",
+        interpretation_notes_markdown(),
+    ]
+    return "\n\n".join(sections)
@@ -0,0 +1,8 @@
+"""
+src/
+ └── forecasting/
+      ├── features.py         # Variables de calendario (hora, estación, día de la semana)
+      ├── models.py           # Histórico horario, naive estacional y regresión de calendario
+      ├── backtest.py         # Backtest en paralelo sobre todas las fechas de inicio (MAE/RMSE)
+      └── forecast_section.py # Bloque de previsión de la página Energy Performance
+"""
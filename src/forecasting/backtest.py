@@ -0,0 +1,134 @@
+"""
+Backtest de los modelos de previsión sobre todas las fechas de inicio.
+
+Para cada fecha de inicio se prevén `horizon_days` días solo con el histórico
+anterior y se comparan con lo medido. Las fechas se reparten en trozos entre
+procesos: el histórico se envía una vez por proceso (inicializador del pool)
+y cada trozo devuelve solo sumas de errores por modelo, objetivo y día de
+antelación, que se combinan al final (MAE/RMSE exactos, sin guardar previsiones).
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.forecasting.models import (
+    HourlyHistory, build_models, forecast_times, FORECAST_TARGETS, MAX_HORIZON_DAYS
+)
+from src.forecasting.features import HOURS_PER_DAY
+
+
+# Procesos sin fork, como en el barrido (src/optimization/sweep.py): seguro
+# también si se llama desde un hilo (p.ej. una sesión de Streamlit)
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Estado de cada proceso del pool (se fija en _init_worker)
+_WORKER = {}
+
+
+def _init_worker(epoch_ns: np.ndarray, values: np.ndarray, model_options: dict):
+    _WORKER['models'] = build_models(HourlyHistory(epoch_ns, values), model_options)
+
+
+def _backtest_chunk(start_days: np.ndarray, horizon_days: int) -> dict:
+    return chunk_errors(_WORKER['models'], start_days, horizon_days)
+
+
+def chunk_errors(models: dict, start_days: np.ndarray, horizon_days: int) -> dict:
+    """
+    Sumas de |error|, error² y nº de horas comparadas de cada modelo (array
+    3 × días de antelación × objetivos). Las horas sin medida o sin previsión no cuentan.
+    """
+    history = next(iter(models.values())).history
+    actual = history.lookup(forecast_times(start_days, horizon_days))
+
+    sums = {}
+    for name, model in models.items():
+        error = model.predict(start_days, horizon_days) - actual
+        valid = np.isfinite(error)
+        error = np.where(valid, error, 0.0)
+        # (fechas × horas × objetivos) -> (días de antelación × objetivos)
+        by_day = (len(start_days), horizon_days, HOURS_PER_DAY, len(FORECAST_TARGETS))
+        sums[name] = np.stack([
+            np.abs(error).reshape(by_day).sum(axis=(0, 2)),
+            (error ** 2).reshape(by_day).sum(axis=(0, 2)),
+            valid.reshape(by_day).sum(axis=(0, 2)),
+        ])
+    return sums
+
+
+def _chunks(items: np.ndarray, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def run_backtest(history: HourlyHistory, horizon_days: int = MAX_HORIZON_DAYS, start_days=None,
+                 workers: int = None, chunk_days: int = 92, model_options: dict = None) -> pd.DataFrame:
+    """
+    MAE y RMSE (kWh por hora) de cada modelo, objetivo y día de antelación.
+
+    start_days: ordinales de día de inicio (None = todas las fechas con
+    min_history_days de histórico de la regresión). workers=None: todos los
+    núcleos; workers<=1: en este proceso. chunk_days: fechas de inicio por tarea
+    (también acota la memoria del ajuste por lotes).
+    """
+    if not 1 <= horizon_days <= MAX_HORIZON_DAYS:
+        raise ValueError(f"horizon_days must be in [1, {MAX_HORIZON_DAYS}].")
+
+    model_options = model_options or {}
+    if start_days is None:
+        min_history_days = model_options.get("calendar_regression", {}).get("min_history_days", 14)
+        start_days = history.start_days(min_history_days)
+    chunks = list(_chunks(np.asarray(start_days, dtype=np.int64), max(1, chunk_days)))
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers <= 1 or len(chunks) <= 1:
+        models = build_models(history, model_options)
+        results = [chunk_errors(models, chunk, horizon_days) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=multiprocessing.get_context(POOL_START_METHOD),
+            initializer=_init_worker,
+            initargs=(history.epoch_ns, history.values, model_options)
+        ) as pool:
+            # map conserva el orden de los trozos: misma suma que en serie
+            results = list(pool.map(_backtest_chunk, chunks, [horizon_days] * len(chunks)))
+
+    return backtest_frame(results, horizon_days)
+
+
+def backtest_frame(results: list, horizon_days: int) -> pd.DataFrame:
+    """Combina las sumas de los trozos: Model, Target, LeadDay, MAE, RMSE, Hours"""
+    rows = []
+    for name in (results[0] if results else {}):
+        total_abs, total_squared, count = sum(result[name] for result in results)
+        for day in range(horizon_days):
+            for j, target in enumerate(FORECAST_TARGETS):
+                n = count[day, j]
+                rows.append({
+                    'Model': name,
+                    'Target': target,
+                    'LeadDay': day + 1,
+                    'MAE': total_abs[day, j] / n if n else np.nan,
+                    'RMSE': np.sqrt(total_squared[day, j] / n) if n else np.nan,
+                    'Hours': int(n),
+                })
+    return pd.DataFrame(rows, columns=['Model', 'Target', 'LeadDay', 'MAE', 'RMSE', 'Hours'])
+
+
+def summarise_backtest(df: pd.DataFrame) -> pd.DataFrame:
+    """MAE y RMSE de todo el horizonte por modelo y objetivo (ponderados por horas)"""
+    weighted = df.assign(
+        abs_sum=df['MAE'].fillna(0) * df['Hours'],
+        squared_sum=df['RMSE'].fillna(0) ** 2 * df['Hours']
+    )
+    totals = weighted.groupby(['Model', 'Target'], sort=False)[['abs_sum', 'squared_sum', 'Hours']].sum()
+    hours = totals['Hours'].where(totals['Hours'] > 0)
+    return pd.DataFrame({
+        'MAE': totals['abs_sum'] / hours,
+        'RMSE': np.sqrt(totals['squared_sum'] / hours),
+        'Hours': totals['Hours'],
+    }).reset_index()
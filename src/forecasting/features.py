@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.utils.time_index import day_ordinals, NS_PER_DAY, NS_PER_HOUR
+
+
+HOURS_PER_DAY = 24
+DAYS_PER_YEAR = 365.25
+
+# Bloques de la matriz de diseño: (nombre, nº de columnas)
+FEATURE_BLOCKS = [
+    ('hour', HOURS_PER_DAY),              # perfil medio de cada hora
+    ('hour_x_cos_year', HOURS_PER_DAY),   # el perfil horario cambia con la estación
+    ('hour_x_sin_year', HOURS_PER_DAY),   # (duración del día FV, riego de verano)
+    ('weekday', 6),                       # lunes-sábado; el domingo es la referencia
+]
+FEATURE_COUNT = sum(width for _, width in FEATURE_BLOCKS)
+
+# Bloques que usa cada objetivo: la producción FV no depende del día de la semana
+# (y sin ese bloque, las horas sin sol de la ventana se prevén exactamente a 0)
+TARGET_FEATURE_BLOCKS = {
+    'Demand': ['hour', 'hour_x_cos_year', 'hour_x_sin_year', 'weekday'],
+    'Production': ['hour', 'hour_x_cos_year', 'hour_x_sin_year'],
+}
+
+
+def feature_columns(blocks: list) -> np.ndarray:
+    """Columnas de la matriz de diseño de esos bloques"""
+    edges = np.cumsum([0] + [width for _, width in FEATURE_BLOCKS])
+    return np.concatenate([
+        np.arange(edges[i], edges[i + 1])
+        for i, (name, _) in enumerate(FEATURE_BLOCKS) if name in blocks
+    ])
+
+
+def hour_of_day(epoch_ns: np.ndarray) -> np.ndarray:
+    """Hora del día (0-23) de cada instante"""
+    epoch_ns = np.asarray(epoch_ns, dtype=np.int64)
+    return (epoch_ns - day_ordinals(epoch_ns) * NS_PER_DAY) // NS_PER_HOUR
+
+
+def calendar_features(epoch_ns) -> np.ndarray:
+    """
+    Matriz de diseño (instantes × FEATURE_COUNT) con solo variables de calendario,
+    construida por columnas sin bucles. Acepta arrays de cualquier forma: la
+    matriz tiene esa forma más un eje final de FEATURE_COUNT.
+    """
+    epoch_ns = np.asarray(epoch_ns, dtype=np.int64)
+    days = day_ordinals(epoch_ns)
+    hour = hour_of_day(epoch_ns)
+    weekday = (days + 3) % 7  # 1970-01-01 fue jueves → lunes = 0
+
+    phase = 2 * np.pi * days / DAYS_PER_YEAR
+    hours = np.arange(HOURS_PER_DAY)
+    one_hot = (hour[..., None] == hours).astype(np.float64)
+
+    return np.concatenate([
+        one_hot,
+        one_hot * np.cos(phase)[..., None],
+        one_hot * np.sin(phase)[..., None],
+        (weekday[..., None] == np.arange(6)).astype(np.float64),
+    ], axis=-1)
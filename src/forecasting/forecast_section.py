@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.data_display import DataDisplay
+from src.forecasting.models import FORECAST_TARGETS
+from src.utils.i18n import t, register_page_strings
+from src.utils.lazy_imports import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+
+MODEL_LABELS = {
+    "calendar_regression": "Calendar regression",
+    "seasonal_naive": "Seasonal naive",
+}
+
+# Nombres de modelo y de objetivo (se traducen con la página)
+register_page_strings("Energy Performance", [*MODEL_LABELS.values(), *FORECAST_TARGETS])
+
+# Mismos colores que Demand vs Production (src/plotter.py)
+TARGET_COLORS = {"Demand": "#AA4BFF", "Production": "#FF8D4B"}
+
+
+class ForecastSection:
+    """
+    Forecast block of the Energy Performance page: hourly Demand and Production
+    forecasts for the sidebar window, made only with the history BEFORE the
+    start date, next to what was actually measured.
+    """
+
+    def __init__(self, energy_data_service, selected_date, time_horizon_days: int, mode: str):
+        self.energy_data_service = energy_data_service
+        self.selected_date = selected_date
+        self.time_horizon_days = time_horizon_days
+        self.mode = mode
+
+    def render(self):
+        models = self.energy_data_service.get_forecast_models()
+        model_name = st.radio(
+            t("Forecast model"), list(models),
+            format_func=lambda name: t(MODEL_LABELS.get(name, name)),
+            horizontal=True
+        )
+
+        forecast = models[model_name].forecast(self.selected_date, days=self.time_horizon_days)
+        if forecast[FORECAST_TARGETS].isna().all().all():
+            st.info(t("Not enough history before the start date to fit the forecast model."))
+            return
+
+        measured = self.energy_data_service.get_surplus_calculator().get_last_hours_from(
+            self.selected_date,
+            hours=self.time_horizon_days * 24
+        )
+        df = self.forecast_frame(forecast, measured)
+
+        # Error horario de la ventana (solo horas con medida)
+        cols = st.columns(2 * len(FORECAST_TARGETS))
+        for i, target in enumerate(FORECAST_TARGETS):
+            error = (df[f"{target}Forecast"] - df[target]).dropna()
+            mae = error.abs().mean() if len(error) else np.nan
+            rmse = np.sqrt((error ** 2).mean()) if len(error) else np.nan
+            cols[2 * i].metric(f"{t(target)} MAE", f"{mae:,.0f} kWh")
+            cols[2 * i + 1].metric(f"{t(target)} RMSE", f"{rmse:,.0f} kWh")
+
+        if self.mode == "daily":
+            df = self.daily_frame(df)
+
+        st.plotly_chart(self.plot_forecast(df), use_container_width=True)
+        DataDisplay(df=df.rename(columns={"Datetime": "Date"}), mode=self.mode).show_table_with_download(
+            filename=f"forecast_{model_name}_{self.mode}.csv",
+            height=220
+        )
+
+    @staticmethod
+    def forecast_frame(forecast: pd.DataFrame, measured: pd.DataFrame) -> pd.DataFrame:
+        """Previsión (columnas <objetivo>Forecast) y lo medido en las mismas horas (NaN si no hay)"""
+        return forecast.rename(columns={target: f"{target}Forecast" for target in FORECAST_TARGETS}).merge(
+            measured[["Datetime"] + FORECAST_TARGETS], on="Datetime", how="left"
+        )
+
+    @staticmethod
+    def daily_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Totales diarios (un día sin ninguna medida queda en NaN, no en 0)"""
+        return (
+            df.groupby(df["Datetime"].dt.normalize())
+            .sum(min_count=1, numeric_only=True)
+            .reset_index()
+        )
+
+    @staticmethod
+    def plot_forecast(df: pd.DataFrame) -> "go.Figure":
+        fig = go.Figure()
+        for target in FORECAST_TARGETS:
+            color = TARGET_COLORS[target]
+            fig.add_trace(go.Scatter(
+                x=df["Datetime"], y=df[target],
+                name=f"{t(target)} ({t('measured')})", mode="lines", line=dict(color=color, width=2)
+            ))
+            fig.add_trace(go.Scatter(
+                x=df["Datetime"], y=df[f"{target}Forecast"],
+                name=f"{t(target)} ({t('forecast')})", mode="lines", line=dict(color=color, width=2, dash="dash")
+            ))
+        fig.update_layout(
+            yaxis=dict(title=t("Energy (kWh)")),
+            legend=dict(orientation="h", y=1.1),
+            margin=dict(t=40, b=40),
+            height=420
+        )
+        return fig
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.time_index import to_epoch_ns, day_ordinals, NS_PER_DAY, NS_PER_HOUR
+from src.forecasting.features import (
+    calendar_features, feature_columns, hour_of_day, FEATURE_COUNT, HOURS_PER_DAY, TARGET_FEATURE_BLOCKS
+)
+
+
+FORECAST_TARGETS = ['Demand', 'Production']
+MAX_HORIZON_DAYS = 7
+
+# Naive estacional: semana anterior para la demanda, día anterior para la producción
+DEFAULT_SEASON_HOURS = {'Demand': 7 * HOURS_PER_DAY, 'Production': HOURS_PER_DAY}
+
+
+# --------------------------------------------------
+# Histórico
+# --------------------------------------------------
+class HourlyHistory:
+    """
+    Serie horaria medida de FORECAST_TARGETS (ordenada por Datetime). Los
+    modelos solo leen de ella lo anterior a cada fecha de inicio.
+    """
+
+    def __init__(self, epoch_ns, values):
+        self.epoch_ns = np.ascontiguousarray(epoch_ns, dtype=np.int64)
+        self.values = np.ascontiguousarray(values, dtype=np.float64)  # filas × objetivos
+        self.days = day_ordinals(self.epoch_ns)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "HourlyHistory":
+        """Desde un resultado horario (p.ej. SurplusCalculator.result)"""
+        return cls(to_epoch_ns(df['Datetime']), df[FORECAST_TARGETS].to_numpy(dtype=np.float64))
+
+    @classmethod
+    def from_calculator(cls, surplus) -> "HourlyHistory":
+        """Desde un SurplusCalculator, leyendo solo las columnas necesarias (también en modo compacto)"""
+        return cls(surplus.epoch_ns(), np.column_stack([surplus.column(target) for target in FORECAST_TARGETS]))
+
+    def __len__(self):
+        return len(self.epoch_ns)
+
+    def lookup(self, epoch_ns) -> np.ndarray:
+        """Valores medidos en esos instantes (su forma + eje de objetivos); NaN donde no hay fila"""
+        epoch_ns = np.asarray(epoch_ns, dtype=np.int64)
+        flat = epoch_ns.ravel()
+        out = np.full((flat.size, len(FORECAST_TARGETS)), np.nan)
+        if len(self):
+            pos = np.minimum(np.searchsorted(self.epoch_ns, flat), len(self) - 1)
+            found = self.epoch_ns[pos] == flat
+            out[found] = self.values[pos[found]]
+        return out.reshape(epoch_ns.shape + (len(FORECAST_TARGETS),))
+
+    def start_days(self, min_history_days: int = 0) -> np.ndarray:
+        """Fechas de inicio (ordinales de día) con al menos min_history_days días de histórico"""
+        if not len(self):
+            return np.zeros(0, dtype=np.int64)
+        return np.arange(self.days[0] + min_history_days, self.days[-1] + 1, dtype=np.int64)
+
+
+def forecast_times(start_days, horizon_days: int) -> np.ndarray:
+    """Instantes (epoch ns) previstos: fechas de inicio × horas del horizonte"""
+    lead = np.arange(horizon_days * HOURS_PER_DAY, dtype=np.int64) * NS_PER_HOUR
+    return np.asarray(start_days, dtype=np.int64)[:, None] * NS_PER_DAY + lead
+
+
+# --------------------------------------------------
+# Modelos
+# --------------------------------------------------
+class Forecaster:
+    """
+    Previsión horaria de FORECAST_TARGETS a 1-MAX_HORIZON_DAYS días, desde
+    las 00:00 de cada fecha de inicio y solo con el histórico anterior.
+    """
+
+    name = None
+
+    def __init__(self, history: HourlyHistory):
+        self.history = history
+
+    def predict(self, start_days, horizon_days: int) -> np.ndarray:
+        """Núcleo vectorizado: (fechas de inicio × horas × objetivos)"""
+        raise NotImplementedError
+
+    def forecast(self, start_date, days: int = 1) -> pd.DataFrame:
+        """Previsión de `days` días desde start_date: Datetime + FORECAST_TARGETS (kWh)"""
+        if not 1 <= days <= MAX_HORIZON_DAYS:
+            raise ValueError(f"days must be in [1, {MAX_HORIZON_DAYS}].")
+
+        start_day = np.array([pd.Timestamp(start_date).normalize().value // NS_PER_DAY])
+        values = self.predict(start_day, days)[0]
+        df = pd.DataFrame(values, columns=FORECAST_TARGETS)
+        df.insert(0, 'Datetime', forecast_times(start_day, days)[0].astype('datetime64[ns]'))
+        return df
+
+
+class SeasonalNaiveForecaster(Forecaster):
+    """
+    Repite la última temporada completa anterior al inicio (season_hours por
+    objetivo). Es la referencia que la regresión debe mejorar.
+    """
+
+    name = "seasonal_naive"
+
+    def __init__(self, history: HourlyHistory, season_hours: dict = None):
+        super().__init__(history)
+        self.season_hours = {**DEFAULT_SEASON_HOURS, **(season_hours or {})}
+
+    def predict(self, start_days, horizon_days: int) -> np.ndarray:
+        start_days = np.asarray(start_days, dtype=np.int64)
+        lead = np.arange(horizon_days * HOURS_PER_DAY, dtype=np.int64)
+
+        out = np.empty((len(start_days), len(lead), len(FORECAST_TARGETS)))
+        for j, target in enumerate(FORECAST_TARGETS):
+            season = self.season_hours[target]
+            # Misma posición dentro de la temporada, en la última temporada antes del inicio
+            reference = start_days[:, None] * NS_PER_DAY + (lead % season - season) * NS_PER_HOUR
+            out[..., j] = self.history.lookup(reference)[..., j]
+        return out
+
+
+class CalendarRegressionForecaster(Forecaster):
+    """
+    Regresión lineal con ridge sobre variables de calendario (features.py),
+    ajustada con los history_days días anteriores a cada fecha de inicio.
+    Cada objetivo usa sus bloques de TARGET_FEATURE_BLOCKS (coeficiente 0 en el resto).
+
+    Ajuste vectorizado: XᵀX y XᵀY por día con un matmul por lotes, sumas
+    acumuladas por día, la ventana de cada fecha de inicio como diferencia de
+    dos sumas y todos los sistemas resueltos a la vez. Los coeficientes quedan
+    en caché por fecha de inicio (el histórico no cambia para un mismo modelo).
+    """
+
+    name = "calendar_regression"
+
+    def __init__(self, history: HourlyHistory, history_days: int = 28, min_history_days: int = 14,
+                 ridge: float = 1.0):
+        """
+        history_days: días de histórico de cada ajuste (ventana móvil; con 4 semanas
+                      sigue los cambios de nivel del riego mejor que con un año)
+        min_history_days: sin al menos esos días medidos en la ventana, la previsión es NaN
+        ridge: regularización (estabiliza los términos estacionales con poco histórico)
+        """
+        if history_days < 1 or min_history_days < 0 or ridge < 0:
+            raise ValueError("history_days must be >= 1, min_history_days and ridge >= 0.")
+        super().__init__(history)
+        self.history_days = int(history_days)
+        self.min_history_days = int(min_history_days)
+        self.ridge = float(ridge)
+        self._coefficients = {}  # ordinal del día de inicio -> (FEATURE_COUNT × objetivos)
+
+    def coefficients(self, start_days) -> np.ndarray:
+        """Coeficientes de cada fecha de inicio; las que no están en caché se ajustan en un solo lote"""
+        start_days = np.asarray(start_days, dtype=np.int64)
+        missing = np.array([day for day in np.unique(start_days).tolist() if day not in self._coefficients],
+                           dtype=np.int64)
+        if len(missing):
+            self._coefficients.update(zip(missing.tolist(), self._fit(missing)))
+        if not len(start_days):
+            return np.zeros((0, FEATURE_COUNT, len(FORECAST_TARGETS)))
+        return np.stack([self._coefficients[day] for day in start_days.tolist()])
+
+    def _fit(self, start_days: np.ndarray) -> np.ndarray:
+        history = self.history
+        first = int(start_days.min()) - self.history_days
+        n_days = int(start_days.max()) - first
+
+        # Filas del histórico que caen en alguna ventana, sin NaN
+        lo, hi = np.searchsorted(history.days, [first, first + n_days])
+        epoch_ns = history.epoch_ns[lo:hi]
+        y = history.values[lo:hi]
+        valid = np.isfinite(y).all(axis=1)
+        epoch_ns, y = epoch_ns[valid], y[valid]
+        day = history.days[lo:hi][valid] - first
+        hour = hour_of_day(epoch_ns)
+
+        # Una fila por (día, hora): las horas sin dato quedan a cero y no suman
+        x_days = np.zeros((n_days, HOURS_PER_DAY, FEATURE_COUNT))
+        y_days = np.zeros((n_days, HOURS_PER_DAY, len(FORECAST_TARGETS)))
+        x_days[day, hour] = calendar_features(epoch_ns)
+        y_days[day, hour] = y
+
+        # Ecuaciones normales por día y sus sumas acumuladas (con una fila de ceros delante)
+        xt = x_days.transpose(0, 2, 1)
+        gram = np.concatenate([np.zeros((1, FEATURE_COUNT, FEATURE_COUNT)), np.cumsum(xt @ x_days, axis=0)])
+        moment = np.concatenate([np.zeros((1, FEATURE_COUNT, len(FORECAST_TARGETS))),
+                                 np.cumsum(xt @ y_days, axis=0)])
+        rows = np.concatenate([[0], np.cumsum(np.bincount(day, minlength=n_days))])
+
+        end = start_days - first
+        begin = end - self.history_days
+        window_gram = gram[end] - gram[begin]
+        window_moment = moment[end] - moment[begin]
+
+        coef = np.zeros((len(start_days), FEATURE_COUNT, len(FORECAST_TARGETS)))
+        for j, target in enumerate(FORECAST_TARGETS):
+            columns = feature_columns(TARGET_FEATURE_BLOCKS[target])
+            coef[:, columns, j] = np.linalg.solve(
+                window_gram[:, columns][:, :, columns] + self.ridge * np.eye(len(columns)),
+                window_moment[:, columns, j:j + 1]
+            )[..., 0]
+        coef[rows[end] - rows[begin] < self.min_history_days * HOURS_PER_DAY] = np.nan
+        return coef
+
+    def predict(self, start_days, horizon_days: int) -> np.ndarray:
+        start_days = np.asarray(start_days, dtype=np.int64)
+        x = calendar_features(forecast_times(start_days, horizon_days))
+        # Energías: sin valores negativos (NaN se conserva)
+        return np.maximum(x @ self.coefficients(start_days), 0.0)
+
+
+FORECAST_MODELS = {
+    model.name: model for model in (CalendarRegressionForecaster, SeasonalNaiveForecaster)
+}
+
+
+def build_models(history: HourlyHistory, model_options: dict = None) -> dict:
+    """Un modelo de cada tipo sobre el mismo histórico; model_options: {nombre: kwargs}"""
+    model_options = model_options or {}
+    return {name: model(history, **model_options.get(name, {})) for name, model in FORECAST_MODELS.items()}
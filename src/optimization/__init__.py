@@ -0,0 +1,9 @@
+"""
+src/
+ └── optimization/
+      ├── recurrence.py   # Recurrencias de estado acotado (SoC) vectorizadas
+      ├── battery.py      # Despacho horario de una batería sobre el surplus
+      ├── electrolyser.py # Electrolizador + depósito de H2 con el excedente FV
+      ├── pump_scheduling.py  # Reprogramación del bombeo (LP por días, HiGHS)
+      └── sweep.py        # Barrido de dimensionado en paralelo (memoria compartida)
+"""
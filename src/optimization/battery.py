@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from src.surplus_calculator import SurplusCalculator, DAILY_COLUMNS
+from src.optimization.recurrence import clamped_cumsum
+
+
+BATTERY_COLUMNS = ['BatteryCharge', 'BatteryDischarge', 'BatterySoC']
+# Columnas de la batería que se suman en el diario (el SoC es un estado, no se suma)
+BATTERY_DAILY_COLUMNS = ['BatteryCharge', 'BatteryDischarge']
+
+
+class BatteryStorage:
+    """
+    Batería que se carga con el excedente FV (ExportToGrid) y se descarga para
+    cubrir la demanda que se importaría de la red (ImportfromGrid). Sin carga
+    desde la red ni exportación desde la batería.
+
+    Por hora (kWh, dt = step_hours):
+        carga    = min(ExportToGrid, P_carga · dt)       → almacena carga · √η
+        descarga = min(ImportfromGrid, P_descarga · dt)  → extrae descarga / √η
+        SoC_t    = clamp(SoC_{t-1} + almacenado - extraído, SoC_min, capacidad)
+
+    La recurrencia del SoC se resuelve vectorizada (ver recurrence.clamped_cumsum);
+    la carga/descarga real sale del cambio de SoC tras el recorte.
+    """
+
+    def __init__(self, capacity_kwh: float, charge_power_kw: float, discharge_power_kw: float = None,
+                 round_trip_efficiency: float = 0.9, initial_soc: float = 0.5, min_soc: float = 0.0,
+                 step_hours: float = 1.0):
+        """
+        discharge_power_kw: por defecto igual a charge_power_kw
+        round_trip_efficiency: η de ida y vuelta (0-1), repartida a partes iguales entre carga y descarga
+        initial_soc, min_soc: fracción de la capacidad
+        """
+        if capacity_kwh < 0 or charge_power_kw < 0 or (discharge_power_kw or 0) < 0:
+            raise ValueError("Capacity and power limits must be >= 0.")
+        if not 0 < round_trip_efficiency <= 1:
+            raise ValueError("round_trip_efficiency must be in (0, 1].")
+        if not 0 <= min_soc <= initial_soc <= 1:
+            raise ValueError("Expected 0 <= min_soc <= initial_soc <= 1.")
+
+        self.capacity_kwh = float(capacity_kwh)
+        self.charge_power_kw = float(charge_power_kw)
+        self.discharge_power_kw = float(charge_power_kw if discharge_power_kw is None else discharge_power_kw)
+        self.round_trip_efficiency = float(round_trip_efficiency)
+        self.initial_soc = float(initial_soc)
+        self.min_soc = float(min_soc)
+        self.step_hours = float(step_hours)
+
+    @property
+    def key(self) -> tuple:
+        """Parámetros como tupla hashable (para cachés de resultados)"""
+        return (self.capacity_kwh, self.charge_power_kw, self.discharge_power_kw,
+                self.round_trip_efficiency, self.initial_soc, self.min_soc, self.step_hours)
+
+    # --------------------------------------------------
+    # Despacho
+    # --------------------------------------------------
+    def simulate(self, export_to_grid, import_from_grid):
+        """
+        Núcleo sobre arrays (kWh por paso). Devuelve (carga desde FV, descarga
+        entregada a la demanda, SoC al final de cada paso), todos en kWh.
+        """
+        export_to_grid = np.nan_to_num(np.asarray(export_to_grid, dtype=np.float64))
+        import_from_grid = np.nan_to_num(np.asarray(import_from_grid, dtype=np.float64))
+
+        eta = np.sqrt(self.round_trip_efficiency)
+        charge = np.minimum(export_to_grid, self.charge_power_kw * self.step_hours)
+        discharge = np.minimum(import_from_grid, self.discharge_power_kw * self.step_hours)
+
+        soc = clamped_cumsum(
+            charge * eta - discharge / eta,
+            initial=self.initial_soc * self.capacity_kwh,
+            lower=self.min_soc * self.capacity_kwh,
+            upper=self.capacity_kwh
+        )
+
+        stored = np.diff(soc, prepend=self.initial_soc * self.capacity_kwh)
+        # Ruido de redondeo del scan (~1e-12 kWh) en horas sin movimiento real
+        stored[np.abs(stored) < 1e-9 * max(self.capacity_kwh, 1.0)] = 0.0
+        charge = np.maximum(stored, 0.0) / eta
+        discharge = np.maximum(-stored, 0.0) * eta
+        return charge, discharge, soc
+
+    def dispatch(self, hourly: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica la batería a un resultado horario de SurplusCalculator (DataFrame o
+        dict de arrays, ver SurplusCalculator.hourly_columns). Devuelve un
+        DataFrame nuevo con los flujos ajustados y las columnas de BATTERY_COLUMNS:
+        - SelfConsumption: directo + descarga de la batería (energía de origen FV)
+        - ImportfromGrid: importación - descarga
+        - ExportToGrid: exportación - carga
+        """
+        charge, discharge, soc = self.simulate(hourly['ExportToGrid'], hourly['ImportfromGrid'])
+
+        return pd.DataFrame({
+            'Datetime': np.asarray(hourly['Datetime']),
+            'Demand': np.asarray(hourly['Demand']),
+            'Production': np.asarray(hourly['Production']),
+            'SelfConsumption': np.asarray(hourly['SelfConsumption']) + discharge,
+            'ImportfromGrid': np.maximum(np.asarray(hourly['ImportfromGrid']) - discharge, 0.0),
+            'ExportToGrid': np.maximum(np.asarray(hourly['ExportToGrid']) - charge, 0.0),
+            'BatteryCharge': charge,
+            'BatteryDischarge': discharge,
+            'BatterySoC': soc,
+        })
+
+    def dispatch_calculator(self, surplus: SurplusCalculator) -> SurplusCalculator:
+        """
+        Despacho sobre el surplus ya calculado, como un SurplusCalculator nuevo:
+        diarios, ventanas y totales funcionan igual que sin batería. Se lee por
+        columnas (sin materializar el resultado) y se mantiene el modo compacto.
+        """
+        return SurplusCalculator.from_result(
+            self.dispatch(surplus.hourly_columns()),
+            compact=surplus.is_compact,
+            daily_columns=surplus.daily_columns + BATTERY_DAILY_COLUMNS
+        )
+
+    def summary(self, hourly: pd.DataFrame) -> dict:
+        """Totales del despacho (kWh), ciclos equivalentes y ratios sobre las filas dadas"""
+        totals = hourly[['Demand', 'Production', 'SelfConsumption', 'ImportfromGrid', 'ExportToGrid',
+                         'BatteryCharge', 'BatteryDischarge']].sum().to_dict()
+        production, demand = totals['Production'], totals['Demand']
+        return {
+            **totals,
+            'EquivalentCycles': totals['BatteryDischarge'] / self.capacity_kwh if self.capacity_kwh > 0 else 0.0,
+            'SelfConsumptionRatio': totals['SelfConsumption'] / production if production > 0 else np.nan,
+            'SelfSufficiency': totals['SelfConsumption'] / demand if demand > 0 else np.nan,
+        }
+
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+from src.surplus_calculator import SurplusCalculator
+from src.optimization.recurrence import clamped_cumsum
+
+
+# Poder calorífico inferior del hidrógeno
+LHV_H2_KWH_PER_KG = 33.33
+
+# Eficiencia (PCI) frente a la carga (fracción de la potencia nominal), típica de un PEM
+DEFAULT_EFFICIENCY_CURVE = (
+    (0.10, 0.25, 0.50, 0.75, 1.00),
+    (0.52, 0.62, 0.65, 0.63, 0.60),
+)
+
+ELECTROLYSER_COLUMNS = ['ElectrolyserInput', 'H2Production', 'H2Offtake', 'H2Tank', 'Curtailment']
+# Columnas del electrolizador que se suman en el diario (el nivel del depósito es un estado)
+ELECTROLYSER_DAILY_COLUMNS = ['ElectrolyserInput', 'H2Production', 'H2Offtake', 'Curtailment']
+
+
+class Electrolyser:
+    """
+    Electrolizador alimentado solo con el excedente FV (ExportToGrid), con
+    depósito de H2 y un consumo de H2 constante.
+
+    Por hora (dt = step_hours):
+        potencia = min(excedente / dt, P_nominal); 0 si queda por debajo de la carga mínima
+        H2       = potencia · dt · η(carga) / PCI               (η interpolada en la curva)
+        depósito = clamp(depósito + H2 - consumo, 0, capacidad)  (recurrencia vectorizada)
+
+    Con el depósito lleno, la producción se recorta y la potencia baja a la
+    carga que da justo ese H2 (η recalculada a esa carga). Si esa carga queda
+    por debajo de la mínima, el electrolizador se para esa hora; desde la
+    primera hora así el depósito se simula hora a hora (_tank_from). El excedente no usado se exporta hasta
+    export_limit_kw; lo que supera el límite se vierte (Curtailment).
+    """
+
+    def __init__(self, rated_power_kw: float, min_load: float = 0.1,
+                 efficiency_curve: tuple = DEFAULT_EFFICIENCY_CURVE, tank_kg: float = None,
+                 initial_tank: float = 0.0, offtake_kg_per_hour: float = 0.0,
+                 export_limit_kw: float = None, step_hours: float = 1.0):
+        """
+        min_load: carga mínima de operación (fracción de rated_power_kw)
+        efficiency_curve: (cargas, eficiencias PCI), ambas en fracción; fuera del rango se usan los extremos
+        tank_kg: capacidad del depósito (None = sin límite); initial_tank: fracción inicial
+        offtake_kg_per_hour: H2 retirado del depósito cada hora (si hay)
+        export_limit_kw: límite de exportación a la red (None = sin límite)
+        """
+        loads, efficiencies = (np.asarray(values, dtype=np.float64) for values in efficiency_curve)
+        if rated_power_kw < 0 or (tank_kg is not None and tank_kg < 0) or offtake_kg_per_hour < 0:
+            raise ValueError("Power, tank size and offtake must be >= 0.")
+        if not 0 <= min_load <= 1 or not 0 <= initial_tank <= 1:
+            raise ValueError("min_load and initial_tank must be in [0, 1].")
+        if len(loads) != len(efficiencies) or len(loads) == 0 or np.any(np.diff(loads) <= 0):
+            raise ValueError("efficiency_curve needs matching, strictly increasing load points.")
+        if np.any(efficiencies <= 0) or np.any(efficiencies > 1):
+            raise ValueError("Efficiencies must be in (0, 1].")
+
+        self.rated_power_kw = float(rated_power_kw)
+        self.min_load = float(min_load)
+        self.efficiency_curve = (loads, efficiencies)
+        self.tank_kg = np.inf if tank_kg is None else float(tank_kg)
+        self.initial_tank = float(initial_tank)
+        self.offtake_kg_per_hour = float(offtake_kg_per_hour)
+        self.export_limit_kw = export_limit_kw
+        self.step_hours = float(step_hours)
+
+    # --------------------------------------------------
+    # Simulación
+    # --------------------------------------------------
+    def simulate(self, export_to_grid) -> dict:
+        """
+        Núcleo sobre arrays (kWh de excedente por paso). Devuelve un dict de
+        arrays con las columnas de ELECTROLYSER_COLUMNS y 'ExportToGrid' (exportación restante).
+        """
+        surplus = np.nan_to_num(np.asarray(export_to_grid, dtype=np.float64))
+        dt = self.step_hours
+        offtake = self.offtake_kg_per_hour * dt
+        initial = 0.0 if np.isinf(self.tank_kg) else self.initial_tank * self.tank_kg
+
+        if self.rated_power_kw > 0:
+            load = np.minimum(surplus / dt, self.rated_power_kw) / self.rated_power_kw
+            load[load < self.min_load] = 0.0
+        else:
+            load = np.zeros_like(surplus)
+        # H2 (kg) de una hora a potencia nominal con η = 1: escala de _output_at
+        kg_at_rated = self.rated_power_kw * dt / LHV_H2_KWH_PER_KG
+        h2 = kg_at_rated * self._output_at(load)
+
+        # Depósito: el recorte por arriba es H2 que no se produce, por abajo consumo no servido
+        tank = clamped_cumsum(h2 - offtake, initial=initial, lower=0.0, upper=self.tank_kg)
+        unclamped = np.concatenate(([initial], tank[:-1])) + h2 - offtake
+        produced = h2 - np.maximum(unclamped - self.tank_kg, 0.0)
+
+        # Recorte que deja la carga por debajo de la mínima: esa hora se para y el
+        # depósito cambia desde ahí (no es una recurrencia de clamp) -> hora a hora
+        min_kg = kg_at_rated * float(self._output_at(self.min_load))
+        below_min = np.flatnonzero((produced < h2) & (produced < min_kg))
+        if len(below_min):
+            produced, tank = self._tank_from(below_min[0], h2, produced, tank, initial, offtake, min_kg)
+
+        previous = np.concatenate(([initial], tank[:-1]))
+        delivered = offtake - np.maximum(offtake - previous - produced, 0.0)
+
+        # Potencia de las horas recortadas: la carga que da justo ese H2 (η a esa carga)
+        clipped = produced < h2
+        if clipped.any():
+            load[clipped] = np.minimum(load[clipped], self._load_for_output(produced[clipped] / kg_at_rated))
+        energy = load * self.rated_power_kw * dt
+        remaining = surplus - energy
+        if self.export_limit_kw is None:
+            curtailment = np.zeros_like(remaining)
+        else:
+            curtailment = np.maximum(remaining - self.export_limit_kw * dt, 0.0)
+
+        return {
+            'ElectrolyserInput': energy,
+            'H2Production': produced,
+            'H2Offtake': delivered,
+            'H2Tank': tank,
+            'Curtailment': curtailment,
+            'ExportToGrid': remaining - curtailment,
+        }
+
+    def _tank_from(self, start: int, h2, produced, tank, initial: float, offtake: float, min_kg: float):
+        """
+        Recalcula producción y depósito hora a hora desde `start`: si el hueco del
+        depósito no llega al H2 de la carga mínima, el electrolizador no arranca.
+        Las horas anteriores ya son exactas con la recurrencia vectorizada.
+
+        Es un bucle en Python a propósito: con el depósito casi lleno hay una parada
+        cada pocas horas (miles al año), y reanudar la recurrencia vectorizada
+        tramo a tramo entre paradas cuesta más que este recorrido
+        (ver benchmarks/bench_electrolyser.py).
+        """
+        produced, tank = produced.copy(), tank.copy()
+        level = tank[start - 1] if start else initial
+        # Hueco del depósito = full - nivel (con el consumo de la hora)
+        full = self.tank_kg + offtake
+        new_produced = h2[start:].tolist()
+        new_tank = [0.0] * len(new_produced)
+        for i, available in enumerate(new_produced):
+            room = full - level
+            if available > room:
+                available = new_produced[i] = room if room >= min_kg else 0.0
+            level += available - offtake
+            if level < 0.0:
+                level = 0.0
+            new_tank[i] = level
+        produced[start:] = new_produced
+        tank[start:] = new_tank
+        return produced, tank
+
+    def _output_at(self, load) -> np.ndarray:
+        """H2 por hora en fracción del de la potencia nominal con η = 1: carga · η(carga)"""
+        load = np.asarray(load, dtype=np.float64)
+        return load * np.interp(load, *self.efficiency_curve)
+
+    def _load_for_output(self, output) -> np.ndarray:
+        """
+        Inversa de _output_at en [0, 1]: carga mínima que da ese H2. Entre los
+        puntos de la curva carga · η(carga) es cuadrática; se invierte sobre una
+        rejilla fina (error relativo < 1e-6 para curvas como la por defecto).
+        """
+        grid = np.union1d(np.linspace(0.0, 1.0, 2049), self.efficiency_curve[0].clip(0.0, 1.0))
+        # Envolvente creciente por si η cae tan deprisa que carga · η decrece
+        outputs = np.maximum.accumulate(self._output_at(grid))
+        return np.interp(output, outputs, grid)
+
+    def dispatch(self, hourly: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica el electrolizador a un resultado horario de SurplusCalculator (DataFrame
+        o dict de arrays, ver SurplusCalculator.hourly_columns). Devuelve
+        un DataFrame nuevo: ExportToGrid pasa a ser la exportación restante (las
+        exportaciones evitadas son ElectrolyserInput) y se añaden ELECTROLYSER_COLUMNS.
+        """
+        flows = self.simulate(hourly['ExportToGrid'])
+        df = pd.DataFrame({
+            col: np.asarray(hourly[col])
+            for col in hourly if col not in ELECTROLYSER_COLUMNS
+        })
+        for col, values in flows.items():
+            df[col] = values
+        return df
+
+    def dispatch_calculator(self, surplus: SurplusCalculator) -> SurplusCalculator:
+        """
+        Despacho sobre un SurplusCalculator (el base o uno ya ajustado, p.ej. con
+        batería): el diario incluye las columnas del electrolizador, que
+        EnvironmentalIndicatorsService contabiliza.
+        """
+        return SurplusCalculator.from_result(
+            self.dispatch(surplus.hourly_columns()),
+            compact=surplus.is_compact,
+            daily_columns=surplus.daily_columns + ELECTROLYSER_DAILY_COLUMNS
+        )
+
+    def summary(self, hourly: pd.DataFrame) -> dict:
+        """Totales (kWh, kg) y horas equivalentes a plena carga sobre las filas dadas"""
+        totals = hourly[ELECTROLYSER_DAILY_COLUMNS].sum().to_dict()
+        return {
+            **totals,
+            'FullLoadHours': totals['ElectrolyserInput'] / self.rated_power_kw if self.rated_power_kw > 0 else 0.0,
+            'SpecificConsumption': (totals['ElectrolyserInput'] / totals['H2Production']
+                                    if totals['H2Production'] > 0 else np.nan),
+        }
@@ -0,0 +1,453 @@
+import pandas as pd
+import streamlit as st
+
+from src.data_display import DataDisplay
+from src.environmental_indicators.ei_service import EnvironmentalIndicatorsService
+from src.environmental_indicators.indicators import GRID_MIX_INDICATORS
+from src.optimization.battery import BatteryStorage
+from src.optimization.electrolyser import Electrolyser, DEFAULT_EFFICIENCY_CURVE
+from src.optimization.pump_scheduling import PumpScheduler
+from src.optimization.sweep import build_sweep_arrays, run_sweep, sweep_combinations, sweep_frame
+from src.utils.i18n import t
+from src.utils.lazy_imports import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+
+# Procesos del barrido de dimensionado (None = todos los núcleos)
+SWEEP_WORKERS = None
+
+
+def parse_values(text: str) -> list:
+    """Números separados por comas: "0.5, 1, 1.5" -> [0.5, 1.0, 1.5] (ignora entradas no numéricas)"""
+    values = []
+    for item in text.replace(";", ",").split(","):
+        try:
+            values.append(float(item))
+        except ValueError:
+            continue
+    return values
+
+
+class OptimizationPage:
+    """
+    Optimization page: scenarios over the hourly surplus of the shared
+    EnergyDataService, compared against the current system (PV + grid).
+    The time window comes from the sidebar (start date and horizon).
+    """
+
+    def __init__(self, energy_data_service):
+        self.energy_data_service = energy_data_service
+        self.selected_date = st.session_state.selected_date
+        self.time_horizon_days = st.session_state.time_horizon_days
+
+        # Parámetros del electrolizador (sección Green Hydrogen), reutilizados en el barrido
+        self.electrolyser_kw = None
+        self.electrolyser_options = None
+
+    def render(self):
+        st.markdown(f"<h1 style='text-align:center'>{t('Optimization')}</h1>", unsafe_allow_html=True)
+        self.render_battery()
+        st.markdown("---")
+        self.render_electrolyser()
+        st.markdown("---")
+        self.render_pump_scheduling()
+        st.markdown("---")
+        self.render_sweep()
+
+    # --------------------------------------------------
+    # Battery storage
+    # --------------------------------------------------
+    def battery_inputs(self) -> BatteryStorage:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            capacity = st.number_input(t("Battery capacity (kWh)"), min_value=0.0, value=4000.0, step=500.0)
+            initial_soc = st.slider(t("Initial state of charge (%)"), 0, 100, 50)
+        with col2:
+            charge_power = st.number_input(t("Max. charge power (kW)"), min_value=0.0, value=1000.0, step=100.0)
+            min_soc = st.slider(t("Minimum state of charge (%)"), 0, 100, 10)
+        with col3:
+            discharge_power = st.number_input(t("Max. discharge power (kW)"), min_value=0.0, value=1000.0, step=100.0)
+            efficiency = st.slider(t("Round-trip efficiency (%)"), 50, 100, 90)
+
+        return BatteryStorage(
+            capacity_kwh=capacity,
+            charge_power_kw=charge_power,
+            discharge_power_kw=discharge_power,
+            round_trip_efficiency=efficiency / 100,
+            initial_soc=max(initial_soc, min_soc) / 100,
+            min_soc=min_soc / 100
+        )
+
+    def render_battery(self):
+        st.markdown(f"<h2>{t('Battery Storage')}</h2>", unsafe_allow_html=True)
+
+        battery = self.battery_inputs()
+
+        # Despacho sobre toda la serie (el SoC arrastra el estado de los días previos)
+        surplus = self.energy_data_service.get_surplus_calculator()
+        dispatched = battery.dispatch_calculator(surplus)
+
+        hours = self.time_horizon_days * 24
+        before = surplus.get_window_totals(self.selected_date, days=self.time_horizon_days)
+        after = dispatched.get_window_totals(self.selected_date, days=self.time_horizon_days)
+        df_hourly = dispatched.get_last_hours_from(self.selected_date, hours=hours)
+        summary = battery.summary(df_hourly)
+
+        # ======================================================
+        # Energy
+        # ======================================================
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(
+            t("Import from Grid"),
+            f"{after['ImportfromGrid']:,.0f} kWh",
+            f"{after['ImportfromGrid'] - before['ImportfromGrid']:,.0f} kWh",
+            delta_color="inverse"
+        )
+        col2.metric(
+            t("Export to Grid"),
+            f"{after['ExportToGrid']:,.0f} kWh",
+            f"{after['ExportToGrid'] - before['ExportToGrid']:,.0f} kWh",
+            delta_color="off"
+        )
+        col3.metric(
+            t("Self-sufficiency"),
+            f"{summary['SelfSufficiency']:.1%}",
+            f"{(after['SelfConsumption'] - before['SelfConsumption']) / before['Demand']:+.1%}"
+            if before['Demand'] > 0 else None
+        )
+        col4.metric(t("Equivalent cycles"), f"{summary['EquivalentCycles']:.1f}")
+
+        st.plotly_chart(self.plot_battery(df_hourly), use_container_width=True)
+
+        # ======================================================
+        # Environmental impact (same EI engine as Life Cycle Impact)
+        # ======================================================
+        st.markdown(f"<h3>{t('Net environmental impact')}</h3>", unsafe_allow_html=True)
+        st.dataframe(
+            self.impact_comparison(surplus, dispatched, t("Without battery"), t("With battery")),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        DataDisplay(df=df_hourly.rename(columns={"Datetime": "Date"})).show_table_with_download(
+            filename="battery_dispatch_hourly.csv",
+            height=220
+        )
+
+    # --------------------------------------------------
+    # Green hydrogen
+    # --------------------------------------------------
+    def electrolyser_inputs(self) -> dict:
+        """Electrolyser parameters (without the rated power, which the sweep varies)"""
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            self.electrolyser_kw = st.number_input(t("Electrolyser rated power (kW)"), min_value=0.0,
+                                                   value=1000.0, step=100.0)
+            min_load = st.slider(t("Minimum load (%)"), 0, 100, 10)
+        with col2:
+            tank_kg = st.number_input(t("H2 tank size (kg)"), min_value=0.0, value=500.0, step=50.0)
+            offtake = st.number_input(t("H2 offtake (kg/h)"), min_value=0.0, value=2.0, step=0.5)
+        with col3:
+            export_limit = st.number_input(t("Grid export limit (kW, 0 = no limit)"), min_value=0.0,
+                                           value=0.0, step=100.0)
+
+        with st.expander(t("Efficiency curve (LHV)")):
+            loads, efficiencies = DEFAULT_EFFICIENCY_CURVE
+            curve = st.data_editor(
+                pd.DataFrame({
+                    t("Load (%)"): [load * 100 for load in loads],
+                    t("Efficiency (%)"): [eff * 100 for eff in efficiencies],
+                }),
+                hide_index=True,
+                num_rows="dynamic"
+            ).dropna().sort_values(t("Load (%)"))
+
+        efficiency_curve = DEFAULT_EFFICIENCY_CURVE
+        if not curve.empty:
+            efficiency_curve = (
+                tuple(curve[t("Load (%)")].astype(float) / 100),
+                tuple(curve[t("Efficiency (%)")].astype(float) / 100),
+            )
+
+        return {
+            "min_load": min_load / 100,
+            "efficiency_curve": efficiency_curve,
+            "tank_kg": tank_kg,
+            "offtake_kg_per_hour": offtake,
+            "export_limit_kw": export_limit or None,
+        }
+
+    def render_electrolyser(self):
+        st.markdown(f"<h2>{t('Green Hydrogen')}</h2>", unsafe_allow_html=True)
+        st.caption(t("The electrolyser runs only on the PV surplus that would be exported to the grid."))
+
+        self.electrolyser_options = self.electrolyser_inputs()
+        try:
+            electrolyser = Electrolyser(self.electrolyser_kw, **self.electrolyser_options)
+        except ValueError as e:
+            st.warning(f"{t('Invalid electrolyser parameters')}: {e}")
+            self.electrolyser_options = None
+            return
+
+        surplus = self.energy_data_service.get_surplus_calculator()
+        dispatched = electrolyser.dispatch_calculator(surplus)
+
+        df_hourly = dispatched.get_last_hours_from(self.selected_date, hours=self.time_horizon_days * 24)
+        summary = electrolyser.summary(df_hourly)
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(t("H2 produced"), f"{summary['H2Production']:,.1f} kg")
+        col2.metric(t("Avoided grid exports"), f"{summary['ElectrolyserInput']:,.0f} kWh")
+        # Sin límite de exportación (0 en el formulario) no se vierte nada
+        col3.metric(
+            t("Curtailed energy"),
+            f"{summary['Curtailment']:,.0f} kWh" if self.electrolyser_options["export_limit_kw"] else "-",
+            help=t("PV surplus left after the electrolyser that exceeds the grid export limit and is lost. "
+                   "Only computed when a grid export limit is set.")
+        )
+        col4.metric(
+            t("Specific consumption"),
+            f"{summary['SpecificConsumption']:,.1f} kWh/kg" if summary['H2Production'] > 0 else "-"
+        )
+
+        st.plotly_chart(self.plot_electrolyser(df_hourly), use_container_width=True)
+
+        st.markdown(f"<h3>{t('Net environmental impact')}</h3>", unsafe_allow_html=True)
+        st.dataframe(
+            self.impact_comparison(surplus, dispatched, t("Without electrolyser"), t("With electrolyser")),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        DataDisplay(df=df_hourly.rename(columns={"Datetime": "Date"})).show_table_with_download(
+            filename="electrolyser_hourly.csv",
+            height=220
+        )
+
+    # --------------------------------------------------
+    # Pump scheduling (LP)
+    # --------------------------------------------------
+    def render_pump_scheduling(self):
+        st.markdown(f"<h2>{t('Pump Scheduling')}</h2>", unsafe_allow_html=True)
+        st.caption(t("A share of each day's pumping demand is moved to other hours of the same day "
+                     "to use as much PV production as possible (linear programming, HiGHS)."))
+
+        col1, col2 = st.columns(2)
+        with col1:
+            flexible_share = st.slider(t("Flexible share of daily demand (%)"), 0, 100, 30)
+        with col2:
+            max_power = st.number_input(t("Max. pumping power (kW, 0 = historical maximum)"), min_value=0.0,
+                                        value=0.0, step=100.0)
+        # Sin objetivo "gwp": con la intensidad diaria del mix da la misma importación (ver pump_scheduling)
+        st.caption(t("Objective: minimise grid import. With the daily grid mix, minimising GWP100 "
+                     "gives the same result, so it is not offered until hourly intensity is available."))
+
+        scheduler = PumpScheduler(
+            flexible_share=flexible_share / 100,
+            max_power_kw=max_power or None,
+            objective="import"
+        )
+
+        # Solo los días de la ventana (cada día es independiente)
+        surplus = self.energy_data_service.get_surplus_calculator()
+        try:
+            scheduled = scheduler.schedule(surplus, start_date=self.selected_date, days=self.time_horizon_days)
+        except (ImportError, RuntimeError) as e:
+            st.warning(f"{t('Pump scheduling is not available')}: {e}")
+            return
+
+        before = surplus.get_window_totals(self.selected_date, days=self.time_horizon_days)
+        after = scheduled.get_window_totals(self.selected_date, days=self.time_horizon_days)
+        df_hourly = scheduled.get_last_hours_from(self.selected_date, hours=self.time_horizon_days * 24)
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(
+            t("Import from Grid"),
+            f"{after['ImportfromGrid']:,.0f} kWh",
+            f"{after['ImportfromGrid'] - before['ImportfromGrid']:,.0f} kWh",
+            delta_color="inverse"
+        )
+        col2.metric(
+            t("Self Consumption"),
+            f"{after['SelfConsumption']:,.0f} kWh",
+            f"{after['SelfConsumption'] - before['SelfConsumption']:,.0f} kWh"
+        )
+        col3.metric(t("Shifted energy"), f"{df_hourly['ShiftedLoad'].clip(lower=0).sum():,.0f} kWh")
+        col4.metric(t("Solve time"), f"{scheduler.solve_seconds * 1000:,.0f} ms")
+
+        st.plotly_chart(self.plot_pump_schedule(df_hourly), use_container_width=True)
+
+        st.markdown(f"<h3>{t('Net environmental impact')}</h3>", unsafe_allow_html=True)
+        st.dataframe(
+            self.impact_comparison(surplus, scheduled, t("Current schedule"), t("Optimised schedule")),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        DataDisplay(df=df_hourly.rename(columns={"Datetime": "Date"})).show_table_with_download(
+            filename="pump_schedule_hourly.csv",
+            height=220
+        )
+
+    # --------------------------------------------------
+    # Sizing sweep
+    # --------------------------------------------------
+    def render_sweep(self):
+        st.markdown(f"<h2>{t('Sizing Sweep')}</h2>", unsafe_allow_html=True)
+        st.caption(t("Every combination is simulated over the full 2020-2023 series."))
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            pv_scales = parse_values(st.text_input(t("PV scale factors"), "0.5, 1, 1.5, 2"))
+        with col2:
+            battery_sizes = parse_values(st.text_input(t("Battery sizes (kWh)"), "0, 2000, 4000, 8000, 16000"))
+        with col3:
+            electrolyser_sizes = parse_values(st.text_input(t("Electrolyser sizes (kW)"), "0, 500, 1000"))
+        with col4:
+            c_rate = st.number_input(t("Battery power / capacity (C-rate)"), min_value=0.05, value=0.5, step=0.05)
+
+        # El resto de parámetros del electrolizador, de la sección Green Hydrogen
+        electrolyser_options = self.electrolyser_options or {}
+        st.caption(t("Electrolyser minimum load, efficiency curve, tank and offtake are taken from the section above."))
+
+        combinations = sweep_combinations(
+            pv_scales,
+            [kwh for kwh in battery_sizes if kwh >= 0],
+            [kw for kw in electrolyser_sizes if kw >= 0]
+        )
+        key = (tuple(combinations), c_rate, repr(electrolyser_options))
+
+        if st.button(t("Run sweep"), disabled=not combinations):
+            surplus = self.energy_data_service.get_surplus_calculator()
+            arrays, pv_factor = build_sweep_arrays(
+                surplus, self.energy_data_service.get_grid_mix(), GRID_MIX_INDICATORS, metric="GWP100"
+            )
+
+            progress = st.progress(0.0)
+            rows = []
+            for row in run_sweep(arrays, pv_factor, combinations, workers=SWEEP_WORKERS, c_rate=c_rate,
+                                 electrolyser_options=electrolyser_options):
+                rows.append(row)
+                progress.progress(len(rows) / len(combinations))
+            progress.empty()
+            st.session_state.sweep_results = (key, sweep_frame(rows))
+
+        results = st.session_state.get("sweep_results")
+        if results is None or results[0] != key:
+            return
+
+        df = results[1].rename(columns={
+            "PVScale": t("PV scale"),
+            "BatteryKWh": t("Battery (kWh)"),
+            "BatteryKW": t("Battery (kW)"),
+            "ElectrolyserKW": t("Electrolyser (kW)"),
+            "SelfConsumptionRatio": t("Self-consumption ratio"),
+            "SelfSufficiency": t("Self-sufficiency"),
+            "ImportfromGrid": t("Import from Grid (kWh)"),
+            "ExportToGrid": t("Export to Grid (kWh)"),
+            "ElectrolyserInput": t("Electrolyser input (kWh)"),
+            "H2Production": t("H2 produced (kg)"),
+            "Curtailment": t("Curtailed energy (kWh)"),
+            "NetImpact": t("GWP100 net impact (kg CO2-Eq.)"),
+        })
+        DataDisplay(df=df).show_table_with_download(filename="sizing_sweep.csv", height=300)
+
+    def impact_comparison(self, base, adjusted, base_label: str, adjusted_label: str) -> pd.DataFrame:
+        """Net impact of the window per metric, for the current system and an adjusted scenario"""
+        before = self.impact_totals(base)
+        after = self.impact_totals(adjusted)
+
+        rows = []
+        for metric, unit in EnvironmentalIndicatorsService.METRICS_INFO.items():
+            rows.append({
+                t("Indicator"): f"{metric} ({unit})",
+                base_label: before[metric]["Net Impact"],
+                adjusted_label: after[metric]["Net Impact"],
+                t("Change"): after[metric]["Net Impact"] - before[metric]["Net Impact"],
+            })
+        return pd.DataFrame(rows)
+
+    def impact_totals(self, calculator) -> dict:
+        """EI totals of the selected window for a (possibly adjusted) SurplusCalculator"""
+        df_daily = calculator.get_daily_aggregated_from(self.selected_date, days=self.time_horizon_days)
+        return EnvironmentalIndicatorsService(
+            df_daily_energy=df_daily,
+            df_mix_grid=self.energy_data_service.get_grid_mix()
+        ).calculate_EI_totals(GRID_MIX_INDICATORS, days=self.time_horizon_days)
+
+    @staticmethod
+    def plot_battery(df_hourly: pd.DataFrame) -> "go.Figure":
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=df_hourly["Datetime"], y=df_hourly["BatteryCharge"],
+            name=t("Charge"), marker_color="#2a9d8f"
+        ))
+        fig.add_trace(go.Bar(
+            x=df_hourly["Datetime"], y=-df_hourly["BatteryDischarge"],
+            name=t("Discharge"), marker_color="#e76f51"
+        ))
+        fig.add_trace(go.Scatter(
+            x=df_hourly["Datetime"], y=df_hourly["BatterySoC"],
+            name=t("State of charge"), mode="lines", line=dict(color="#264653", width=2), yaxis="y2"
+        ))
+        fig.update_layout(
+            barmode="relative",
+            yaxis=dict(title=t("Charge / discharge (kWh)")),
+            yaxis2=dict(title=t("State of charge (kWh)"), overlaying="y", side="right", rangemode="tozero"),
+            legend=dict(orientation="h", y=1.1),
+            margin=dict(t=40, b=40),
+            height=420
+        )
+        return fig
+
+    @staticmethod
+    def plot_electrolyser(df_hourly: pd.DataFrame) -> "go.Figure":
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=df_hourly["Datetime"], y=df_hourly["ElectrolyserInput"],
+            name=t("Electrolyser input"), marker_color="#2a9d8f"
+        ))
+        fig.add_trace(go.Bar(
+            x=df_hourly["Datetime"], y=df_hourly["ExportToGrid"],
+            name=t("Export to Grid"), marker_color="#e9c46a"
+        ))
+        fig.add_trace(go.Bar(
+            x=df_hourly["Datetime"], y=df_hourly["Curtailment"],
+            name=t("Curtailment"), marker_color="#e76f51"
+        ))
+        fig.add_trace(go.Scatter(
+            x=df_hourly["Datetime"], y=df_hourly["H2Tank"],
+            name=t("H2 in tank (kg)"), mode="lines", line=dict(color="#264653", width=2), yaxis="y2"
+        ))
+        fig.update_layout(
+            barmode="stack",
+            yaxis=dict(title=t("PV surplus (kWh)")),
+            yaxis2=dict(title=t("H2 in tank (kg)"), overlaying="y", side="right", rangemode="tozero"),
+            legend=dict(orientation="h", y=1.1),
+            margin=dict(t=40, b=40),
+            height=420
+        )
+        return fig
+
+    @staticmethod
+    def plot_pump_schedule(df_hourly: pd.DataFrame) -> "go.Figure":
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=df_hourly["Datetime"], y=df_hourly["Production"],
+            name=t("Production"), mode="lines", fill="tozeroy", line=dict(color="#e9c46a", width=1)
+        ))
+        fig.add_trace(go.Scatter(
+            x=df_hourly["Datetime"], y=df_hourly["DemandOriginal"],
+            name=t("Current demand"), mode="lines", line=dict(color="#6c757d", width=2, dash="dot")
+        ))
+        fig.add_trace(go.Scatter(
+            x=df_hourly["Datetime"], y=df_hourly["Demand"],
+            name=t("Optimised demand"), mode="lines", line=dict(color="#264653", width=2)
+        ))
+        fig.update_layout(
+            yaxis=dict(title=t("Energy (kWh)")),
+            legend=dict(orientation="h", y=1.1),
+            margin=dict(t=40, b=40),
+            height=420
+        )
+        return fig
@@ -0,0 +1,190 @@
+"""
+Reprogramación óptima del bombeo (programación lineal, HiGHS de scipy).
+
+Una parte `flexible_share` de la demanda de cada día puede moverse a otras
+horas del MISMO día; el resto es fijo. Por hora t del día d:
+
+    variables  x_t (carga flexible), i_t (importación), u_t (|x_t - x0_t|)
+    min        Σ c_d · i_t + ε · Σ u_t
+    s.a.       Σ_{t∈d} x_t = flexible_share · Σ_{t∈d} Demand_t
+               fijo_t + x_t - Production_t <= i_t
+               0 <= x_t <= P_max · dt - fijo_t,  i_t >= 0
+
+x0_t es la carga flexible original; el término ε·u desempata entre óptimos
+(no mueve carga si no reduce la importación). c_d = 1 (objetivo "import") o
+la intensidad diaria de la métrica (objetivo "gwp"). Con el mix diario la
+intensidad es constante dentro de cada día y los días no se acoplan, así que
+ambos objetivos llegan hoy a la misma importación diaria (solo cambia el
+desempate entre óptimos): la página de optimización ofrece solo "import" y
+"gwp" queda preparado para cuando haya una intensidad horaria.
+
+Los días son independientes: se agrupan en lotes de `batch_days` días y
+cada lote es un único LP de bloques diagonales (matrices dispersas).
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.surplus_calculator import SurplusCalculator
+from src.utils.time_index import day_ordinals
+from src.environmental_indicators.grid_mix_calculator import get_intensity_matrix
+
+
+OBJECTIVES = ("import", "gwp")
+SCHEDULE_COLUMNS = ['DemandOriginal', 'ShiftedLoad']
+
+
+class PumpScheduler:
+    """
+    Reprograma la demanda flexible contra la producción FV de cada día.
+    """
+
+    def __init__(self, flexible_share: float = 0.3, max_power_kw: float = None, objective: str = "import",
+                 batch_days: int = 92, tie_break: float = 1e-4, step_hours: float = 1.0):
+        """
+        flexible_share: fracción (0-1) de la demanda diaria que se puede mover
+        max_power_kw: potencia máxima de bombeo (None = máximo horario histórico)
+        objective: "import" (kWh importados) o "gwp" (impacto de la importación, intensidad diaria del mix)
+        batch_days: días por LP (bloques diagonales)
+        tie_break: peso relativo de no mover carga (ε respecto al coste medio)
+        """
+        if not 0 <= flexible_share <= 1:
+            raise ValueError("flexible_share must be in [0, 1].")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {OBJECTIVES}.")
+        if batch_days < 1:
+            raise ValueError("batch_days must be >= 1.")
+
+        self.flexible_share = float(flexible_share)
+        self.max_power_kw = max_power_kw
+        self.objective = objective
+        self.batch_days = int(batch_days)
+        self.tie_break = float(tie_break)
+        self.step_hours = float(step_hours)
+
+        # Métricas del último schedule()
+        self.solve_seconds = None
+        self.batches = None
+
+    # --------------------------------------------------
+    # Programación
+    # --------------------------------------------------
+    def schedule(self, surplus: SurplusCalculator, grid_mix=None, indicators: list = None,
+                 metric: str = "GWP100", start_date=None, days: int = None) -> SurplusCalculator:
+        """
+        Reprograma los días [start_date, start_date + days) (todo el resultado si
+        no se indican) y devuelve un SurplusCalculator con la nueva demanda y sus
+        flujos, más DemandOriginal y ShiftedLoad (kWh movidos a cada hora).
+        Con objective="gwp" hacen falta grid_mix e indicators.
+        """
+        # Días completos desde start_date (sin materializar el resultado horario)
+        start, end = 0, len(surplus)
+        if start_date is not None:
+            first_day = pd.Timestamp(start_date).normalize()
+            start = surplus.position_of(first_day)
+            if days is not None:
+                end = surplus.position_of(first_day + pd.Timedelta(days=days))
+
+        epoch_ns = surplus.epoch_ns(start, end)
+        demand_measured = surplus.column('Demand', start, end)
+        demand = np.nan_to_num(demand_measured)
+        production = np.nan_to_num(surplus.column('Production', start, end))
+        day_ids = day_ordinals(epoch_ns)
+
+        cost = np.ones(len(epoch_ns))
+        if self.objective == "gwp":
+            if grid_mix is None or indicators is None:
+                raise ValueError("objective='gwp' needs grid_mix and indicators.")
+            matrix = get_intensity_matrix(grid_mix, indicators)
+            cost = matrix.lookup(epoch_ns.astype('datetime64[ns]'))[:, matrix.metrics.index(metric)]
+            # Días sin mix: intensidad media (no quedan fuera de la optimización)
+            cost = np.where(np.isnan(cost), np.nanmean(cost), cost)
+
+        new_demand = self.solve(demand, production, day_ids, cost)
+
+        self_consumption, import_from_grid, export_to_grid = SurplusCalculator.compute_flows(new_demand, production)
+        df = pd.DataFrame({
+            'Datetime': epoch_ns.astype('datetime64[ns]'),
+            'Demand': new_demand,
+            'Production': surplus.column('Production', start, end),
+            'SelfConsumption': self_consumption,
+            'ImportfromGrid': import_from_grid,
+            'ExportToGrid': export_to_grid,
+            'DemandOriginal': demand_measured,
+            'ShiftedLoad': new_demand - demand,
+        })
+        return SurplusCalculator.from_result(df, compact=surplus.is_compact, daily_columns=surplus.daily_columns)
+
+    def solve(self, demand: np.ndarray, production: np.ndarray, day_ids: np.ndarray,
+              cost: np.ndarray) -> np.ndarray:
+        """Nueva demanda horaria (fija + flexible óptima), resolviendo por lotes de días"""
+        t0 = time.perf_counter()
+        max_power = self.max_power_kw if self.max_power_kw is not None else (demand.max() if len(demand) else 0.0)
+        # La potencia máxima nunca queda por debajo de lo que ya se bombeaba
+        capacity = np.maximum(max_power * self.step_hours, demand)
+
+        flexible = demand * self.flexible_share
+        fixed = demand - flexible
+        new_demand = demand.copy()
+
+        starts = np.flatnonzero(np.diff(day_ids, prepend=day_ids[:1] - 1)) if len(day_ids) else np.zeros(0, int)
+        bounds = np.append(starts, len(day_ids))
+        self.batches = 0
+        for b in range(0, len(starts), self.batch_days):
+            lo, hi = bounds[b], bounds[min(b + self.batch_days, len(starts))]
+            if flexible[lo:hi].sum() <= 0:
+                continue
+            x = self._solve_batch(
+                fixed[lo:hi], flexible[lo:hi], production[lo:hi], capacity[lo:hi],
+                day_ids[lo:hi], cost[lo:hi]
+            )
+            new_demand[lo:hi] = fixed[lo:hi] + x
+            self.batches += 1
+
+        self.solve_seconds = time.perf_counter() - t0
+        return new_demand
+
+    def _solve_batch(self, fixed, flexible, production, capacity, day_ids, cost) -> np.ndarray:
+        """Un LP de bloques diagonales (un bloque por día) → carga flexible x por hora"""
+        from scipy.optimize import linprog
+        from scipy.sparse import coo_matrix, vstack
+
+        n = len(fixed)
+        rows = np.arange(n)
+        _, day = np.unique(day_ids, return_inverse=True)
+        n_days = day.max() + 1
+
+        # Variables: [x (n), i (n), u (n)]
+        def block(coef_x, coef_i, coef_u):
+            data, cols, row_idx = [], [], []
+            for offset, coef in ((0, coef_x), (n, coef_i), (2 * n, coef_u)):
+                if coef:
+                    data.append(np.full(n, coef, dtype=np.float64))
+                    cols.append(rows + offset)
+                    row_idx.append(rows)
+            return coo_matrix(
+                (np.concatenate(data), (np.concatenate(row_idx), np.concatenate(cols))),
+                shape=(n, 3 * n)
+            )
+
+        # x - i <= P - fijo;  x - u <= x0;  -x - u <= -x0
+        a_ub = vstack([block(1, -1, 0), block(1, 0, -1), block(-1, 0, -1)]).tocsr()
+        b_ub = np.concatenate([production - fixed, flexible, -flexible])
+
+        # Σ_{t∈d} x_t = Σ_{t∈d} x0_t
+        a_eq = coo_matrix((np.ones(n), (day, rows)), shape=(n_days, 3 * n)).tocsr()
+        b_eq = np.bincount(day, weights=flexible, minlength=n_days)
+
+        eps = self.tie_break * float(np.mean(cost)) if n else 0.0
+        c = np.concatenate([np.zeros(n), cost, np.full(n, eps)])
+        bounds = np.column_stack([
+            np.zeros(3 * n),
+            np.concatenate([np.maximum(capacity - fixed, flexible), np.full(2 * n, np.inf)])
+        ])
+
+        res = linprog(c, A_ub=a_ub, b_ub=b_ub, A_eq=a_eq, b_eq=b_eq, bounds=bounds, method="highs")
+        if res.status != 0:
+            raise RuntimeError(f"Pump scheduling LP failed: {res.message}")
+        # Recorte de la tolerancia del solver (x >= 0)
+        return np.clip(res.x[:n], 0.0, None)
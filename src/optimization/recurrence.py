@@ -0,0 +1,35 @@
+import numpy as np
+
+
+def clamped_cumsum(deltas, initial: float, lower, upper) -> np.ndarray:
+    """
+    Estado acotado s_t = min(max(s_{t-1} + deltas[t], lower[t]), upper[t]), s_{-1} = initial,
+    sin bucle en Python.
+
+    Cada paso es una función s -> clamp(s + a, b, c) y la composición de dos de
+    ellas es otra del mismo tipo:
+
+        (a1, b1, c1) y luego (a2, b2, c2) = (a1 + a2, clamp(b1 + a2, b2, c2), clamp(c1 + a2, b2, c2))
+
+    así que todas las composiciones prefijo salen con un scan paralelo
+    (Hillis-Steele): log2(n) pasadas vectorizadas. lower/upper: escalar o array.
+    """
+    a = np.array(deltas, dtype=np.float64)
+    n = len(a)
+    b = np.broadcast_to(np.asarray(lower, dtype=np.float64), (n,)).copy()
+    c = np.broadcast_to(np.asarray(upper, dtype=np.float64), (n,)).copy()
+    if np.any(b > c):
+        raise ValueError("lower must be <= upper")
+
+    shift = 1
+    while shift < n:
+        # Compone el prefijo que acaba en i - shift (primero) con el tramo que acaba en i
+        a2, b2, c2 = a[shift:], b[shift:], c[shift:]
+        b_new = np.clip(b[:-shift] + a2, b2, c2)
+        c_new = np.clip(c[:-shift] + a2, b2, c2)
+        a[shift:] = a[:-shift] + a2
+        b[shift:] = b_new
+        c[shift:] = c_new
+        shift *= 2
+
+    return np.clip(initial + a, b, c)
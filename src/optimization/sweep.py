@@ -0,0 +1,206 @@
+"""
+Barrido de dimensionado (factor FV × batería × electrolizador) en paralelo.
+
+Las series horarias (demanda, producción, intensidad de la red por hora) se
+copian UNA vez a memoria compartida; los procesos del pool se conectan en su
+inicializador y las leen como vistas de solo lectura. Cada tarea solo lleva
+una lista de combinaciones (tuplas de floats) y devuelve filas de resultados
+pequeñas, que se entregan según van terminando (as_completed).
+"""
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.surplus_calculator import SurplusCalculator
+from src.environmental_indicators.grid_mix_calculator import get_intensity_matrix
+from src.optimization.battery import BatteryStorage
+from src.optimization.electrolyser import Electrolyser
+
+
+SWEEP_ARRAYS = ['Demand', 'Production', 'Intensity']
+
+# Los procesos del pool no se crean con fork: Streamlit ejecuta cada sesión en
+# un hilo y un fork copiaría locks tomados por otros hilos (bloqueos en el hijo)
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+# --------------------------------------------------
+# Memoria compartida
+# --------------------------------------------------
+class SharedHourlyArrays:
+    """
+    Arrays float64 de la misma longitud en un único bloque de memoria compartida
+    (filas = SWEEP_ARRAYS). Quien lo crea debe llamar a close() al terminar.
+    """
+
+    def __init__(self, arrays: dict):
+        self.names = list(arrays)
+        self.length = len(next(iter(arrays.values())))
+        self._shm = shared_memory.SharedMemory(create=True, size=max(len(self.names) * self.length * 8, 1))
+        block = np.ndarray((len(self.names), self.length), dtype=np.float64, buffer=self._shm.buf)
+        for i, name in enumerate(self.names):
+            block[i] = arrays[name]
+
+    @property
+    def spec(self) -> tuple:
+        """Lo necesario para conectarse desde otro proceso (se envía una sola vez por worker)"""
+        return self._shm.name, self.names, self.length
+
+    @staticmethod
+    def attach(spec: tuple):
+        """Devuelve (segmento, {nombre: vista de solo lectura}); el segmento debe seguir vivo"""
+        name, names, length = spec
+        shm = shared_memory.SharedMemory(name=name)
+        block = np.ndarray((len(names), length), dtype=np.float64, buffer=shm.buf)
+        block.flags.writeable = False
+        return shm, {key: block[i] for i, key in enumerate(names)}
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+
+# Estado de cada proceso del pool (se fija en _init_worker)
+_WORKER = {}
+
+
+def _init_worker(spec: tuple, pv_factor: float, options: dict):
+    shm, arrays = SharedHourlyArrays.attach(spec)
+    _WORKER.update(shm=shm, arrays=arrays, pv_factor=pv_factor, options=options)
+
+
+def _evaluate_chunk(combinations: list) -> list:
+    return [
+        evaluate_scenario(_WORKER['arrays'], _WORKER['pv_factor'], *combination, **_WORKER['options'])
+        for combination in combinations
+    ]
+
+
+# --------------------------------------------------
+# Modelo de un escenario
+# --------------------------------------------------
+def build_sweep_arrays(surplus: SurplusCalculator, grid_mix, indicators: list, metric: str = "GWP100"):
+    """
+    Series horarias del barrido y factor FV de `metric`. La intensidad diaria del
+    mix se repite en cada hora del día: Σ_horas import·I(día) = Σ_días import_día·I(día),
+    igual que el motor EI diario (los días sin mix quedan en NaN y no suman).
+    """
+    matrix = get_intensity_matrix(grid_mix, indicators)
+    j = matrix.metrics.index(metric)
+    arrays = {
+        'Demand': np.nan_to_num(surplus.column('Demand')),
+        'Production': np.nan_to_num(surplus.column('Production')),
+        'Intensity': matrix.lookup(surplus.epoch_ns().astype('datetime64[ns]'))[:, j],
+    }
+    return arrays, float(matrix.pv_factors[j])
+
+
+def evaluate_scenario(arrays: dict, pv_factor: float, pv_scale: float, battery_kwh: float,
+                      electrolyser_kw: float = 0.0, c_rate: float = 0.5, round_trip_efficiency: float = 0.9,
+                      initial_soc: float = 0.5, min_soc: float = 0.0, electrolyser_options: dict = None) -> dict:
+    """
+    Un escenario sobre toda la serie: producción × pv_scale, batería de
+    battery_kwh con potencia battery_kwh × c_rate y, con el excedente que queda,
+    un electrolizador de electrolyser_kw (electrolyser_options: resto de
+    parámetros de Electrolyser). Devuelve una fila de resultados; NetImpact es
+    el impacto neto de la métrica usada en build_sweep_arrays.
+    """
+    demand = arrays['Demand']
+    production = arrays['Production'] * pv_scale
+    self_consumption, import_from_grid, export_to_grid = SurplusCalculator.compute_flows(demand, production)
+
+    battery_kw = battery_kwh * c_rate
+    battery = BatteryStorage(battery_kwh, battery_kw, round_trip_efficiency=round_trip_efficiency,
+                             initial_soc=initial_soc, min_soc=min_soc)
+    charge, discharge, _ = battery.simulate(export_to_grid, import_from_grid)
+
+    electrolyser = Electrolyser(electrolyser_kw, **(electrolyser_options or {}))
+    h2 = electrolyser.simulate(export_to_grid - charge)
+
+    self_total = float(self_consumption.sum() + discharge.sum())
+    import_total = float(import_from_grid.sum() - discharge.sum())
+    export_total = float(h2['ExportToGrid'].sum())
+    electrolyser_total = float(h2['ElectrolyserInput'].sum())
+    production_total = float(production.sum())
+    demand_total = float(demand.sum())
+
+    grid_impact = float(np.nansum((import_from_grid - discharge) * arrays['Intensity']))
+    return {
+        'PVScale': pv_scale,
+        'BatteryKWh': battery_kwh,
+        'BatteryKW': battery_kw,
+        'ElectrolyserKW': electrolyser_kw,
+        'SelfConsumptionRatio': self_total / production_total if production_total > 0 else np.nan,
+        'SelfSufficiency': self_total / demand_total if demand_total > 0 else np.nan,
+        'ImportfromGrid': import_total,
+        'ExportToGrid': export_total,
+        'ElectrolyserInput': electrolyser_total,
+        'H2Production': float(h2['H2Production'].sum()),
+        'Curtailment': float(h2['Curtailment'].sum()),
+        'NetImpact': grid_impact + pv_factor * (self_total + electrolyser_total - export_total),
+    }
+
+
+# --------------------------------------------------
+# Barrido
+# --------------------------------------------------
+def sweep_combinations(pv_scales, battery_kwh, electrolyser_kw=(0.0,)) -> list:
+    return [
+        (float(pv), float(kwh), float(kw))
+        for pv, kwh, kw in itertools.product(pv_scales, battery_kwh, electrolyser_kw)
+    ]
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def run_sweep(arrays: dict, pv_factor: float, combinations: list, workers: int = None,
+              chunk_size: int = None, **options):
+    """
+    Evalúa las combinaciones (pv_scale, battery_kwh, electrolyser_kw) y entrega
+    las filas según terminan (el orden no es el de entrada). workers=None: todos
+    los núcleos; workers<=1: en este proceso, sin pool. options: ver evaluate_scenario.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers <= 1 or len(combinations) <= 1:
+        for combination in combinations:
+            yield evaluate_scenario(arrays, pv_factor, *combination, **options)
+        return
+
+    # Trozos pequeños: reparto equilibrado y resultados que llegan pronto
+    chunk_size = chunk_size or max(1, len(combinations) // (workers * 4))
+
+    shared = SharedHourlyArrays(arrays)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(POOL_START_METHOD),
+            initializer=_init_worker,
+            initargs=(shared.spec, pv_factor, options)
+        ) as pool:
+            futures = [pool.submit(_evaluate_chunk, chunk) for chunk in _chunks(combinations, chunk_size)]
+            try:
+                for future in as_completed(futures):
+                    yield from future.result()
+            finally:
+                # Si se deja de consumir el generador, no se calcula lo pendiente
+                for future in futures:
+                    future.cancel()
+    finally:
+        shared.close()
+
+
+def sweep_frame(rows) -> pd.DataFrame:
+    """Resultados como DataFrame ordenado por tamaño (PVScale, BatteryKWh, ElectrolyserKW)"""
+    return (
+        pd.DataFrame(list(rows))
+        .sort_values(['PVScale', 'BatteryKWh', 'ElectrolyserKW'])
+        .reset_index(drop=True)
+    )
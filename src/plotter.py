@@ -1,21 +1,21 @@
-import matplotlib
-matplotlib.use("TkAgg")  # o "TkAgg", depende de tu sistema
 import pandas as pd
-import plotly.graph_objects as go
+
+from src.utils.lazy_imports import lazy_import
+
+go = lazy_import("plotly.graph_objects")
 
 class LastDateEnergyPlotter:
     def __init__(self, df, mode='hourly'):
         self.mode = mode
-        self.df = df.copy()
+        self.df = df  # solo lectura: las transformaciones crean frames nuevos
 
         # Ajuste de período
         if mode == 'hourly':
             self.df = self.df.tail(168)
         else:
-            df_last168 = self.df.tail(168).copy()
-            df_last168['Date'] = df_last168['Datetime'].dt.date
+            df_last168 = self.df.tail(168)
             cols_to_sum = ['SelfConsumption', 'ImportfromGrid', 'ExportToGrid', 'Demand', 'Production']
-            df_daily = df_last168.groupby('Date')[cols_to_sum].sum().reset_index()
+            df_daily = df_last168.groupby(df_last168['Datetime'].dt.date.rename('Date'))[cols_to_sum].sum().reset_index()
             df_daily['Datetime'] = pd.to_datetime(df_daily['Date'])
             df_daily.drop(columns='Date', inplace=True)
             self.df = df_daily.tail(7)
@@ -28,17 +28,27 @@ class LastDateEnergyPlotter:
         self._sanitize_dataframe()
 
     def _sanitize_dataframe(self):
-        """Garante datetime, float e ordenação"""
+        """Garante datetime, float e ordenação (sin copiar si los datos ya están limpios)"""
         cols_numeric = ['SelfConsumption', 'ImportfromGrid', 'ExportToGrid', 'Demand', 'Production']
-        self.df['Datetime'] = pd.to_datetime(self.df['Datetime'], errors='coerce')
-        self.df.dropna(subset=['Datetime'], inplace=True)
+        df = self.df
+
+        if not pd.api.types.is_datetime64_any_dtype(df['Datetime']):
+            df = df.assign(Datetime=pd.to_datetime(df['Datetime'], errors='coerce'))
+
+        non_numeric = [c for c in cols_numeric if not pd.api.types.is_numeric_dtype(df[c])]
+        if non_numeric:
+            df = df.assign(**{c: pd.to_numeric(df[c], errors='coerce') for c in non_numeric})
 
-        for c in cols_numeric:
-            self.df[c] = pd.to_numeric(self.df[c], errors='coerce')
+        valid = df[['Datetime'] + cols_numeric].notna().all(axis=1)
+        if not valid.all():
+            df = df[valid]
+        if not df['Datetime'].is_monotonic_increasing:
+            df = df.sort_values('Datetime')
 
-        self.df.dropna(subset=cols_numeric, inplace=True)
-        self.df.sort_values('Datetime', inplace=True)
-        self.df.reset_index(drop=True, inplace=True)
+        # Vista con índice 0..n-1 (el frame de entrada no se toca)
+        df = df.copy(deep=False)
+        df.index = pd.RangeIndex(len(df))
+        self.df = df
 
     def _plot_line(self, y_col, name, color):
         """Plot simples de linha (hourly ou daily)"""
@@ -1,17 +1,76 @@
+import csv
+import io
+import threading
+import time
 from pathlib import Path
 import pandas as pd
 
 from src.data_loader import DataLoader
+from src.utils.frame_cache import source_signature
+from src.utils.time_index import position_of
+from src.utils.readonly import freeze_frame
+from src.utils.cumulative_totals import CumulativeTotals
+from src.services.rollup_cube import RollupCube
 from src.surplus_calculator import SurplusCalculator
 from src.environmental_indicators.ei_service import EnvironmentalIndicatorsService
+from src.environmental_indicators.grid_mix_loader import GridMixStore, get_grid_mix_store
+from src.forecasting.models import HourlyHistory, build_models
+
+
+class EnergyDataState:
+    """
+    Todo lo cargado y calculado de una versión de los CSV de origen. Se
+    construye completo ANTES de publicarse en el servicio y después no se
+    modifica (salvo los modelos de previsión, que se crean la primera vez que
+    se piden): un lector que tomó una referencia ve siempre datos coherentes.
+    """
+
+    def __init__(self, demand_df, production_df, surplus_calculator: SurplusCalculator,
+                 df_daily_full: pd.DataFrame, load_metrics: dict = None,
+                 signature: str = None, source_offset: int = None, source_header: list = None,
+                 source_tail: bytes = None):
+        self.demand_df = demand_df
+        self.production_df = production_df
+        self.surplus_calculator = surplus_calculator
+
+        # Diario completo (solo lectura) y sus derivados: sumas acumuladas y cubo semana / mes / año
+        self.df_daily_full = df_daily_full = freeze_frame(df_daily_full)
+        self.daily_cumulative = CumulativeTotals(df_daily_full)
+        self.rollups = RollupCube(
+            df_daily_full,
+            columns=[col for col in df_daily_full.columns if col != "Datetime"]
+        )
+
+        self.load_metrics = load_metrics  # filas/seg de la carga
+        self.forecast_models = None  # modelos de previsión (ajustes en caché por fecha de inicio)
+
+        # Para el modo incremental (refresh)
+        self.signature = signature
+        self.source_offset = source_offset  # bytes ya leídos del CSV
+        self.source_header = source_header
+        self.source_tail = source_tail  # últimos bytes leídos (huella del prefijo ya cargado)
 
 
 class EnergyDataService:
     """
     Servicio centralizado de carga, cálculo y agregación de datos energéticos.
+
+    Se comparte entre sesiones (hilos): los datos viven en un EnergyDataState
+    que se sustituye entero (una asignación) al cargar o actualizar, y cada
+    lectura toma una sola referencia al estado vigente.
     """
 
-    def __init__(self):
+    DEMAND_COL = "Energy Consumption kWh"
+    PRODUCTION_COL = "Producción Planta"
+    DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+    # Bytes antes del offset que refresh() compara para aceptar un append
+    TAIL_BYTES = 4096
+
+    def __init__(self, compact_hourly: bool = False):
+        """
+        compact_hourly: resultado horario en float32 con índice implícito (opcional,
+        menos memoria; ver SurplusCalculator).
+        """
         # Streamlit/src/services -> Streamlit/src -> Streamlit
         self.streamlit_root = Path(__file__).resolve().parent.parent.parent
         self.data_dir = self.streamlit_root / "data"
@@ -21,42 +80,167 @@ class EnergyDataService:
         self.production_path = self.data_dir / "true_data.csv"
         self.grid_mix_path = self.data_dir / "percentage_mix_grid_unified.csv"
 
-        # DataFrames base
-        self.demand_df = None
-        self.production_df = None
+        self.compact_hourly = compact_hourly
+
+        # Estado publicado (None hasta la primera carga)
+        self._state = None
+        # Serializa quien construye estados (carga inicial y refresh); los lectores no lo toman
+        self._build_lock = threading.Lock()
+
+    # --------------------------------------------------
+    # Estado vigente
+    # --------------------------------------------------
+    def _current_state(self) -> EnergyDataState:
+        """Estado publicado; la primera vez se carga (una sola carga aunque lleguen varias sesiones)"""
+        state = self._state
+        if state is None:
+            with self._build_lock:
+                state = self._state
+                if state is None:
+                    state = self._state = self._load_state()
+        return state
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._state is not None
+
+    @property
+    def loaded_signature(self):
+        state = self._state
+        return None if state is None else state.signature
+
+    # Acceso de solo lectura al estado vigente (None si aún no se ha cargado)
+    @property
+    def demand_df(self):
+        return None if self._state is None else self._state.demand_df
 
-        # Cálculos
-        self.surplus_calculator = None
-        self.df_daily_full = None  # 👈 CLAVE: diario completo (2020–2023)
+    @property
+    def production_df(self):
+        return None if self._state is None else self._state.production_df
 
-        self._loaded = False
+    @property
+    def surplus_calculator(self):
+        return None if self._state is None else self._state.surplus_calculator
+
+    @property
+    def df_daily_full(self):
+        return None if self._state is None else self._state.df_daily_full
+
+    @property
+    def daily_cumulative(self):
+        return None if self._state is None else self._state.daily_cumulative
+
+    @property
+    def rollups(self):
+        return None if self._state is None else self._state.rollups
+
+    @property
+    def load_metrics(self):
+        return None if self._state is None else self._state.load_metrics
+
+    # --------------------------------------------------
+    # Firma de los datos de origen
+    # --------------------------------------------------
+    def get_source_signature(self) -> str:
+        """
+        Firma (mtime + tamaño) de los CSV de origen.
+        Cambia solo cuando cambian los datos; sirve como clave de caché.
+        """
+        paths = dict.fromkeys([self.demand_path, self.production_path, self.grid_mix_path])
+        return "|".join(source_signature(path) for path in paths)
 
     # --------------------------------------------------
     # Carga de datos
     # --------------------------------------------------
     def load_data(self):
+        """Carga completa y publica el estado nuevo (sustituye al anterior de una vez)"""
+        with self._build_lock:
+            self._state = self._load_state()
+
+    def _load_state(self) -> EnergyDataState:
         if not self.demand_path.exists():
             raise FileNotFoundError(f"No se encontró el CSV de demanda en: {self.demand_path}")
         if not self.production_path.exists():
             raise FileNotFoundError(f"No se encontró el CSV de producción en: {self.production_path}")
 
+        # Posición de lectura y cabecera para detectar filas añadidas al final
+        # (antes de leer: si el CSV crece durante la carga, refresh() lo recoge)
+        signature = self.get_source_signature()
+        source_offset = self.demand_path.stat().st_size
+        with open(self.demand_path, "r", encoding="utf-8", newline="") as f:
+            source_header = next(csv.reader(f))
+        with open(self.demand_path, "rb") as f:
+            f.seek(max(source_offset - self.TAIL_BYTES, 0))
+            source_tail = f.read(source_offset - f.tell())
+
+        # Demanda y producción vienen del mismo CSV: una sola lectura alimenta ambas series
+        if self.demand_path == self.production_path:
+            loader = self._build_loader(
+                self.demand_path,
+                [self.DEMAND_COL, self.PRODUCTION_COL]
+            )
+            loader.load()
+            demand_loader = prod_loader = loader
+        else:
+            demand_loader = self._build_loader(self.demand_path, [self.DEMAND_COL])
+            demand_loader.load()
+            prod_loader = self._build_loader(self.production_path, [self.PRODUCTION_COL])
+            prod_loader.load()
+
         # Demanda
-        demand_loader = DataLoader(str(self.demand_path), datetime_col="Datetime")
-        demand_loader.load()
-        self.demand_df = demand_loader.get_series(
-            value_col="Energy Consumption kWh",
+        demand_df = demand_loader.get_series(
+            value_col=self.DEMAND_COL,
             rename_to="Demand"
         )
 
         # Producción
-        prod_loader = DataLoader(str(self.production_path), datetime_col="Datetime")
-        prod_loader.load()
-        self.production_df = prod_loader.get_series(
-            value_col="Producción Planta",
+        production_df = prod_loader.get_series(
+            value_col=self.PRODUCTION_COL,
             rename_to="Production"
         )
 
-        self._loaded = True
+        # Surplus y DAILY COMPLETO (una sola vez por estado)
+        surplus_calculator = SurplusCalculator(
+            demand_df,
+            production_df,
+            compact=self.compact_hourly
+        )
+        surplus_calculator.calculate()
+
+        return EnergyDataState(
+            demand_df,
+            production_df,
+            surplus_calculator,
+            surplus_calculator.get_daily_aggregated_all(),
+            load_metrics=self._merge_load_metrics(demand_loader, prod_loader),
+            signature=signature,
+            source_offset=source_offset,
+            source_header=source_header,
+            source_tail=source_tail
+        )
+
+    def _build_loader(self, csv_path: Path, value_cols: list) -> DataLoader:
+        """Loader de una sola pasada: solo las columnas necesarias, tipos y formato de fecha fijos."""
+        return DataLoader(
+            str(csv_path),
+            datetime_col="Datetime",
+            usecols=["Datetime"] + value_cols,
+            dtype={col: "float64" for col in value_cols},
+            datetime_format=self.DATETIME_FORMAT
+        )
+
+    @staticmethod
+    def _merge_load_metrics(*loaders) -> dict:
+        """Suma filas y tiempos de los loaders distintos usados en la carga."""
+        unique = list({id(loader): loader for loader in loaders}.values())
+        rows = sum(len(loader.df) for loader in unique)
+        seconds = sum(loader.load_seconds for loader in unique)
+        return {
+            "files": len(unique),
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds > 0 else float("inf"),
+        }
 
     # --------------------------------------------------
     # Surplus
@@ -65,23 +249,121 @@ class EnergyDataService:
         """
         Devuelve el SurplusCalculator ya calculado.
         """
-        if not self._loaded:
-            self.load_data()
+        return self._current_state().surplus_calculator
 
-        if self.surplus_calculator is None:
-            self.surplus_calculator = SurplusCalculator(
-                self.demand_df,
-                self.production_df
+    # --------------------------------------------------
+    # Modo incremental (el SCADA añade filas cada hora)
+    # --------------------------------------------------
+    def refresh(self) -> dict:
+        """
+        Actualiza el servicio si cambiaron los CSV de origen.
+
+        - "none": sin cambios
+        - "append": el CSV solo creció al final → se leen los bytes nuevos, los
+          flujos se calculan SOLO para las filas nuevas y el diario desde el
+          último día (índices y sumas acumuladas se reconstruyen, O(N) vectorizado)
+        - "reload": cualquier otro cambio → recarga completa
+
+        El estado nuevo se construye aparte y se publica con una sola asignación:
+        las sesiones que leen mientras tanto siguen con el estado anterior.
+        """
+        t0 = time.perf_counter()
+
+        with self._build_lock:
+            state = self._state
+            if state is None:
+                self._state = state = self._load_state()
+                return {"mode": "reload", "rows": len(state.surplus_calculator),
+                        "seconds": time.perf_counter() - t0}
+
+            signature = self.get_source_signature()
+            if signature == state.signature:
+                return {"mode": "none", "rows": 0, "seconds": time.perf_counter() - t0}
+
+            appended = self._read_appended_rows(state)
+            if appended is None:
+                self._state = state = self._load_state()
+                return {"mode": "reload", "rows": len(state.surplus_calculator),
+                        "seconds": time.perf_counter() - t0}
+
+            data, source_offset, source_tail = appended
+            surplus_calculator, new_rows = state.surplus_calculator.appended(
+                data[["Datetime", self.DEMAND_COL]].rename(columns={self.DEMAND_COL: "Demand"}),
+                data[["Datetime", self.PRODUCTION_COL]].rename(columns={self.PRODUCTION_COL: "Production"})
             )
-            self.surplus_calculator.calculate()
 
-            # 🔑 Guardamos el DAILY COMPLETO una sola vez
-            self.df_daily_full = self.surplus_calculator.get_daily_aggregated_from(
-                start_date=str(self.surplus_calculator.result["Datetime"].min().date()),
-                days=100_000
+            df_daily_full = state.df_daily_full
+            if not new_rows.empty:
+                df_daily_full = self._merge_new_days(state, surplus_calculator,
+                                                     new_rows["Datetime"].iloc[0].normalize())
+
+            self._state = EnergyDataState(
+                surplus_calculator.demand_df,
+                surplus_calculator.production_df,
+                surplus_calculator,
+                df_daily_full,
+                load_metrics=state.load_metrics,
+                signature=signature,
+                source_offset=source_offset,
+                source_header=state.source_header,
+                source_tail=source_tail
             )
+            return {"mode": "append", "rows": len(new_rows), "seconds": time.perf_counter() - t0}
+
+    def _read_appended_rows(self, state: EnergyDataState):
+        """
+        Lee solo las filas completas añadidas tras el offset del estado. Devuelve
+        (filas, offset nuevo, cola nueva), o None si el cambio no es un simple
+        append (otra ruta de producción, fichero truncado o reescrito).
+
+        Es un append solo si los últimos bytes antes del offset son los mismos que
+        se leyeron en la carga anterior (y acaban en salto de línea): un fichero
+        reescrito que además creció no pasa por append.
+        """
+        if self.demand_path != self.production_path:
+            return None
 
-        return self.surplus_calculator
+        size = self.demand_path.stat().st_size
+        if size <= state.source_offset:
+            return None
+
+        tail = state.source_tail
+        if not tail or not tail.endswith(b"\n"):
+            return None
+
+        with open(self.demand_path, "rb") as f:
+            f.seek(state.source_offset - len(tail))
+            if f.read(len(tail)) != tail:
+                return None
+            data = f.read(size - state.source_offset)
+
+        # Solo hasta la última línea completa (puede haber una fila a medio escribir)
+        data = data[:data.rfind(b"\n") + 1]
+        if not data:
+            empty = pd.DataFrame(columns=["Datetime", self.DEMAND_COL, self.PRODUCTION_COL])
+            return empty, state.source_offset, tail
+
+        value_cols = [self.DEMAND_COL, self.PRODUCTION_COL]
+        appended = pd.read_csv(
+            io.BytesIO(data),
+            header=None,
+            names=state.source_header,
+            usecols=["Datetime"] + value_cols,
+            dtype={col: "float64" for col in value_cols}
+        )
+        appended["Datetime"] = pd.to_datetime(appended["Datetime"], format=self.DATETIME_FORMAT)
+        return appended, state.source_offset + len(data), (tail + data)[-self.TAIL_BYTES:]
+
+    @staticmethod
+    def _merge_new_days(state: EnergyDataState, surplus_calculator: SurplusCalculator,
+                        first_new_day) -> pd.DataFrame:
+        """Diario desde el primer día con filas nuevas, unido al diario previo del estado"""
+        keep = position_of(state.daily_cumulative.epoch_ns, first_new_day)
+        new_daily = surplus_calculator.get_daily_aggregated_from(
+            first_new_day,
+            days=len(surplus_calculator)
+        )
+        return pd.concat([state.df_daily_full.iloc[:keep], new_daily], ignore_index=True)
 
     # --------------------------------------------------
     # DAILY COMPLETO (para TimeControlPanel)
@@ -89,10 +371,9 @@ class EnergyDataService:
     def get_daily_full(self) -> pd.DataFrame:
         """
         Devuelve el DataFrame diario COMPLETO (sin filtros).
+        Es una vista de solo lectura (sin copia): para modificarlo, copiar antes.
         """
-        if self.df_daily_full is None:
-            self.get_surplus_calculator()
-        return self.df_daily_full.copy()
+        return self._current_state().df_daily_full.iloc[:]
 
     # --------------------------------------------------
     # DAILY FILTRADO (Energy Surplus / EI)
@@ -101,13 +382,43 @@ class EnergyDataService:
         """
         Devuelve datos diarios filtrados por fecha y horizonte.
         """
-        df = self.get_daily_full()
-        df = df[df["Datetime"].dt.date >= start_date].copy()
-        return df.head(days)
+        state = self._current_state()
+
+        # Búsqueda binaria sobre el diario ordenado + vista de `days` filas
+        start = position_of(state.daily_cumulative.epoch_ns, start_date)
+        return state.df_daily_full.iloc[start:start + days]
+
+    def get_daily_window_totals(self, start_date, days: int) -> dict:
+        """
+        Totales de energía de los `days` días desde start_date (dos lecturas
+        sobre las sumas acumuladas, sin volver a sumar el diario).
+        """
+        return self._current_state().daily_cumulative.totals_from(start_date, days)
+
+    # --------------------------------------------------
+    # Previsión (Energy Performance)
+    # --------------------------------------------------
+    def get_forecast_models(self) -> dict:
+        """
+        Modelos de previsión (src/forecasting/models.py) sobre el histórico horario,
+        por nombre. Compartidos: el ajuste de cada fecha de inicio se calcula una vez.
+        Van con el estado: al actualizar los datos se crean de nuevo.
+        """
+        state = self._current_state()
+        if state.forecast_models is None:
+            # Si dos sesiones llegan a la vez se construyen dos iguales; queda una
+            state.forecast_models = build_models(HourlyHistory.from_calculator(state.surplus_calculator))
+        return state.forecast_models
 
     # --------------------------------------------------
     # Environmental Indicators
     # --------------------------------------------------
+    def get_grid_mix(self) -> GridMixStore:
+        """
+        Devuelve el mix de red parseado (compartido por proceso).
+        """
+        return get_grid_mix_store(self.grid_mix_path)
+
     def get_environmental_service(
         self,
         start_date,
@@ -124,7 +435,7 @@ class EnergyDataService:
 
         return EnvironmentalIndicatorsService(
             df_daily_energy=df_daily_filtered,
-            grid_mix_path=self.grid_mix_path
+            df_mix_grid=self.get_grid_mix()
         )
 
     # --------------------------------------------------
@@ -136,19 +447,19 @@ class EnergyDataService:
 
         period:
             "D" = diario
+            "W" = semanal (semana ISO, lunes-domingo)
             "M" = mensual
             "Y" = anual
-        """
-        df_daily = self.get_daily_full()
 
-        if start_date is not None:
-            df_daily = df_daily[df_daily["Datetime"].dt.date >= start_date]
-
-        df_daily = df_daily.set_index("Datetime")
+        Semanas, meses y años salen del cubo precalculado en la carga.
+        """
+        state = self._current_state()
 
-        if period.upper() in ["M", "Y"]:
-            df_resampled = df_daily.resample(period).sum()
-            return df_resampled.reset_index()
+        if period.upper() in RollupCube.LEVELS:
+            return state.rollups.query(period, start_date=start_date)
 
         # Diario
-        return df_daily.reset_index()
+        start = 0
+        if start_date is not None:
+            start = position_of(state.daily_cumulative.epoch_ns, start_date)
+        return state.df_daily_full.iloc[start:].reset_index(drop=True)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.cumulative_totals import CumulativeTotals
+from src.utils.time_index import position_of
+
+
+class RollupCube:
+    """
+    Agregados precalculados del diario completo: semana ISO, mes y año.
+
+    Cada nivel guarda arrays compactos (ordinal de periodo por día, etiqueta y
+    totales por periodo). Las consultas "desde start_date" usan diferencias de
+    sumas acumuladas para el primer periodo parcial y leen el resto del cubo,
+    sin volver a hacer resample.
+
+    Etiquetas iguales a DataFrame.resample(...).sum():
+        "W" → domingo de fin de semana, "M" → fin de mes, "Y" → 31 de diciembre
+    """
+
+    LEVELS = {"W": "W-SUN", "M": "M", "Y": "Y"}
+
+    def __init__(self, df_daily: pd.DataFrame, columns: list):
+        self.columns = list(columns)
+        self.cumulative = CumulativeTotals(df_daily, self.columns)
+
+        dates = pd.DatetimeIndex(df_daily["Datetime"])
+        values = np.nan_to_num(df_daily[self.columns].to_numpy(dtype=np.float64))
+
+        self.levels = {}
+        for level, freq in self.LEVELS.items():
+            self.levels[level] = self._build_level(dates, values, freq)
+
+    def _build_level(self, dates: pd.DatetimeIndex, values: np.ndarray, freq: str) -> dict:
+        ordinals = dates.to_period(freq).asi8
+        if len(ordinals) == 0:
+            return {"day_ordinals": ordinals, "first": 0, "labels": dates[:0], "totals": values[:0]}
+
+        # Rango completo de periodos (los periodos sin días quedan a 0, como resample)
+        first = int(ordinals[0])
+        n_periods = int(ordinals[-1]) - first + 1
+        starts = np.flatnonzero(np.diff(ordinals, prepend=ordinals[0] - 1))
+
+        totals = np.zeros((n_periods, values.shape[1]))
+        totals[ordinals[starts] - first] = np.add.reduceat(values, starts, axis=0)
+
+        labels = (
+            pd.PeriodIndex.from_ordinals(np.arange(first, first + n_periods), freq=freq)
+            .to_timestamp(how="end")
+            .normalize()
+        )
+        return {"day_ordinals": ordinals, "first": first, "labels": labels, "totals": totals}
+
+    def query(self, level: str, start_date=None) -> pd.DataFrame:
+        """
+        Totales por periodo (`level` = "W", "M" o "Y"), opcionalmente desde start_date.
+        """
+        cube = self.levels[level.upper()]
+        labels, totals = cube["labels"], cube["totals"]
+
+        if start_date is not None:
+            start = position_of(self.cumulative.epoch_ns, start_date)
+            if start >= len(self.cumulative):
+                labels, totals = labels[:0], totals[:0]
+            else:
+                # Primer periodo parcial: diferencia de sumas acumuladas
+                first_period = cube["day_ordinals"][start]
+                end = int(np.searchsorted(cube["day_ordinals"], first_period, side="right"))
+                partial = self.cumulative.totals(start, end)
+
+                offset = int(first_period) - cube["first"]
+                labels = labels[offset:]
+                totals = totals[offset:].copy()
+                totals[0] = [partial[col] for col in self.columns]
+
+        df = pd.DataFrame(totals, columns=self.columns)
+        df.insert(0, "Datetime", labels)
+        return df
@@ -0,0 +1,33 @@
+import streamlit as st
+
+from src.services.energy_data_service import EnergyDataService
+
+# Resultado horario compacto (float32 + índice horario implícito): menos memoria
+# por proceso, a cambio de ~1e-3 kWh de precisión como máximo.
+COMPACT_HOURLY = False
+
+
+@st.cache_resource(show_spinner=False)
+def _build_energy_data_service() -> EnergyDataService:
+    """
+    Construye y calcula el servicio UNA vez por proceso.
+    """
+    service = EnergyDataService(compact_hourly=COMPACT_HOURLY)
+    service.get_surplus_calculator()  # carga + surplus + diario completo
+    return service
+
+
+def get_shared_energy_data_service() -> EnergyDataService:
+    """
+    Devuelve el EnergyDataService compartido por todas las sesiones y reruns.
+
+    Los DataFrames calculados son de SOLO LECTURA: quien necesite modificarlos
+    debe trabajar sobre una copia. Si cambian los CSV de origen, el servicio se
+    actualiza con refresh(): si el CSV solo creció se procesan únicamente las
+    filas nuevas; si no, se recarga entero. El estado nuevo se publica de una
+    vez (ver EnergyDataService): las demás sesiones no ven datos a medias.
+    """
+    service = _build_energy_data_service()
+    if service.get_source_signature() != service.loaded_signature:
+        service.refresh()
+    return service
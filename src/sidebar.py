@@ -1,6 +1,13 @@
 import streamlit as st
 
-from src.services.energy_data_service import EnergyDataService
+from src.services.shared_services import get_shared_energy_data_service
+from src.utils.i18n import t, register_page_strings
+from src.utils.translation_catalog import LANGUAGES
+
+
+PAGES = ["Introduction", "Energy Performance", "Life Cycle Impact", "Optimization"]
+for _page in PAGES:
+    register_page_strings(_page, PAGES)
 
 
 class Sidebar:
@@ -33,10 +40,11 @@ class Sidebar:
         if "lang" not in st.session_state:
             st.session_state.lang = "English"
 
+        languages = list(LANGUAGES)
         lang = st.sidebar.selectbox(
-            "🌍 Language",
-            ["English", "Spanish", "Portuguese", "French"],
-            index=["English", "Spanish", "Portuguese", "French"].index(st.session_state.lang)
+            t("🌍 Language"),
+            languages,
+            index=languages.index(st.session_state.lang)
         )
 
         st.session_state.lang = lang
@@ -45,9 +53,9 @@ class Sidebar:
         # --------------------------
         # Time settings
         # --------------------------
-        st.sidebar.markdown("## ⏱ Time Settings")
+        st.sidebar.markdown(f"## {t('⏱ Time Settings')}")
 
-        daily_full = EnergyDataService().get_daily_full()
+        daily_full = get_shared_energy_data_service().get_daily_full()
 
         min_date = daily_full["Datetime"].min().date()
         max_date = daily_full["Datetime"].max().date()
@@ -64,7 +72,7 @@ class Sidebar:
 
         # Start Date
         st.session_state.selected_date = st.sidebar.date_input(
-            "Start date",
+            t("Start date"),
             value=st.session_state.selected_date,
             min_value=min_date,
             max_value=max_date
@@ -72,7 +80,7 @@ class Sidebar:
 
         # Time Horizon
         st.session_state.time_horizon_days = st.sidebar.slider(
-            "Time horizon (days)",
+            t("Time horizon (days)"),
             min_value=1,
             max_value=7,
             value=st.session_state.time_horizon_days
@@ -80,7 +88,7 @@ class Sidebar:
 
         # Time Resolution
         st.session_state.time_resolution = st.sidebar.selectbox(
-            "Time resolution",
+            t("Time resolution"),
             ["daily", "hourly"],
             index=["daily", "hourly"].index(st.session_state.time_resolution)
         )
@@ -90,21 +98,17 @@ class Sidebar:
         # --------------------------
         # Initialize page selector
         # --------------------------
-        st.sidebar.markdown("## Sessions")
+        st.sidebar.markdown(f"## {t('Sessions')}")
         if "page_selector" not in st.session_state:
             st.session_state.page_selector = "Introduction"
 
         # --------------------------
         # Section selector
         # --------------------------
-        with st.sidebar.expander("Select section", expanded=True):
+        with st.sidebar.expander(t("Select section"), expanded=True):
             page = st.radio("",
-                options=[
-                    "Introduction",
-                    "Energy Performance",
-                    "Life Cycle Impact",
-                    "Optimization"
-                ],
+                options=PAGES,
+                format_func=t,
                 key="page_selector"
             )
 
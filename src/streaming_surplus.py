@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+from src.data_loader import DataLoader
+from src.surplus_calculator import SurplusCalculator, DAILY_COLUMNS
+from src.utils.time_index import to_epoch_ns, day_ordinals, NS_PER_DAY
+
+
+HOURLY_COLUMNS = ['Datetime', 'Demand', 'Production', 'SelfConsumption', 'ImportfromGrid', 'ExportToGrid']
+
+
+class _DailyAccumulator:
+    """Sumas diarias de un sitio en un array que crece por días (ordinal - base)"""
+
+    def __init__(self):
+        self.base = None
+        self.sums = np.zeros((0, len(DAILY_COLUMNS)))
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, days: np.ndarray, values: np.ndarray):
+        lo, hi = int(days.min()), int(days.max())
+        self._grow(lo, hi)
+
+        idx = days - self.base
+        size = len(self.counts)
+        self.counts += np.bincount(idx, minlength=size)
+        for j in range(values.shape[1]):
+            self.sums[:, j] += np.bincount(idx, weights=values[:, j], minlength=size)
+
+    def _grow(self, lo: int, hi: int):
+        if self.base is None:
+            self.base = lo
+        front = max(self.base - lo, 0)
+        back = max(hi - (self.base + len(self.counts) - 1), 0)
+        if front or back:
+            self.sums = np.pad(self.sums, ((front, back), (0, 0)))
+            self.counts = np.pad(self.counts, (front, back))
+            self.base -= front
+
+    def to_frame(self) -> pd.DataFrame:
+        # Solo días con datos (como groupby)
+        present = np.flatnonzero(self.counts)
+        df_daily = pd.DataFrame(self.sums[present], columns=DAILY_COLUMNS)
+        df_daily.insert(0, 'Datetime', ((present + (self.base or 0)) * NS_PER_DAY).astype('datetime64[ns]'))
+        return df_daily
+
+
+class StreamingSurplusAggregator:
+    """
+    Ingesta por trozos de CSVs de contador (horarios o cuartohorarios, uno o
+    varios sitios). Para cada trozo calcula los flujos de SurplusCalculator y
+    acumula los totales diarios; de las filas solo guarda una ventana reciente
+    acotada por sitio. La memoria pico depende del tamaño del trozo y de la
+    ventana, no del tamaño del fichero.
+    """
+
+    def __init__(self, window_rows: int = 168):
+        """
+        window_rows: filas recientes que se guardan por sitio (p.ej. 168 h o 672 cuartos de hora)
+        """
+        self.window_rows = window_rows
+        self._daily = {}
+        self._windows = {}
+        self.rows_processed = 0
+
+    # --------------------------------------------------
+    # Ingesta
+    # --------------------------------------------------
+    def update(self, chunk: pd.DataFrame, site=None, site_col: str = None):
+        """
+        Procesa un trozo con columnas ['Datetime', 'Demand', 'Production'].
+        site: etiqueta del sitio del trozo; site_col: columna con el sitio de cada fila.
+        """
+        if site_col is not None:
+            for site_value, site_chunk in chunk.groupby(site_col, sort=False):
+                self._update_site(site_value, site_chunk)
+        else:
+            self._update_site(site, chunk)
+        self.rows_processed += len(chunk)
+
+    def _update_site(self, site, chunk: pd.DataFrame):
+        if chunk.empty:
+            return
+
+        self_consumption, import_from_grid, export_to_grid = SurplusCalculator.compute_flows(
+            chunk['Demand'].to_numpy(),
+            chunk['Production'].to_numpy()
+        )
+
+        # Totales diarios (NaN como 0, igual que el diario completo)
+        flows = {
+            'Demand': chunk['Demand'].to_numpy(dtype=np.float64),
+            'Production': chunk['Production'].to_numpy(dtype=np.float64),
+            'SelfConsumption': self_consumption,
+            'ExportToGrid': export_to_grid,
+            'ImportfromGrid': import_from_grid,
+        }
+        values = np.nan_to_num(np.column_stack([flows[col] for col in DAILY_COLUMNS]))
+        days = day_ordinals(to_epoch_ns(chunk['Datetime']))
+        self._daily.setdefault(site, _DailyAccumulator()).add(days, values)
+
+        # Ventana horaria acotada
+        hourly = pd.DataFrame({
+            'Datetime': chunk['Datetime'].to_numpy(),
+            'Demand': flows['Demand'],
+            'Production': flows['Production'],
+            'SelfConsumption': self_consumption,
+            'ImportfromGrid': import_from_grid,
+            'ExportToGrid': export_to_grid,
+        }).tail(self.window_rows)
+
+        previous = self._windows.get(site)
+        if previous is not None:
+            hourly = pd.concat([previous, hourly], ignore_index=True)
+        self._windows[site] = (
+            hourly.sort_values('Datetime', kind='stable')
+            .tail(self.window_rows)
+            .reset_index(drop=True)
+        )
+
+    def ingest_csv(self, csv_path: str, demand_col: str, production_col: str, site=None,
+                   site_col: str = None, datetime_format: str = None, chunksize: int = 100_000):
+        """Lee `csv_path` por trozos y los procesa (demanda y producción en el mismo CSV)"""
+        value_cols = [demand_col, production_col]
+        loader = DataLoader(
+            csv_path,
+            datetime_col='Datetime',
+            usecols=['Datetime'] + value_cols + ([site_col] if site_col else []),
+            dtype={col: 'float64' for col in value_cols},
+            datetime_format=datetime_format
+        )
+        for chunk in loader.iter_chunks(chunksize):
+            chunk = chunk.rename(columns={demand_col: 'Demand', production_col: 'Production'})
+            self.update(chunk, site=site, site_col=site_col)
+        return self
+
+    # --------------------------------------------------
+    # Resultados
+    # --------------------------------------------------
+    @property
+    def sites(self) -> list:
+        return list(self._daily.keys())
+
+    def get_daily(self, site=None) -> pd.DataFrame:
+        """Diario completo del sitio (mismas columnas que SurplusCalculator.get_daily_aggregated_all)"""
+        if site not in self._daily:
+            raise KeyError(f"No data for site {site!r}")
+        return self._daily[site].to_frame()
+
+    def get_daily_all_sites(self) -> pd.DataFrame:
+        """Diario de todos los sitios con columna 'Site'"""
+        frames = []
+        for site in self.sites:
+            df_daily = self.get_daily(site)
+            df_daily.insert(0, 'Site', site)
+            frames.append(df_daily)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Site', 'Datetime'] + DAILY_COLUMNS)
+
+    def get_recent_window(self, site=None) -> pd.DataFrame:
+        """Últimas `window_rows` filas del sitio con los flujos calculados"""
+        if site not in self._windows:
+            raise KeyError(f"No data for site {site!r}")
+        return self._windows[site]
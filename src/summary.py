@@ -1,8 +1,10 @@
 import streamlit as st
-import plotly.graph_objects as go
-import folium
-from streamlit_folium import st_folium
-import plotly.express as px
+
+from src.utils.i18n import t
+from src.utils.lazy_imports import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
 
 
 class EnergySummary:
@@ -12,7 +14,8 @@ class EnergySummary:
     including total demand and total PV production.
     """
 
-    def __init__(self, df, mode='hourly', title="Energy Summary", time_horizon_days=7, selected_date="2020-01-01"):
+    def __init__(self, df, mode='hourly', title="Energy Summary", time_horizon_days=7, selected_date="2020-01-01",
+                 totals=None):
         """
         df : pd.DataFrame
             Must contain columns: ['Demand', 'Production', 'SelfConsumption', 'GridConsumption', 'ExportToGrid']
@@ -20,8 +23,12 @@ class EnergySummary:
             'hourly' or 'daily' (just for display in the title)
         title : str
             Title for the summary section
+        totals : dict, optional
+            Precomputed window totals per column (e.g. from CumulativeTotals);
+            when given, the dataframe is not re-summed
         """
-        self.df = df.copy()
+        self.df = df  # solo lectura: no se modifica
+        self.totals = totals
         self.mode = mode
         self.title = title
         self.time_horizon_days = time_horizon_days
@@ -45,18 +52,21 @@ class EnergySummary:
         )
 
         # --- Totals ---
-        total_self = self.df['SelfConsumption'].sum()
-        total_grid = self.df['ImportfromGrid'].sum()
-        total_export = self.df['ExportToGrid'].sum()
+        totals = self.totals
+        if totals is None:
+            totals = self.df[['SelfConsumption', 'ImportfromGrid', 'ExportToGrid', 'Demand', 'Production']].sum()
+        total_self = totals['SelfConsumption']
+        total_grid = totals['ImportfromGrid']
+        total_export = totals['ExportToGrid']
         total_energy = total_self + total_grid + total_export
-        total_demand = self.df['Demand'].sum()
-        total_production = self.df['Production'].sum()
+        total_demand = totals['Demand']
+        total_production = totals['Production']
 
         percentages = [total_self / total_energy * 100,
                        total_grid / total_energy * 100,
                        total_export / total_energy * 100]
         values = [total_self, total_grid, total_export]
-        labels = ['Self-Consumption 🔄', 'Import from Grid ⬅️', 'Export to Grid ➡️']
+        labels = [t('Self-Consumption 🔄'), t('Import from Grid ⬅️'), t('Export to Grid ➡️')]
 
         # --- Columns: Donut + Map ---
         col1, col2 = st.columns([2, 1])
@@ -102,7 +112,7 @@ class EnergySummary:
         # ----------------------
         # Cards for distribution
         # ----------------------
-        st.markdown("### Detailed Energy Distribution")
+        st.markdown(f"### {t('Detailed Energy Distribution')}")
         col1, col2, col3 = st.columns(3)
         for col, label, value, perc, color in zip(
                 [col1, col2, col3], labels, values, percentages, self.colors_distribution
@@ -112,7 +122,7 @@ class EnergySummary:
                  <div style="background-color:{color};padding:15px;border-radius:10px;text-align:center;color:white">
                      <h4>{label}</h4>
                      <p style="font-size:22px;font-weight:bold">{value:.2f} kWh</p>
-                     <p style="font-size:18px">{perc:.1f}% of total</p>
+                     <p style="font-size:18px">{perc:.1f}% {t('of total')}</p>
                  </div>
                  """,
                 unsafe_allow_html=True
@@ -121,11 +131,11 @@ class EnergySummary:
         # ----------------------
         # Cards for total Demand and Production
         # ----------------------
-        st.markdown("### Total Energy Overview")
+        st.markdown(f"### {t('Total Energy Overview')}")
         col1, col2 = st.columns(2)
         overview_info = [
-            ("Total Energy Demand ⚡", total_demand, self.colors_overview[0], self.text_overview[0]),
-            ("Total PV Production ☀️", total_production, self.colors_overview[1], self.text_overview[1])
+            (t("Total Energy Demand ⚡"), total_demand, self.colors_overview[0], self.text_overview[0]),
+            (t("Total PV Production ☀️"), total_production, self.colors_overview[1], self.text_overview[1])
         ]
         for col, (label, value, bg_color, text_color) in zip([col1, col2], overview_info):
             col.markdown(
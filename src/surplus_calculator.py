@@ -1,10 +1,135 @@
+import warnings
+
+import numpy as np
 import pandas as pd
 
+from src.utils.time_index import to_epoch_ns, position_of, day_ordinals, NS_PER_DAY
+from src.utils.cumulative_totals import CumulativeTotals, ENERGY_COLUMNS
+from src.utils.compact_frame import CompactHourlyFrame
+from src.utils.readonly import freeze_frame
+
+DAILY_COLUMNS = ['Demand', 'Production', 'SelfConsumption', 'ExportToGrid', 'ImportfromGrid']
+
+
 class SurplusCalculator:
-    def __init__(self, demand_df, production_df):
+    def __init__(self, demand_df, production_df, compact: bool = False, compact_max_abs_error: float = 1e-3,
+                 daily_columns: list = DAILY_COLUMNS):
+        """
+        compact: guardar el resultado horario en float32 con índice horario implícito
+                 (ver src/utils/compact_frame.py). Opcional; si la serie no es regular
+                 o float32 supera compact_max_abs_error (kWh), se mantiene float64.
+        daily_columns: columnas que se suman en los agregados diarios (DAILY_COLUMNS
+                 más, p.ej., los flujos de una batería o un electrolizador)
+        """
         self.demand_df = demand_df
         self.production_df = production_df
-        self.result = None
+        self.compact = compact
+        self.daily_columns = list(daily_columns)
+        self.compact_max_abs_error = compact_max_abs_error
+        self._result = None
+        self._compact = None
+
+        # Índices de búsqueda sobre result (ordenado por Datetime). En modo
+        # compacto no se guardan: posiciones y fechas salen de start + offset
+        self._epoch_ns = None
+        self._day_ordinals = None
+        self._day_starts = None
+        self._daily_values = None  # columnas a sumar, contiguas (n × columnas diarias)
+        self.cumulative = None  # sumas acumuladas horarias
+
+    @classmethod
+    def from_result(cls, df: pd.DataFrame, compact: bool = False,
+                    daily_columns: list = DAILY_COLUMNS) -> "SurplusCalculator":
+        """
+        Calculador sobre un resultado horario ya calculado (p.ej. los flujos tras
+        el despacho de una batería): mismas consultas diarias y de ventana.
+        """
+        calculator = cls(None, None, compact=compact, daily_columns=daily_columns)
+        calculator._set_result(df.sort_values('Datetime').reset_index(drop=True))
+        return calculator
+
+    @property
+    def result(self) -> pd.DataFrame:
+        """
+        Resultado horario completo. En modo compacto se materializa en float64 en
+        CADA llamada (copia completa): para leer series usar column()/epoch_ns().
+        """
+        if self._result is None and self._compact is not None:
+            return self._compact.to_frame()
+        return self._result
+
+    @property
+    def is_compact(self) -> bool:
+        """True si el resultado se guarda en float32 con índice implícito"""
+        return self._compact is not None
+
+    @property
+    def columns(self) -> list:
+        """Columnas del resultado horario (sin 'Datetime')"""
+        if self._compact is not None:
+            return list(self._compact.columns)
+        return [col for col in self._result.columns if col != 'Datetime']
+
+    def __len__(self):
+        if self._compact is not None:
+            return len(self._compact)
+        return 0 if self._epoch_ns is None else len(self._epoch_ns)
+
+    def _check_calculated(self):
+        if self._epoch_ns is None and self._compact is None:
+            raise ValueError("Call calculate() first.")
+
+    # --------------------------------------------------
+    # Acceso por columnas (sin materializar el resultado)
+    # --------------------------------------------------
+    def column(self, name: str, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Filas [start, stop) de una columna en float64: vista de solo lectura en
+        modo normal; en modo compacto, copia solo de ese tramo de esa columna.
+        """
+        self._check_calculated()
+        if self._compact is not None:
+            start, stop, _ = slice(start, stop).indices(len(self))
+            return self._compact.columns[name][start:stop].astype(np.float64)
+        return self._result[name].to_numpy(dtype=np.float64)[start:stop]
+
+    def epoch_ns(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """Fechas (int64 ns) de las filas [start, stop); en modo compacto, calculadas"""
+        self._check_calculated()
+        if self._compact is not None:
+            return self._compact.epoch_ns(start, stop)
+        return self._epoch_ns[start:stop]
+
+    def position_of(self, when, side: str = "left") -> int:
+        """Posición de `when` (búsqueda binaria o, en modo compacto, aritmética)"""
+        self._check_calculated()
+        if self._compact is not None:
+            return self._compact.position_of(when, side=side)
+        return position_of(self._epoch_ns, when, side=side)
+
+    def hourly_columns(self, start: int = 0, stop: int = None) -> dict:
+        """Filas [start, stop) como dict {'Datetime': datetime64, columna: float64}"""
+        return {
+            'Datetime': self.epoch_ns(start, stop).astype('datetime64[ns]'),
+            **{col: self.column(col, start, stop) for col in self.columns},
+        }
+
+    @staticmethod
+    def compute_flows(demand, production):
+        """
+        Calcula SelfConsumption, ImportfromGrid y ExportToGrid sobre arrays contiguos.
+
+        - SelfConsumption: la menor entre producción y demanda (ignora NaN como pandas.min)
+        - ImportfromGrid: cuando la demanda supera la producción
+        - ExportToGrid: cuando la producción supera la demanda
+        """
+        demand = np.ascontiguousarray(demand, dtype=np.float64)
+        production = np.ascontiguousarray(production, dtype=np.float64)
+
+        self_consumption = np.fmin(production, demand)
+        import_from_grid = np.maximum(demand - production, 0.0)
+        export_to_grid = np.maximum(production - demand, 0.0)
+        return self_consumption, import_from_grid, export_to_grid
 
     def calculate(self):
         """Merge de demanda y producción y cálculo de SelfConsumption, GridConsumption y ExportToGrid"""
@@ -18,46 +143,171 @@ class SurplusCalculator:
         df['Datetime'] = pd.to_datetime(df['Datetime'])
         df = df.sort_values('Datetime').reset_index(drop=True)
 
-        # Energía de autoconsumo: la menor entre producción y demanda
-        df['SelfConsumption'] = df[['Production', 'Demand']].min(axis=1)
+        # Flujos de energía en una sola pasada vectorizada
+        self_consumption, import_from_grid, export_to_grid = self.compute_flows(
+            df['Demand'].to_numpy(),
+            df['Production'].to_numpy()
+        )
+        df['SelfConsumption'] = self_consumption
+        df['ImportfromGrid'] = import_from_grid
+        df['ExportToGrid'] = export_to_grid
+
+        self._set_result(df)
+        return self.result
+
+    def appended(self, demand_df, production_df):
+        """
+        Modo incremental: devuelve (calculador nuevo, filas añadidas) con las filas
+        posteriores al último Datetime del resultado. Los flujos se calculan SOLO
+        para las filas nuevas; el índice temporal, los valores diarios y las sumas
+        acumuladas del calculador nuevo se reconstruyen sobre toda la serie (O(N),
+        vectorizado). Este calculador no se modifica: otros lectores pueden seguir
+        usándolo mientras se construye el nuevo.
+        """
+        self._check_calculated()
+
+        new = demand_df.merge(production_df, on='Datetime', how='inner')
+        new['Datetime'] = pd.to_datetime(new['Datetime'])
+        new = new[new['Datetime'] > pd.Timestamp(int(self.epoch_ns(len(self) - 1)[0]))]
+        new = new.sort_values('Datetime').reset_index(drop=True)
+        if new.empty:
+            return self, new
 
-        # Energía consumida de la red: cuando la demanda supera la producción
-        df['ImportfromGrid'] = df.apply(
-            lambda row: max(row['Demand'] - row['Production'], 0), axis=1
+        self_consumption, import_from_grid, export_to_grid = self.compute_flows(
+            new['Demand'].to_numpy(),
+            new['Production'].to_numpy()
         )
+        new['SelfConsumption'] = self_consumption
+        new['ImportfromGrid'] = import_from_grid
+        new['ExportToGrid'] = export_to_grid
 
-        # Energía vertida a la red: cuando la producción supera la demanda
-        df['ExportToGrid'] = df.apply(
-            lambda row: max(row['Production'] - row['Demand'], 0), axis=1
+        calculator = type(self)(
+            pd.concat([self.demand_df, demand_df], ignore_index=True),
+            pd.concat([self.production_df, production_df], ignore_index=True),
+            compact=self.compact,
+            compact_max_abs_error=self.compact_max_abs_error,
+            daily_columns=self.daily_columns
         )
+        previous = self.hourly_columns()
+        calculator._set_result(pd.DataFrame({
+            col: np.concatenate([values, new[col].to_numpy()]) for col, values in previous.items()
+        }))
+        return calculator, new
 
-        self.result = df
-        return df
+    def _set_result(self, df):
+        """
+        Fija el resultado horario (de solo lectura: se reparte en vistas sin copiar)
+        y sus índices. En modo compacto solo se guardan las columnas float32: sin
+        fechas, ordinales de día ni sumas acumuladas por fila.
+        """
+        self._result = self._compact = None
+        self._epoch_ns = self._day_ordinals = self._day_starts = None
+        self._daily_values = self.cumulative = None
+
+        if self.compact:
+            try:
+                self._compact = CompactHourlyFrame.from_frame(
+                    df,
+                    columns=[col for col in df.columns if col != 'Datetime'],
+                    max_abs_error=self.compact_max_abs_error
+                )
+                return
+            except ValueError as e:
+                warnings.warn(f"Compact mode disabled: {e}", RuntimeWarning, stacklevel=2)
+
+        self._result = df = freeze_frame(df)
+        self._build_time_index()
+        self.cumulative = CumulativeTotals(df)
+
+    def _build_time_index(self):
+        """Epoch ns ordenado y posiciones donde empieza cada día, para cortes por búsqueda binaria"""
+        self._epoch_ns = to_epoch_ns(self._result['Datetime'])
+        self._day_ordinals = day_ordinals(self._epoch_ns)
+        self._day_starts = np.flatnonzero(np.diff(self._day_ordinals, prepend=self._day_ordinals[:1] - 1))
+
+        # NaN como 0, igual que groupby().sum()
+        self._daily_values = np.ascontiguousarray(
+            np.nan_to_num(self._result[self.daily_columns].to_numpy(dtype=np.float64))
+        )
+
+    def _aggregate_days(self, start: int, end: int) -> pd.DataFrame:
+        """
+        Suma por día de las filas [start, end) con ordinales de día enteros y
+        np.add.reduceat (sin columna 'Date' de objetos ni groupby).
+        """
+        days = self._day_ordinals[start:end] if self._compact is None else day_ordinals(self.epoch_ns(start, end))
+        starts = np.flatnonzero(np.diff(days, prepend=days[:1] - 1))
+
+        if len(days):
+            sums = np.add.reduceat(self._values_between(start, end), starts, axis=0)
+        else:
+            sums = np.zeros((0, len(self.daily_columns)))
+
+        df_daily = pd.DataFrame(sums, columns=self.daily_columns)
+        df_daily.insert(0, 'Datetime', (days[starts] * NS_PER_DAY).astype('datetime64[ns]'))
+        return df_daily
+
+    def _values_between(self, start: int, end: int) -> np.ndarray:
+        """Columnas de daily_columns de las filas [start, end) en float64 (NaN = 0)"""
+        if self._daily_values is not None:
+            return self._daily_values[start:end]
+        columns = self._compact.columns
+        return np.nan_to_num(
+            np.column_stack([columns[col][start:end] for col in self.daily_columns]).astype(np.float64)
+        )
+
+    def _window_from(self, start_date, days: int):
+        """Posiciones [start, end) de las filas de los primeros `days` días desde start_date"""
+        start = self.position_of(start_date)
+        if self._compact is not None:
+            # Serie regular: el final es el inicio del día `days` tras el de la fila `start`
+            if start >= len(self):
+                return start, start
+            first_day = int(day_ordinals(self.epoch_ns(start, start + 1))[0])
+            return start, self.position_of(pd.Timestamp((first_day + days) * NS_PER_DAY))
+        # Siguiente inicio de día tras `start`; los grupos posteriores son días completos
+        j = int(np.searchsorted(self._day_starts, start, side='right'))
+        k = j + days - 1
+        end = int(self._day_starts[k]) if k < len(self._day_starts) else len(self._epoch_ns)
+        return start, end
+
+    def get_window_totals(self, start_date, hours: int = None, days: int = None) -> dict:
+        """
+        Totales de energía de la ventana desde start_date con sumas acumuladas:
+        `hours` horas (modo horario) o `days` días (modo diario).
+        """
+        self._check_calculated()
+        if days is not None:
+            start, end = self._window_from(start_date, days)
+        else:
+            start = self.position_of(start_date)
+            end = start + hours
+        if self._compact is not None:
+            # Sin sumas acumuladas: la ventana (≤ unos días) se suma en float64
+            start, end = min(start, len(self)), min(max(end, start), len(self))
+            return {
+                col: float(np.nansum(self._compact.columns[col][start:end], dtype=np.float64))
+                for col in ENERGY_COLUMNS if col in self._compact.columns
+            }
+        return self.cumulative.totals(start, end)
 
     def get_last_hours_from(self, start_date: str, hours: int = 168):
         """Devuelve las horas a partir de start_date"""
-        if self.result is None:
-            raise ValueError("Call calculate() first.")
-        start_dt = pd.to_datetime(start_date)
-        df_filtered = self.result[self.result['Datetime'] >= start_dt].copy()
-        return df_filtered.head(hours)
+        self._check_calculated()
+        # Búsqueda binaria + vista (sin máscara ni copia del resto de la serie)
+        start = self.position_of(start_date)
+        if self._compact is not None:
+            return self._compact.to_frame(start, start + hours)
+        return self.result.iloc[start:start + hours]
 
     def get_daily_aggregated_from(self, start_date: str, days: int = 7, export_csv: str = None):
         """Devuelve los días agregados a partir de start_date"""
-        if self.result is None:
-            raise ValueError("Call calculate() first.")
-        start_dt = pd.to_datetime(start_date)
-        df_filtered = self.result[self.result['Datetime'] >= start_dt].copy()
+        self._check_calculated()
+        # Solo las filas de los días pedidos (búsqueda binaria)
+        start, end = self._window_from(start_date, days)
 
-        # Columnas a sumar
-        cols_to_sum = ['Demand', 'Production', 'SelfConsumption', 'ExportToGrid', 'ImportfromGrid']
-
-        # Agrupar por día
-        df_filtered['Date'] = df_filtered['Datetime'].dt.date
-        df_daily = df_filtered.groupby('Date')[cols_to_sum].sum().reset_index()
-        df_daily['Datetime'] = pd.to_datetime(df_daily['Date'])
-        df_daily = df_daily.head(days)
-        df_daily = df_daily[['Datetime', 'Demand', 'Production', 'SelfConsumption', 'ExportToGrid', 'ImportfromGrid']]
+        # Agrupar por día (ordinales enteros)
+        df_daily = self._aggregate_days(start, end)
 
         if export_csv:
             df_daily.to_csv(export_csv, index=False)
@@ -65,31 +315,32 @@ class SurplusCalculator:
 
         return df_daily
 
+    def get_daily_aggregated_all(self) -> pd.DataFrame:
+        """Devuelve el diario completo (todos los días del resultado)"""
+        self._check_calculated()
+        return self._aggregate_days(0, len(self))
+
+    def get_date_range(self):
+        """Primera y última fecha del resultado (sin materializar el DataFrame)"""
+        self._check_calculated()
+        n = len(self)
+        return tuple(pd.Timestamp(value) for value in self.epoch_ns(0, 1).tolist() + self.epoch_ns(n - 1, n).tolist())
+
     def get_last_hours(self, hours: int = 168):
         """Devuelve las últimas `hours` del DataFrame calculado"""
-        if self.result is None:
-            raise ValueError("Call calculate() first.")
-        return self.result.tail(hours).copy()
+        self._check_calculated()
+        if self._compact is not None:
+            return self._compact.to_frame(max(len(self) - hours, 0))
+        return self.result.tail(hours)
 
     def get_daily_aggregated(self, hours: int = 168, export_csv: str = None):
-        if self.result is None:
-            raise ValueError("Call calculate() first.")
-
-        # Tomar últimas 'hours' horas
-        df_last_hours = self.result.tail(hours).copy()
+        self._check_calculated()
 
-        # Columnas a sumar
-        cols_to_sum = ['Demand', 'Production', 'SelfConsumption', 'ExportToGrid', 'ImportfromGrid']
-
-        # Agrupar por día y sumar
-        df_last_hours['Date'] = df_last_hours['Datetime'].dt.date
-        df_daily = df_last_hours.groupby('Date')[cols_to_sum].sum().reset_index()
-        df_daily['Datetime'] = pd.to_datetime(df_daily['Date'])
+        # Tomar últimas 'hours' horas y agrupar por día (ordinales enteros)
+        n = len(self)
+        df_daily = self._aggregate_days(max(n - hours, 0), n)
         df_daily = df_daily.tail(7)  # últimos 7 días
 
-        # Reordenar columnas según el orden deseado
-        df_daily = df_daily[['Datetime', 'Demand', 'Production', 'SelfConsumption', 'ExportToGrid', 'ImportfromGrid']]
-
         # Exportar a CSV si se indica
         if export_csv:
             df_daily.to_csv(export_csv, index=False)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.time_index import to_epoch_ns
+
+
+class CompactHourlyFrame:
+    """
+    Representación compacta de una serie horaria REGULAR:
+    - columnas de energía en float32 (la mitad de memoria que float64)
+    - sin columna de fechas guardada: Datetime = start + posición × step
+
+    Solo se acepta si la conversión a float32 respeta `max_abs_error`
+    (kWh) en todas las columnas; si no, from_frame lanza ValueError.
+    """
+
+    def __init__(self, start_ns: int, step_ns: int, columns: dict, datetime_col: str = "Datetime"):
+        self.start_ns = int(start_ns)
+        self.step_ns = int(step_ns)
+        self.columns = columns  # nombre -> array float32
+        self.datetime_col = datetime_col
+        self._length = len(next(iter(columns.values()))) if columns else 0
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: list, datetime_col: str = "Datetime",
+                   max_abs_error: float = 1e-3) -> "CompactHourlyFrame":
+        epoch_ns = to_epoch_ns(df[datetime_col])
+        if len(epoch_ns) < 2:
+            raise ValueError("Se necesitan al menos dos filas para deducir el paso temporal.")
+
+        steps = np.diff(epoch_ns)
+        step_ns = int(steps[0])
+        if step_ns <= 0 or not np.all(steps == step_ns):
+            raise ValueError("La serie no es regular: no se puede usar un índice implícito.")
+
+        compact = {}
+        for col in columns:
+            values = df[col].to_numpy(dtype=np.float64)
+            values32 = values.astype(np.float32)
+            error = np.abs(values32.astype(np.float64) - values)
+            worst = float(np.nanmax(error)) if np.isfinite(error).any() else 0.0
+            if worst > max_abs_error:
+                raise ValueError(
+                    f"'{col}': error float32 {worst:.3g} > max_abs_error {max_abs_error:.3g}"
+                )
+            values32.flags.writeable = False  # se reparte en vistas (ver to_frame)
+            compact[col] = values32
+
+        return cls(epoch_ns[0], step_ns, compact, datetime_col=datetime_col)
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria de los datos (las fechas no ocupan nada)"""
+        return sum(values.nbytes for values in self.columns.values())
+
+    def epoch_ns(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """Fechas (int64 ns) de las filas [start, stop), calculadas a partir de start + offset"""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return self.start_ns + np.arange(start, stop, dtype=np.int64) * self.step_ns
+
+    def position_of(self, when, side: str = "left") -> int:
+        """Posición de `when` sin búsqueda: aritmética sobre el paso fijo"""
+        offset = pd.Timestamp(when).value - self.start_ns
+        position = -(-offset // self.step_ns) if side == "left" else offset // self.step_ns + 1
+        return int(min(max(position, 0), len(self)))
+
+    def to_frame(self, start: int = 0, stop: int = None, dtype=np.float64) -> pd.DataFrame:
+        """
+        Materializa las filas [start, stop) como DataFrame con la columna de fechas.
+        Por defecto vuelve a float64 para que el resto del código no note la diferencia;
+        con dtype=np.float32 las columnas son vistas de solo lectura, sin copia.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        df = pd.DataFrame({
+            col: values[start:stop].astype(dtype, copy=False)
+            for col, values in self.columns.items()
+        }, copy=False)
+        df.insert(0, self.datetime_col, self.epoch_ns(start, stop).astype("datetime64[ns]"))
+        df.index = pd.RangeIndex(start, stop)
+        return df
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.time_index import to_epoch_ns, position_of
+
+
+ENERGY_COLUMNS = ['SelfConsumption', 'ImportfromGrid', 'ExportToGrid', 'Demand', 'Production']
+
+
+class CumulativeTotals:
+    """
+    Sumas acumuladas (prefix sums) de las columnas de energía de un DataFrame
+    ordenado por Datetime: el total de cualquier ventana [start, stop) son dos lecturas.
+    Los NaN cuentan como 0, igual que DataFrame.sum().
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list = ENERGY_COLUMNS):
+        self.columns = [col for col in columns if col in df.columns]
+        self.epoch_ns = to_epoch_ns(df['Datetime'])
+
+        values = np.nan_to_num(df[self.columns].to_numpy(dtype=np.float64))
+        self._cumsum = np.zeros((len(df) + 1, len(self.columns)))
+        np.cumsum(values, axis=0, out=self._cumsum[1:])
+
+    def __len__(self):
+        return len(self.epoch_ns)
+
+    def totals(self, start: int, stop: int) -> dict:
+        """Totales de las filas [start, stop) (posiciones)"""
+        start = min(max(start, 0), len(self))
+        stop = min(max(stop, start), len(self))
+        diff = self._cumsum[stop] - self._cumsum[start]
+        return dict(zip(self.columns, diff.tolist()))
+
+    def totals_from(self, start_date, rows: int) -> dict:
+        """Totales de las `rows` filas desde start_date (búsqueda binaria)"""
+        start = position_of(self.epoch_ns, start_date)
+        return self.totals(start, start + rows)
+
+    def totals_many(self, starts, stops) -> pd.DataFrame:
+        """Totales de muchas ventanas a la vez (arrays de posiciones), una fila por ventana"""
+        starts = np.clip(np.asarray(starts), 0, len(self))
+        stops = np.clip(np.maximum(np.asarray(stops), starts), 0, len(self))
+        return pd.DataFrame(self._cumsum[stops] - self._cumsum[starts], columns=self.columns)
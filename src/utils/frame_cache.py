@@ -0,0 +1,100 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (motor de Parquet)
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+
+CACHE_DIR_NAME = ".cache"
+
+# Versión del formato de los snapshots: subirla invalida todos los existentes
+SNAPSHOT_VERSION = 1
+
+
+def _file_mode() -> int:
+    """Permisos de un fichero nuevo según la umask (0o644 con la umask habitual 022)"""
+    # os.umask solo se puede leer cambiándola: se hace una vez, al importar, antes
+    # de que Streamlit arranque hilos de sesión
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o644 & ~umask
+
+
+# NamedTemporaryFile crea el tmp con 0600; tras os.replace el fichero final
+# quedaría legible solo por su dueño
+FILE_MODE = _file_mode()
+
+
+def get_cache_dir(csv_path) -> Path:
+    """Carpeta de snapshots columnares, junto al CSV de origen."""
+    return Path(csv_path).resolve().parent / CACHE_DIR_NAME
+
+
+def source_signature(csv_path) -> str:
+    """Firma barata del CSV de origen (mtime + tamaño)."""
+    stat = os.stat(csv_path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _digest(text: str, length: int) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:length]
+
+
+def load_cached_frame(csv_path, parser, key: str = "", use_cache: bool = True) -> pd.DataFrame:
+    """
+    Devuelve el DataFrame tipado de `csv_path`.
+
+    La primera vez llama a `parser(csv_path)` y guarda un snapshot Parquet en
+    `<data>/.cache/`; las siguientes lecturas salen del snapshot mientras el CSV
+    no cambie (mtime/tamaño). `key` distingue parsers distintos del mismo CSV.
+
+    Sin pyarrow, o si la carpeta no es escribible, se parsea el CSV sin cachear.
+    """
+    if not use_cache or not _HAS_PYARROW:
+        return parser(csv_path)
+
+    # <stem>.<parser>.<firma>.parquet
+    prefix = f"{Path(csv_path).stem}.{_digest(f'{SNAPSHOT_VERSION}|{key}', 8)}"
+    snapshot = get_cache_dir(csv_path) / f"{prefix}.{_digest(source_signature(csv_path), 16)}.parquet"
+
+    if snapshot.exists():
+        try:
+            return pd.read_parquet(snapshot)
+        except Exception:
+            # Snapshot corrupto o de otra versión: se regenera
+            pass
+
+    df = parser(csv_path)
+
+    tmp = None
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+
+        # Escritura atómica: tmp único (varias sesiones son hilos del mismo proceso) + replace
+        with tempfile.NamedTemporaryFile(dir=snapshot.parent, prefix=f"{snapshot.name}.",
+                                         suffix=".tmp", delete=False) as f:
+            tmp = Path(f.name)
+        df.to_parquet(tmp, index=False)
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, snapshot)
+        tmp = None
+
+        # Borrar snapshots viejos del mismo CSV y parser
+        for old in snapshot.parent.glob(f"{prefix}.*.parquet"):
+            if old != snapshot:
+                old.unlink(missing_ok=True)
+    except Exception:
+        # Carpeta no escribible o frame no serializable (p.ej. ArrowInvalid): sin caché
+        pass
+    finally:
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+
+    return df
@@ -0,0 +1,131 @@
+"""
+Traducción de la UI por páginas.
+
+t() solo consulta el catálogo local (data/translations.json, que se rellena
+fuera de la app con `python -m src.utils.translation_catalog fill`). Si se
+activa RUNTIME_BACKEND, al cambiar de idioma o de página
+prepare_page_translations() reúne TODOS los textos de la página activa, quita
+duplicados y traduce los que falten en una sola petición en bloque, en un hilo
+aparte y sin bloquear la página más de RUNTIME_FILL_TIMEOUT segundos.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+
+import streamlit as st
+
+from src.utils.translation_catalog import (
+    DEFAULT_CATALOG_PATH, LANGUAGES, PROJECT_ROOT, SOURCE_LANG,
+    TranslationCatalog, get_catalog, scan_ui_strings, translate
+)
+from src.utils.translation_backends import get_backend
+
+
+# Backend para rellenar en la app los textos que falten (None = solo catálogo).
+# Por defecto la app no hace peticiones: el relleno es una herramienta offline.
+RUNTIME_BACKEND = None
+# Espera máxima del rerun a la traducción en bloque; si tarda más, la página
+# sale en inglés y el catálogo se actualiza igualmente al terminar
+RUNTIME_FILL_TIMEOUT = 3.0
+
+# Página -> [(fichero, función)] donde están sus t("..."); None = todo el fichero
+PAGE_SOURCES = {
+    "Introduction": [("app.py", "page_intro"), ("src/intro_page.py", None)],
+    "Energy Performance": [
+        ("app.py", "page_energy_surplus"),
+        ("src/summary.py", None),
+        ("src/forecasting/forecast_section.py", None),
+    ],
+    "Life Cycle Impact": [
+        ("app.py", "page_environmental_indicators"),
+        ("src/environmental_indicators/ei_summary.py", None),
+        ("src/environmental_indicators/lca_texts.py", None),
+    ],
+    "Optimization": [("app.py", "page_optimization"), ("src/optimization/optimization_page.py", None)],
+}
+# Textos comunes a todas las páginas (barra lateral)
+COMMON_SOURCES = [("src/sidebar.py", None)]
+
+# Textos dinámicos (no literales) registrados por los módulos de cada página
+_REGISTERED = {}
+
+# (página, idioma, textos pendientes) ya intentados en este proceso: sin reintentos en cada rerun
+_ATTEMPTED = set()
+# Solo protege _ATTEMPTED y la escritura del catálogo, nunca la petición de red
+_fill_lock = threading.Lock()
+_fill_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="i18n-fill")
+
+
+def t(text: str) -> str:
+    """Traduce `text` al idioma de la sesión desde el catálogo (sin red)"""
+    return translate(text, st.session_state.get("lang", "English"))
+
+
+def register_page_strings(page: str, texts) -> None:
+    """Registra textos que se pasan a t() como variables (p.ej. nombres de indicadores)"""
+    _REGISTERED.setdefault(page, {}).update(dict.fromkeys(texts))
+
+
+def page_strings(page: str) -> list:
+    """Textos de la página (t("...") del código + registrados + comunes), sin duplicados"""
+    texts = []
+    for path, scope in PAGE_SOURCES.get(page, []) + COMMON_SOURCES:
+        texts += _scan_cached(path, scope)
+    texts += list(_REGISTERED.get(page, {}))
+    return list(dict.fromkeys(texts))
+
+
+@lru_cache(maxsize=None)
+def _scan_cached(path: str, scope) -> tuple:
+    return tuple(scan_ui_strings([PROJECT_ROOT / path], scope=scope))
+
+
+def prepare_page_translations(page: str, lang: str, backend=None, path=DEFAULT_CATALOG_PATH,
+                              timeout: float = None) -> int:
+    """
+    Traduce en bloque los textos de `page` que falten en el catálogo para `lang`.
+    Una sola petición por página e idioma, en un hilo aparte; se espera como
+    mucho `timeout` s (None = RUNTIME_FILL_TIMEOUT). Si falla o tarda más, la
+    página sigue en inglés. Devuelve el número de textos añadidos a tiempo.
+    """
+    lang = LANGUAGES.get(lang, lang)
+    if lang == SOURCE_LANG:
+        return 0
+
+    if backend is None:
+        if RUNTIME_BACKEND is None:
+            return 0
+        backend = get_backend(RUNTIME_BACKEND)
+
+    texts = page_strings(page)
+    with _fill_lock:
+        pending = tuple(get_catalog(path).missing(texts, [lang])[lang])
+        if not pending or (page, lang, pending) in _ATTEMPTED:
+            return 0
+        _ATTEMPTED.add((page, lang, pending))
+
+    future = _fill_pool.submit(_fill_pending, pending, lang, backend, path)
+    try:
+        return future.result(timeout=RUNTIME_FILL_TIMEOUT if timeout is None else timeout)
+    except FutureTimeoutError:
+        return 0
+    except Exception:
+        # Sin red / cuota agotada / disco de solo lectura: se usa el texto original
+        return 0
+
+
+def _fill_pending(pending: tuple, lang: str, backend, path) -> int:
+    """Petición en bloque sin lock; después, fusión con el catálogo en disco y guardado atómico"""
+    translations = backend.translate_batch(list(pending), SOURCE_LANG, lang)
+
+    with _fill_lock:
+        # Se relee el fichero (no el catálogo memorizado que usan los t() de otras sesiones)
+        catalog = TranslationCatalog.load(path)
+        added = 0
+        for text, translation in zip(pending, translations):
+            if catalog.get(text, lang) is None:
+                catalog.set(text, lang, translation)
+                added += 1
+        if added:
+            catalog.save()
+    return added
@@ -0,0 +1,51 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+
+# Un único lock para la primera carga: Streamlit pinta cada sesión en su propio
+# hilo y, en Python 3.11, el módulo de importlib.util.LazyLoader no es seguro
+# entre hilos (dos accesos simultáneos pueden ver el módulo a medio ejecutar)
+_LOAD_LOCK = threading.Lock()
+
+
+class _LazyModule(types.ModuleType):
+    """Delegado: importa el módulo real en el primer acceso a un atributo"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def _load(self) -> types.ModuleType:
+        module = self._module
+        if module is None:
+            with _LOAD_LOCK:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+                module = self._module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str):
+    """
+    Módulo que se importa de verdad en el primer acceso a un atributo.
+
+    Para librerías pesadas (plotly.express, plotly.graph_objects...) que solo
+    necesitan algunas páginas: el import a nivel de módulo no cuesta nada y
+    la carga se paga al pintar la primera figura. La carga va con un lock y
+    con el import normal, así que es segura desde varios hilos.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return _LazyModule(name)
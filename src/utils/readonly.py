@@ -0,0 +1,22 @@
+import pandas as pd
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Devuelve el DataFrame sobre arrays de SOLO LECTURA (una copia, una vez).
+
+    Los frames compartidos entre sesiones se reparten como vistas sin copiar;
+    cualquier escritura en sitio sobre ellos o sus vistas (iloc/loc, +=,
+    fillna(inplace=True), to_numpy()[...] = ...) lanza ValueError en lugar de
+    cambiar los datos de todos. Añadir columnas o reordenar una vista crea
+    un objeto nuevo y no afecta al original.
+
+    Cada columna queda en su propio bloque (sin consolidar), así pandas
+    mantiene los arrays originales y no los vuelve escribibles.
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+
+NS_PER_HOUR = 3_600_000_000_000
+NS_PER_DAY = 24 * NS_PER_HOUR
+
+
+def to_epoch_ns(datetimes) -> np.ndarray:
+    """Fechas (Series/DatetimeIndex/array) como int64 en ns desde epoch, sin copiar si ya son datetime64[ns]."""
+    return np.asarray(datetimes, dtype="datetime64[ns]").view("i8")
+
+
+def position_of(epoch_ns: np.ndarray, when, side: str = "left") -> int:
+    """
+    Posición de `when` en un array de epoch ns ORDENADO (búsqueda binaria).
+    side="left": primera fila con fecha >= when
+    """
+    return int(np.searchsorted(epoch_ns, pd.Timestamp(when).value, side=side))
+
+
+def day_ordinals(epoch_ns: np.ndarray) -> np.ndarray:
+    """Día entero (floor) de cada instante: días desde 1970-01-01"""
+    return epoch_ns // NS_PER_DAY
@@ -0,0 +1,79 @@
+"""
+Backends de traducción en bloque para el catálogo (src/utils/translation_catalog.py).
+
+Todos implementan translate_batch(texts, source, target) -> lista de
+traducciones en el mismo orden, en el menor número de peticiones posible.
+"""
+
+# Separador de textos dentro de una petición (las traducciones conservan los saltos de línea)
+_LINE_BREAK = "<br>"
+
+
+class TranslationBackend:
+    name = "base"
+
+    def translate_batch(self, texts: list, source: str, target: str) -> list:
+        raise NotImplementedError
+
+
+class StubBackend(TranslationBackend):
+    """
+    Backend local sin red (tests y entornos aislados): devuelve "[<lang>] texto".
+    Cuenta las llamadas para poder comprobar que una página es una sola petición.
+    """
+    name = "stub"
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate_batch(self, texts: list, source: str, target: str) -> list:
+        self.calls += 1
+        return [f"[{target}] {text}" for text in texts]
+
+
+class GoogleTranslateBackend(TranslationBackend):
+    """
+    Google Translate (deep_translator) con los textos unidos en una sola
+    petición por bloque de `max_chars` (un texto por línea). Si la respuesta no
+    trae una línea por texto, ese bloque se traduce texto a texto.
+    """
+    name = "google"
+
+    def __init__(self, max_chars: int = 4500):
+        self.max_chars = max_chars  # deep_translator admite hasta 5000 caracteres
+
+    def translate_batch(self, texts: list, source: str, target: str) -> list:
+        from deep_translator import GoogleTranslator
+
+        translator = GoogleTranslator(source=source, target=target)
+        translations = []
+        for chunk in self._chunks(texts):
+            lines = [text.replace("\n", _LINE_BREAK) for text in chunk]
+            result = (translator.translate("\n".join(lines)) or "").split("\n")
+            if len(result) != len(chunk):
+                result = [translator.translate(text) for text in chunk]
+            translations += [line.replace(_LINE_BREAK, "\n").strip() for line in result]
+        return translations
+
+    def _chunks(self, texts: list):
+        chunk, size = [], 0
+        for text in texts:
+            if chunk and size + len(text) + 1 > self.max_chars:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(text)
+            size += len(text) + 1
+        if chunk:
+            yield chunk
+
+
+BACKENDS = {
+    StubBackend.name: StubBackend,
+    GoogleTranslateBackend.name: GoogleTranslateBackend,
+}
+
+
+def get_backend(name: str) -> TranslationBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de traducción desconocido: {name} (disponibles: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
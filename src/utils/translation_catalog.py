@@ -0,0 +1,243 @@
+"""
+Catálogo local de traducciones de la UI.
+
+Las traducciones se guardan en data/translations.json (se distribuye con la
+app), indexadas por hash del texto original y por idioma. t() solo lee el
+catálogo: nunca llama a la red al pintar un texto. Los textos que falten se
+traducen en bloque con la herramienta de línea de comandos (o, si se activa
+RUNTIME_BACKEND en src/utils/i18n.py, por página al cambiar de idioma):
+
+    python -m src.utils.translation_catalog missing --pages
+    python -m src.utils.translation_catalog fill --pages [--langs es pt fr] [--backend google]
+    python -m src.utils.translation_catalog fill --text "Nuevo texto"
+"""
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from src.utils.frame_cache import FILE_MODE, source_signature
+from src.utils.translation_backends import BACKENDS, get_backend
+
+
+CATALOG_VERSION = 1
+SOURCE_LANG = "en"
+
+# Nombre mostrado en la UI -> código de idioma
+LANGUAGES = {
+    "English": "en",
+    "Spanish": "es",
+    "Portuguese": "pt",
+    "French": "fr"
+}
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CATALOG_PATH = PROJECT_ROOT / "data" / "translations.json"
+
+
+def text_key(text: str) -> str:
+    """Clave estable del texto original (sha256, 16 hex)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class TranslationCatalog:
+    """
+    Traducciones {clave del texto: {"text": original, "<lang>": traducción}}.
+    `revision` aumenta en cada save() para saber qué versión se distribuye.
+    """
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH, entries: dict = None, revision: int = 0):
+        self.path = Path(path)
+        self.entries = entries if entries is not None else {}
+        self.revision = revision
+
+    @classmethod
+    def load(cls, path=DEFAULT_CATALOG_PATH) -> "TranslationCatalog":
+        """Lee el catálogo; si no existe, devuelve uno vacío"""
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        if data.get("version") != CATALOG_VERSION:
+            raise ValueError(f"Versión de catálogo no soportada: {data.get('version')} (esperada {CATALOG_VERSION})")
+        return cls(path, entries=data.get("entries", {}), revision=data.get("revision", 0))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, text: str, lang: str):
+        """Traducción de `text` a `lang`, o None si no está en el catálogo"""
+        if lang == SOURCE_LANG:
+            return text
+        entry = self.entries.get(text_key(text))
+        return None if entry is None else entry.get(lang)
+
+    def set(self, text: str, lang: str, translation: str):
+        entry = self.entries.setdefault(text_key(text), {"text": text})
+        entry[lang] = translation
+
+    def missing(self, texts, langs) -> dict:
+        """{lang: [textos sin traducción]} para los textos y idiomas pedidos"""
+        return {
+            lang: [text for text in dict.fromkeys(texts) if self.get(text, lang) is None]
+            for lang in langs
+        }
+
+    def save(self):
+        """Escritura atómica (tmp + replace), con las claves ordenadas para diffs limpios"""
+        data = {
+            "version": CATALOG_VERSION,
+            "revision": self.revision + 1,
+            "source_lang": SOURCE_LANG,
+            "entries": self.entries,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # tmp único (varios hilos del mismo proceso); si algo falla, el catálogo anterior queda intacto
+        tmp = None
+        try:
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.path.parent,
+                                             prefix=f"{self.path.name}.", suffix=".tmp", delete=False) as f:
+                tmp = Path(f.name)
+                json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+                f.write("\n")
+            os.chmod(tmp, FILE_MODE)
+            os.replace(tmp, self.path)
+            tmp = None
+            self.revision += 1
+        finally:
+            if tmp is not None:
+                tmp.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=4)
+def _load_catalog(path: str, signature: str) -> TranslationCatalog:
+    return TranslationCatalog.load(path)
+
+
+def get_catalog(path=DEFAULT_CATALOG_PATH) -> TranslationCatalog:
+    """
+    Catálogo memorizado por proceso; se vuelve a leer solo si el fichero cambia.
+    Si falta o no se puede leer, se usa un catálogo vacío (textos sin traducir).
+    """
+    path = str(Path(path).resolve())
+    try:
+        return _load_catalog(path, source_signature(path))
+    except (OSError, ValueError):
+        return TranslationCatalog(path)
+
+
+def translate(text, lang: str, path=DEFAULT_CATALOG_PATH):
+    """
+    Traducción para la UI: solo consulta el catálogo (sin red).
+    `lang` es un código ("es") o un nombre de LANGUAGES ("Spanish").
+    Sin traducción en el catálogo devuelve el texto original.
+    """
+    lang = LANGUAGES.get(lang, lang)
+    if lang == SOURCE_LANG or not isinstance(text, str):
+        return text
+    translation = get_catalog(path).get(text, lang)
+    return text if translation is None else translation
+
+
+# --------------------------------------------------
+# Herramienta de relleno (fuera de la app)
+# --------------------------------------------------
+def scan_ui_strings(paths=None, scope: str = None, function_names=("t",)) -> list:
+    """
+    Literales pasados a t("...") en los .py del proyecto (app.py y src/).
+    scope: solo dentro de la función/método con ese nombre.
+    """
+    if paths is None:
+        paths = [PROJECT_ROOT / "app.py", *sorted((PROJECT_ROOT / "src").rglob("*.py"))]
+
+    texts = []
+    for path in paths:
+        tree = ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+        roots = [tree]
+        if scope is not None:
+            roots = [
+                node for node in ast.walk(tree)
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == scope
+            ]
+        for root in roots:
+            for node in ast.walk(root):
+                if (
+                    isinstance(node, ast.Call)
+                    and isinstance(node.func, ast.Name)
+                    and node.func.id in function_names
+                    and node.args
+                    and isinstance(node.args[0], ast.Constant)
+                    and isinstance(node.args[0].value, str)
+                ):
+                    texts.append(node.args[0].value)
+    return list(dict.fromkeys(texts))
+
+
+def fill_catalog(catalog: TranslationCatalog, texts, langs, backend=None) -> int:
+    """
+    Traduce los textos que faltan (una petición en bloque por idioma) y guarda
+    el catálogo de forma atómica. backend: TranslationBackend (por defecto Google).
+    """
+    if backend is None:
+        backend = get_backend("google")
+
+    added = 0
+    for lang, pending in catalog.missing(texts, langs).items():
+        if not pending:
+            continue
+        for text, translation in zip(pending, backend.translate_batch(pending, SOURCE_LANG, lang)):
+            catalog.set(text, lang, translation)
+            added += 1
+
+    if added:
+        catalog.save()
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catálogo de traducciones de la UI")
+    parser.add_argument("command", choices=["missing", "fill"])
+    parser.add_argument("--scan", action="store_true", help="incluir los literales de t(...) del código")
+    parser.add_argument("--pages", action="store_true", help="incluir los textos registrados de todas las páginas")
+    parser.add_argument("--text", action="append", default=[], help="texto a incluir (repetible)")
+    parser.add_argument("--file", help="fichero con un texto por línea")
+    parser.add_argument("--langs", nargs="+", default=[code for code in LANGUAGES.values() if code != SOURCE_LANG])
+    parser.add_argument("--catalog", default=str(DEFAULT_CATALOG_PATH))
+    parser.add_argument("--backend", default="google", choices=sorted(BACKENDS))
+    args = parser.parse_args(argv)
+
+    texts = list(args.text)
+    if args.file:
+        texts += [line for line in Path(args.file).read_text(encoding="utf-8").splitlines() if line.strip()]
+    if args.scan:
+        texts += scan_ui_strings()
+    if args.pages:
+        from src.utils.i18n import COMMON_SOURCES, PAGE_SOURCES, page_strings
+        # Los módulos de src/ registran sus textos dinámicos al importarse
+        for path, _ in COMMON_SOURCES + [source for sources in PAGE_SOURCES.values() for source in sources]:
+            if path.startswith("src/"):
+                importlib.import_module(path[:-len(".py")].replace("/", "."))
+        for page in PAGE_SOURCES:
+            texts += page_strings(page)
+
+    catalog = TranslationCatalog.load(args.catalog)
+    if args.command == "missing":
+        for lang, pending in catalog.missing(texts, args.langs).items():
+            print(f"[{lang}] {len(pending)} missing")
+            for text in pending:
+                print(f"  {text}")
+    else:
+        added = fill_catalog(catalog, texts, args.langs, backend=get_backend(args.backend))
+        print(f"{added} translations added (revision {catalog.revision}, {len(catalog)} texts)")
+
+
+if __name__ == "__main__":
+    main()
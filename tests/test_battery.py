@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from src.optimization.battery import BatteryStorage
+
+
+def flows(n=24 * 30, seed=0):
+    """Exportación e importación horarias (nunca a la vez), como las de SurplusCalculator"""
+    rng = np.random.default_rng(seed)
+    net = rng.normal(0.0, 400.0, n)
+    return np.maximum(net, 0.0), np.maximum(-net, 0.0)
+
+
+@pytest.mark.parametrize("capacity, power, min_soc, initial_soc", [
+    (1000.0, 250.0, 0.0, 0.5),
+    (2000.0, 1000.0, 0.2, 0.2),
+    (500.0, 100.0, 0.1, 1.0),
+])
+def test_soc_within_bounds(capacity, power, min_soc, initial_soc):
+    export, imported = flows()
+    battery = BatteryStorage(capacity, power, min_soc=min_soc, initial_soc=initial_soc)
+    charge, discharge, soc = battery.simulate(export, imported)
+
+    tol = 1e-9 * capacity
+    assert np.all(soc >= min_soc * capacity - tol)
+    assert np.all(soc <= capacity + tol)
+    assert np.all(charge >= 0) and np.all(discharge >= 0)
+    assert np.all(charge <= np.minimum(export, power) + tol)
+    assert np.all(discharge <= np.minimum(imported, power) + tol)
+
+
+def test_energy_balance():
+    export, imported = flows(seed=1)
+    battery = BatteryStorage(1500.0, 400.0, round_trip_efficiency=0.81, initial_soc=0.3, min_soc=0.1)
+    charge, discharge, soc = battery.simulate(export, imported)
+
+    eta = np.sqrt(battery.round_trip_efficiency)
+    stored = charge * eta - discharge / eta
+    initial = battery.initial_soc * battery.capacity_kwh
+    # Hora a hora y en total: lo almacenado es exactamente el cambio de SoC
+    np.testing.assert_allclose(np.diff(soc, prepend=initial), stored, atol=1e-6)
+    assert soc[-1] - initial == pytest.approx(stored.sum(), abs=1e-6)
+    # Las pérdidas son (1 - η) de lo que pasa por la batería
+    assert charge.sum() - discharge.sum() - (soc[-1] - initial) >= 0
+
+
+def test_dispatch_keeps_demand_covered():
+    export, imported = flows(seed=2)
+    production = np.full(len(export), 500.0)
+    demand = production - export + imported
+    hourly = {
+        'Datetime': np.arange(len(export)).astype('datetime64[h]').astype('datetime64[ns]'),
+        'Demand': demand,
+        'Production': production,
+        'SelfConsumption': np.minimum(demand, production),
+        'ImportfromGrid': imported,
+        'ExportToGrid': export,
+    }
+    df = BatteryStorage(1000.0, 300.0).dispatch(hourly)
+
+    # Demanda = autoconsumo (directo + batería) + importación
+    np.testing.assert_allclose(df['SelfConsumption'] + df['ImportfromGrid'], demand, atol=1e-6)
+    # Producción = autoconsumo directo + carga + exportación
+    direct = df['SelfConsumption'] - df['BatteryDischarge']
+    np.testing.assert_allclose(direct + df['BatteryCharge'] + df['ExportToGrid'], production, atol=1e-6)
+
+
+def test_zero_capacity_does_nothing():
+    export, imported = flows(seed=3)
+    charge, discharge, soc = BatteryStorage(0.0, 100.0).simulate(export, imported)
+    assert not charge.any() and not discharge.any() and not soc.any()
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.surplus_calculator import SurplusCalculator
+from src.optimization.electrolyser import Electrolyser
+from src.environmental_indicators.ei_service import EnvironmentalIndicatorsService
+from src.environmental_indicators.ei_summary import ImpactResults, IMPACT_COLUMNS
+from src.environmental_indicators.indicators import GRID_MIX_INDICATORS
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DAYS = 7
+
+
+@pytest.fixture(scope="module")
+def daily_with_electrolyser():
+    """Diario de una semana de verano con el electrolizador despachado sobre el excedente"""
+    raw = pd.read_csv(DATA_DIR / "true_data.csv", nrows=24 * 200, parse_dates=["Datetime"])
+    raw = raw.iloc[-24 * DAYS:]
+    surplus = SurplusCalculator(
+        raw[["Datetime", "Energy Consumption kWh"]].rename(columns={"Energy Consumption kWh": "Demand"}),
+        raw[["Datetime", "Producción Planta"]].rename(columns={"Producción Planta": "Production"}),
+    )
+    surplus.calculate()
+    dispatched = Electrolyser(1000.0, min_load=0.1, tank_kg=500.0).dispatch_calculator(surplus)
+    daily = dispatched.get_daily_aggregated_all()
+    assert daily["ElectrolyserInput"].sum() > 0
+    return daily
+
+
+@pytest.fixture(scope="module")
+def ei_results(daily_with_electrolyser):
+    service = EnvironmentalIndicatorsService(
+        daily_with_electrolyser,
+        csv_mix_grid=str(DATA_DIR / "percentage_mix_grid_unified.csv")
+    )
+    return service.calculate_EI(GRID_MIX_INDICATORS, days=DAYS)
+
+
+@pytest.fixture(scope="module")
+def results(ei_results, daily_with_electrolyser):
+    return ImpactResults(ei_results["tables"], daily_with_electrolyser, ei_results["grid_reference"],
+                         ei_results["factors"])
+
+
+def test_impact_results_select_columns_by_name(ei_results, results):
+    for metric, table in ei_results["tables"].items():
+        # La columna del electrolizador desplaza las posiciones: los totales van por nombre
+        assert list(table.columns).index("Electrolyser") == 3
+        self_total, export_total, grid_total, net_total = table[IMPACT_COLUMNS].sum()
+        totals = results.totals[metric]
+        assert totals["self"] == pytest.approx(self_total)
+        assert totals["export"] == pytest.approx(export_total)
+        assert totals["grid"] == pytest.approx(grid_total)
+        assert totals["net"] == pytest.approx(net_total)
+        assert totals["electrolyser"] == pytest.approx(table["Electrolyser"].sum())
+        # Balance recalculado = suma de Net Impact (salvo el redondeo diario a 0.1)
+        assert totals["balance"] == pytest.approx(net_total, abs=0.1 * DAYS)
+
+
+def test_impact_ratios_use_service_factors(ei_results, results):
+    ratios = results.df_impact_ratios.set_index("Indicator")
+    for metric, factors in ei_results["factors"].items():
+        row = ratios.loc[results.totals[metric]["name"]]
+        assert row["PV Solar Factor"] == factors["PV Solar Factor"]
+        assert row["Mix Grid Factor"] == factors["Mix Grid Factor"]
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.optimization.electrolyser import Electrolyser, LHV_H2_KWH_PER_KG
+
+
+def surplus(n=24 * 60, seed=0):
+    """Excedente FV horario sintético (kWh): cero de noche, variable de día"""
+    rng = np.random.default_rng(seed)
+    hour = np.arange(n) % 24
+    sun = np.clip(np.sin((hour - 6) / 12 * np.pi), 0.0, None)
+    return sun * rng.uniform(0.0, 3000.0, n)
+
+
+def simulate_loop(electrolyser, export):
+    """Referencia hora a hora: recorte por el depósito y parada bajo la carga mínima"""
+    rated = electrolyser.rated_power_kw
+    kg_at_rated = rated / LHV_H2_KWH_PER_KG
+    min_kg = kg_at_rated * electrolyser._output_at(electrolyser.min_load)
+    level = electrolyser.initial_tank * electrolyser.tank_kg
+    produced, tank = [], []
+    for energy in export:
+        load = min(energy, rated) / rated
+        h2 = kg_at_rated * electrolyser._output_at(load) if load >= electrolyser.min_load else 0.0
+        room = electrolyser.tank_kg - level + electrolyser.offtake_kg_per_hour
+        if h2 > room:
+            h2 = room if room >= min_kg else 0.0
+        level = max(level + h2 - electrolyser.offtake_kg_per_hour, 0.0)
+        produced.append(h2)
+        tank.append(level)
+    return np.array(produced), np.array(tank)
+
+
+PARAMETERS = [
+    dict(rated_power_kw=1000.0, min_load=0.1, tank_kg=500.0, offtake_kg_per_hour=2.0),
+    dict(rated_power_kw=3000.0, min_load=0.3, tank_kg=200.0, offtake_kg_per_hour=1.0),
+    dict(rated_power_kw=1000.0, min_load=0.0, tank_kg=100.0, offtake_kg_per_hour=1.0, initial_tank=0.5),
+]
+
+
+@pytest.mark.parametrize("params", PARAMETERS)
+def test_matches_hourly_loop(params):
+    electrolyser = Electrolyser(**params)
+    export = surplus()
+    flows = electrolyser.simulate(export)
+    produced, tank = simulate_loop(electrolyser, export)
+
+    np.testing.assert_allclose(flows["H2Production"], produced, atol=1e-9)
+    np.testing.assert_allclose(flows["H2Tank"], tank, atol=1e-9)
+
+
+@pytest.mark.parametrize("params", PARAMETERS)
+def test_min_load_and_efficiency_at_actual_load(params):
+    electrolyser = Electrolyser(**params)
+    flows = electrolyser.simulate(surplus(seed=1))
+    load = flows["ElectrolyserInput"] / electrolyser.rated_power_kw
+
+    running = load > 0
+    assert np.all(load[running] >= electrolyser.min_load - 1e-6)
+    assert np.all(load <= 1.0 + 1e-12)
+    # H2 = energía · η(carga real) / PCI, también en las horas recortadas por el depósito
+    expected = flows["ElectrolyserInput"] * np.interp(load, *electrolyser.efficiency_curve) / LHV_H2_KWH_PER_KG
+    np.testing.assert_allclose(flows["H2Production"], expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("params", PARAMETERS)
+def test_tank_and_energy_balance(params):
+    electrolyser = Electrolyser(**params)
+    export = surplus(seed=2)
+    flows = electrolyser.simulate(export)
+
+    assert np.all(flows["H2Tank"] >= 0) and np.all(flows["H2Tank"] <= electrolyser.tank_kg + 1e-9)
+    initial = electrolyser.initial_tank * electrolyser.tank_kg
+    np.testing.assert_allclose(
+        np.diff(flows["H2Tank"], prepend=initial), flows["H2Production"] - flows["H2Offtake"], atol=1e-9
+    )
+    np.testing.assert_allclose(flows["ElectrolyserInput"] + flows["ExportToGrid"], export, atol=1e-6)
+    assert np.all(flows["Curtailment"] == 0)
+
+
+def test_export_limit_curtails_the_rest():
+    export = surplus(seed=3)
+    flows = Electrolyser(500.0, export_limit_kw=800.0).simulate(export)
+    assert np.all(flows["ExportToGrid"] <= 800.0 + 1e-9)
+    np.testing.assert_allclose(
+        flows["ElectrolyserInput"] + flows["ExportToGrid"] + flows["Curtailment"], export, atol=1e-6
+    )
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        Electrolyser(1000.0, min_load=1.5)
+    with pytest.raises(ValueError):
+        Electrolyser(1000.0, efficiency_curve=((0.5, 0.2), (0.6, 0.6)))
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.forecasting.backtest import run_backtest, summarise_backtest
+from src.forecasting.models import (
+    CalendarRegressionForecaster, FORECAST_TARGETS, HourlyHistory, SeasonalNaiveForecaster, forecast_times
+)
+from src.utils.time_index import NS_PER_DAY, NS_PER_HOUR
+
+
+START = pd.Timestamp("2023-01-01")
+DAYS = 60
+
+
+def history(days=DAYS):
+    """Histórico horario con un valor distinto en cada hora (se ve de qué hora sale cada previsión)"""
+    epoch_ns = START.value + np.arange(days * 24, dtype=np.int64) * NS_PER_HOUR
+    values = np.column_stack([np.arange(days * 24) * 2.0, np.arange(days * 24) * 2.0 + 1.0])
+    return HourlyHistory(epoch_ns, values)
+
+
+def value_at(hist, epoch_ns, target):
+    return hist.values[np.searchsorted(hist.epoch_ns, epoch_ns), FORECAST_TARGETS.index(target)]
+
+
+def test_seasonal_naive_one_week_and_one_day_earlier():
+    hist = history()
+    model = SeasonalNaiveForecaster(hist)
+    start_days = hist.start_days(7)[:-1]
+    forecast = model.predict(start_days, 1)
+    times = forecast_times(start_days, 1)
+
+    np.testing.assert_array_equal(forecast[..., 0], value_at(hist, times - 7 * NS_PER_DAY, "Demand"))
+    np.testing.assert_array_equal(forecast[..., 1], value_at(hist, times - NS_PER_DAY, "Production"))
+
+
+def test_seasonal_naive_multi_day_repeats_last_season():
+    hist = history()
+    start_day = hist.start_days(7)[10:11]
+    forecast = SeasonalNaiveForecaster(hist).predict(start_day, 7)[0]
+    times = forecast_times(start_day, 7)[0]
+
+    # Demanda: la semana anterior completa; producción: el último día antes del inicio, repetido
+    np.testing.assert_array_equal(forecast[:, 0], value_at(hist, times - 7 * NS_PER_DAY, "Demand"))
+    last_day = value_at(hist, start_day[0] * NS_PER_DAY + np.arange(-24, 0) * NS_PER_HOUR, "Production")
+    np.testing.assert_array_equal(forecast[:, 1], np.tile(last_day, 7))
+
+
+def test_seasonal_naive_without_history_is_nan():
+    hist = history()
+    forecast = SeasonalNaiveForecaster(hist).predict(hist.start_days()[:1], 1)
+    assert np.isnan(forecast).all()
+
+
+def test_forecast_frame():
+    hist = history()
+    df = SeasonalNaiveForecaster(hist).forecast(START + pd.Timedelta(days=20), days=2)
+    assert list(df.columns) == ["Datetime"] + FORECAST_TARGETS
+    assert len(df) == 48 and df["Datetime"].iloc[0] == START + pd.Timedelta(days=20)
+    with pytest.raises(ValueError):
+        SeasonalNaiveForecaster(hist).forecast(START, days=8)
+
+
+def test_regression_uses_only_history_before_the_start():
+    hist = history()
+    start_day = hist.start_days(30)[:1]
+    before = CalendarRegressionForecaster(hist).predict(start_day, 3)
+
+    # Cambiar lo medido desde la fecha de inicio no cambia la previsión
+    values = hist.values.copy()
+    values[hist.days >= start_day[0]] *= 10
+    after = CalendarRegressionForecaster(HourlyHistory(hist.epoch_ns, values)).predict(start_day, 3)
+    np.testing.assert_array_equal(before, after)
+    assert np.all(before >= 0)
+
+
+def test_regression_needs_min_history():
+    hist = history()
+    model = CalendarRegressionForecaster(hist, min_history_days=14)
+    forecast = model.predict(hist.start_days()[[13, 14]], 1)
+    assert np.isnan(forecast[0]).all() and np.isfinite(forecast[1]).all()
+
+
+def test_backtest_parallel_matches_serial():
+    hist = history()
+    serial = run_backtest(hist, horizon_days=2, workers=1, chunk_days=10)
+    parallel = run_backtest(hist, horizon_days=2, workers=2, chunk_days=10)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+    summary = summarise_backtest(serial)
+    assert set(summary["Model"]) == {"seasonal_naive", "calendar_regression"}
+    assert (summary["Hours"] > 0).all()
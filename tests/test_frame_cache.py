@@ -0,0 +1,21 @@
+import os
+import stat
+
+import pandas as pd
+import pytest
+
+from src.utils.frame_cache import FILE_MODE, get_cache_dir, load_cached_frame
+
+pytest.importorskip("pyarrow")
+
+
+def test_snapshot_gets_umask_permissions(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2, 3], "b": [0.5, 1.5, 2.5]}).to_csv(path, index=False)
+
+    df = load_cached_frame(path, pd.read_csv)
+    snapshots = list(get_cache_dir(path).glob("*.parquet"))
+    assert len(snapshots) == 1 and not list(get_cache_dir(path).glob("*.tmp"))
+    # Como un fichero creado con open(): no el 0600 de NamedTemporaryFile
+    assert stat.S_IMODE(os.stat(snapshots[0]).st_mode) == FILE_MODE
+    pd.testing.assert_frame_equal(load_cached_frame(path, pd.read_csv), df)
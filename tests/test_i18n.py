@@ -0,0 +1,188 @@
+import json
+import os
+import re
+import stat
+import threading
+import time
+
+import pytest
+
+from src.utils import i18n
+from src.utils.translation_backends import StubBackend, TranslationBackend
+from src.utils.frame_cache import FILE_MODE
+from src.utils.translation_catalog import TranslationCatalog, fill_catalog
+
+
+PAGE = "Optimization"
+FIELD = re.compile(r"\{(\w*)\}")
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Cada test parte sin textos registrados ni intentos previos"""
+    registered, attempted = dict(i18n._REGISTERED), set(i18n._ATTEMPTED)
+    i18n._REGISTERED.clear()
+    i18n._ATTEMPTED.clear()
+    yield
+    i18n._REGISTERED.clear()
+    i18n._REGISTERED.update(registered)
+    i18n._ATTEMPTED.clear()
+    i18n._ATTEMPTED.update(attempted)
+
+
+class FailingBackend(TranslationBackend):
+    name = "failing"
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate_batch(self, texts, source, target):
+        self.calls += 1
+        raise ConnectionError("sin red")
+
+
+class SlowBackend(StubBackend):
+    """Stub que espera a `release` antes de responder (petición lenta)"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def translate_batch(self, texts, source, target):
+        self.release.wait(5)
+        return super().translate_batch(texts, source, target)
+
+
+# --------------------------------------------------
+# page_strings
+# --------------------------------------------------
+def test_page_strings_without_duplicates():
+    scanned = i18n.page_strings(PAGE)
+    assert scanned and len(scanned) == len(set(scanned))
+
+    # Registrados repetidos y ya presentes en el código: cada texto una sola vez
+    i18n.register_page_strings(PAGE, ["Dynamic text", "Dynamic text", scanned[0]])
+    texts = i18n.page_strings(PAGE)
+    assert len(texts) == len(set(texts))
+    assert texts[:len(scanned)] == scanned
+    assert texts[len(scanned):] == ["Dynamic text"]
+
+
+def test_page_strings_include_common_sources():
+    common = i18n.page_strings("Unknown page")
+    assert common
+    assert set(common) <= set(i18n.page_strings(PAGE))
+
+
+def test_catalog_translations_keep_format_fields():
+    """Los textos con {campos} se rellenan tras traducir: la traducción debe conservarlos"""
+    catalog = TranslationCatalog.load()
+    for entry in catalog.entries.values():
+        fields = set(FIELD.findall(entry["text"]))
+        for lang, translated in entry.items():
+            if lang != "text":
+                assert set(FIELD.findall(translated)) == fields, (lang, entry["text"])
+
+
+# --------------------------------------------------
+# fill_catalog / save
+# --------------------------------------------------
+def test_fill_catalog_saves_atomically(tmp_path):
+    path = tmp_path / "translations.json"
+    backend = StubBackend()
+    catalog = TranslationCatalog(path)
+
+    added = fill_catalog(catalog, ["Hello", "World", "Hello"], ["es", "fr"], backend=backend)
+
+    assert added == 4
+    assert backend.calls == 2  # una petición por idioma
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["revision"] == catalog.revision == 1
+    assert TranslationCatalog.load(path).get("World", "fr") == "[fr] World"
+    assert [p.name for p in tmp_path.iterdir()] == ["translations.json"]
+    assert stat.S_IMODE(os.stat(path).st_mode) == FILE_MODE
+
+    # Nada pendiente: ni petición ni nueva revisión
+    assert fill_catalog(catalog, ["Hello"], ["es"], backend=backend) == 0
+    assert backend.calls == 2 and catalog.revision == 1
+
+
+def test_failed_save_keeps_previous_catalog(tmp_path, monkeypatch):
+    path = tmp_path / "translations.json"
+    catalog = TranslationCatalog(path)
+    fill_catalog(catalog, ["Hello"], ["es"], backend=StubBackend())
+    before = path.read_bytes()
+
+    def broken_dump(*args, **kwargs):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(json, "dump", broken_dump)
+    with pytest.raises(OSError):
+        fill_catalog(catalog, ["World"], ["es"], backend=StubBackend())
+
+    assert path.read_bytes() == before
+    assert catalog.revision == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["translations.json"]
+
+
+# --------------------------------------------------
+# prepare_page_translations
+# --------------------------------------------------
+def test_runtime_fill_disabled_by_default(tmp_path):
+    assert i18n.RUNTIME_BACKEND is None
+    assert i18n.prepare_page_translations(PAGE, "Spanish", path=tmp_path / "translations.json") == 0
+    assert not (tmp_path / "translations.json").exists()
+
+
+def test_one_request_per_page_and_language(tmp_path):
+    path = tmp_path / "translations.json"
+    backend = StubBackend()
+    texts = i18n.page_strings(PAGE)
+
+    assert i18n.prepare_page_translations(PAGE, "Spanish", backend=backend, path=path) == len(texts)
+    assert backend.calls == 1
+    # Rerun de la misma página: todo está en el catálogo
+    assert i18n.prepare_page_translations(PAGE, "Spanish", backend=backend, path=path) == 0
+    assert backend.calls == 1
+
+    assert i18n.prepare_page_translations(PAGE, "fr", backend=backend, path=path) == len(texts)
+    assert backend.calls == 2
+    # Otra página: una petición solo con sus textos; los comunes (barra lateral) ya están
+    added = i18n.prepare_page_translations("Energy Performance", "es", backend=backend, path=path)
+    assert added == len(set(i18n.page_strings("Energy Performance")) - set(texts))
+    assert backend.calls == 3
+    # Introduction solo tiene textos comunes: ninguna petición
+    assert i18n.prepare_page_translations("Introduction", "es", backend=backend, path=path) == 0
+    assert backend.calls == 3
+
+    catalog = TranslationCatalog.load(path)
+    assert catalog.get(texts[0], "es") == f"[es] {texts[0]}"
+    assert i18n.prepare_page_translations("English", "English", backend=backend, path=path) == 0
+
+
+def test_failed_request_is_not_retried(tmp_path):
+    path = tmp_path / "translations.json"
+    backend = FailingBackend()
+
+    assert i18n.prepare_page_translations(PAGE, "es", backend=backend, path=path) == 0
+    assert i18n.prepare_page_translations(PAGE, "es", backend=backend, path=path) == 0
+    assert backend.calls == 1
+    assert not path.exists()
+
+
+def test_slow_request_does_not_block_the_page(tmp_path):
+    path = tmp_path / "translations.json"
+    backend = SlowBackend()
+
+    t0 = time.perf_counter()
+    assert i18n.prepare_page_translations(PAGE, "es", backend=backend, path=path, timeout=0.05) == 0
+    assert time.perf_counter() - t0 < 1.0
+    # Mientras la petición sigue en curso, el lock está libre (otras sesiones no esperan)
+    assert i18n._fill_lock.acquire(timeout=0.5)
+    i18n._fill_lock.release()
+
+    # Al terminar en segundo plano, el catálogo queda guardado para los siguientes reruns
+    backend.release.set()
+    i18n._fill_pool.submit(lambda: None).result(timeout=5)
+    assert TranslationCatalog.load(path).missing(i18n.page_strings(PAGE), ["es"])["es"] == []
+    assert backend.calls == 1
@@ -0,0 +1,48 @@
+import sys
+import threading
+
+import pytest
+
+from src.utils.lazy_imports import lazy_import
+
+
+SLOW_MODULE = """
+import time
+time.sleep(0.2)
+VALUE = 42
+"""
+
+
+@pytest.fixture
+def slow_module(tmp_path, monkeypatch):
+    """Módulo que tarda en ejecutarse y define su atributo al final"""
+    (tmp_path / "slow_lazy_module.py").write_text(SLOW_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "slow_lazy_module"
+    sys.modules.pop("slow_lazy_module", None)
+
+
+def test_first_access_from_many_threads(slow_module):
+    module = lazy_import(slow_module)
+
+    seen, errors = [], []
+
+    def read():
+        try:
+            seen.append(module.VALUE)
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [] and seen == [42] * 8
+    assert sys.modules[slow_module].VALUE == 42
+
+
+def test_missing_module_fails_at_import():
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("no_such_module_for_lazy_import")
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+
+from src.optimization.pump_scheduling import PumpScheduler
+from src.surplus_calculator import SurplusCalculator
+
+
+DAYS = 10
+
+
+def series(days=DAYS, seed=0):
+    """Demanda de bombeo y producción FV horarias sintéticas (kWh) y su día"""
+    rng = np.random.default_rng(seed)
+    hour = np.tile(np.arange(24), days)
+    demand = rng.uniform(50.0, 300.0, days * 24)
+    sun = np.clip(np.sin((hour - 6) / 12 * np.pi), 0.0, None)
+    production = sun * rng.uniform(200.0, 600.0, days * 24)
+    return demand, production, np.repeat(np.arange(days), 24)
+
+
+def imports(demand, production):
+    return np.maximum(demand - production, 0.0).sum()
+
+
+@pytest.mark.parametrize("share, max_power", [(0.3, None), (0.5, 350.0), (1.0, 400.0)])
+def test_daily_demand_is_conserved(share, max_power):
+    demand, production, day = series()
+    new_demand = PumpScheduler(share, max_power_kw=max_power).solve(demand, production, day, np.ones(len(day)))
+
+    np.testing.assert_allclose(
+        np.bincount(day, weights=new_demand), np.bincount(day, weights=demand), rtol=1e-7
+    )
+
+
+@pytest.mark.parametrize("share, max_power", [(0.3, None), (0.5, 350.0), (1.0, 400.0)])
+def test_power_bounds(share, max_power):
+    demand, production, day = series(seed=1)
+    new_demand = PumpScheduler(share, max_power_kw=max_power).solve(demand, production, day, np.ones(len(day)))
+
+    tol = 1e-6 * demand.max()
+    # La parte fija no se mueve y nunca se supera la potencia máxima (o lo que ya se bombeaba)
+    assert np.all(new_demand >= demand * (1 - share) - tol)
+    limit = np.maximum(demand.max() if max_power is None else max_power, demand)
+    assert np.all(new_demand <= limit + tol)
+
+
+def test_never_imports_more_than_the_current_schedule():
+    demand, production, day = series(seed=2)
+    new_demand = PumpScheduler(0.4, max_power_kw=400.0).solve(demand, production, day, np.ones(len(day)))
+    assert imports(new_demand, production) <= imports(demand, production) + 1e-6
+
+
+def test_no_flexible_share_keeps_demand():
+    demand, production, day = series(seed=3)
+    scheduler = PumpScheduler(0.0)
+    np.testing.assert_array_equal(scheduler.solve(demand, production, day, np.ones(len(day))), demand)
+    assert scheduler.batches == 0
+
+
+def test_batches_do_not_change_the_schedule():
+    demand, production, day = series(seed=4)
+    cost = np.ones(len(day))
+    one = PumpScheduler(0.5, max_power_kw=350.0, batch_days=DAYS).solve(demand, production, day, cost)
+    scheduler = PumpScheduler(0.5, max_power_kw=350.0, batch_days=3)
+    batched = scheduler.solve(demand, production, day, cost)
+    assert scheduler.batches == 4
+    assert imports(batched, production) == pytest.approx(imports(one, production), abs=1e-5)
+
+
+def test_schedule_window_returns_consistent_flows():
+    demand, production, _ = series(seed=5)
+    start = pd.Timestamp("2023-06-01")
+    surplus = SurplusCalculator(
+        pd.DataFrame({"Datetime": pd.date_range(start, periods=len(demand), freq="h"), "Demand": demand}),
+        pd.DataFrame({"Datetime": pd.date_range(start, periods=len(demand), freq="h"), "Production": production}),
+    )
+    surplus.calculate()
+    result = PumpScheduler(0.3, max_power_kw=400.0).schedule(surplus, start_date=start + pd.Timedelta(days=2), days=3)
+    df = result.result
+
+    assert len(df) == 3 * 24 and df["Datetime"].iloc[0] == start + pd.Timedelta(days=2)
+    np.testing.assert_allclose(df["Demand"] - df["DemandOriginal"], df["ShiftedLoad"])
+    np.testing.assert_allclose(df["SelfConsumption"] + df["ImportfromGrid"], df["Demand"], atol=1e-6)
+    np.testing.assert_allclose(df["SelfConsumption"] + df["ExportToGrid"], df["Production"], atol=1e-6)
+
+
+def test_daily_intensity_gives_the_import_optimum():
+    """Con intensidad constante dentro de cada día, "gwp" minimiza lo mismo que "import" cada día"""
+    demand, production, day = series(seed=5)
+    intensity = np.random.default_rng(5).uniform(0.1, 0.5, DAYS)[day]
+    by_import = PumpScheduler(0.4, max_power_kw=400.0).solve(demand, production, day, np.ones(len(day)))
+    by_gwp = PumpScheduler(0.4, max_power_kw=400.0, objective="gwp").solve(demand, production, day, intensity)
+
+    # Puede elegir otro óptimo empatado, pero la importación de cada día es la misma
+    daily_imports = [np.bincount(day, weights=np.maximum(d - production, 0.0)) for d in (by_gwp, by_import)]
+    np.testing.assert_allclose(*daily_imports, rtol=1e-7, atol=1e-6 * demand.max())
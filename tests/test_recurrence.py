@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from src.optimization.recurrence import clamped_cumsum
+
+
+def clamped_cumsum_loop(deltas, initial, lower, upper):
+    """Referencia: la recurrencia paso a paso"""
+    n = len(deltas)
+    lower = np.broadcast_to(lower, (n,))
+    upper = np.broadcast_to(upper, (n,))
+    state, out = initial, []
+    for delta, lo, hi in zip(deltas, lower, upper):
+        state = min(max(state + delta, lo), hi)
+        out.append(state)
+    return np.array(out, dtype=np.float64)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 8, 9, 100, 1000])
+def test_matches_loop_with_scalar_bounds(n):
+    deltas = np.random.default_rng(n).normal(0.0, 5.0, n)
+    expected = clamped_cumsum_loop(deltas, 3.0, 0.0, 10.0)
+    np.testing.assert_allclose(clamped_cumsum(deltas, 3.0, 0.0, 10.0), expected, atol=1e-9)
+
+
+def test_matches_loop_with_array_bounds():
+    rng = np.random.default_rng(1)
+    n = 500
+    deltas = rng.normal(0.0, 5.0, n)
+    lower = rng.uniform(-5.0, 0.0, n)
+    upper = lower + rng.uniform(0.0, 15.0, n)
+    expected = clamped_cumsum_loop(deltas, 1.0, lower, upper)
+    result = clamped_cumsum(deltas, 1.0, lower, upper)
+    np.testing.assert_allclose(result, expected, atol=1e-9)
+    assert np.all(result >= lower) and np.all(result <= upper)
+
+
+def test_infinite_upper_bound():
+    deltas = np.random.default_rng(2).normal(0.5, 3.0, 300)
+    expected = clamped_cumsum_loop(deltas, 0.0, 0.0, np.inf)
+    result = clamped_cumsum(deltas, 0.0, 0.0, np.inf)
+    np.testing.assert_allclose(result, expected, atol=1e-9)
+    assert np.all(np.isfinite(result))
+
+
+def test_without_bounds_is_a_plain_cumsum():
+    deltas = np.random.default_rng(3).normal(0.0, 1.0, 64)
+    np.testing.assert_allclose(clamped_cumsum(deltas, 2.0, -np.inf, np.inf), 2.0 + np.cumsum(deltas))
+
+
+def test_initial_outside_bounds_is_clamped_at_first_step():
+    np.testing.assert_allclose(clamped_cumsum([0.0, 1.0], 50.0, 0.0, 10.0), [10.0, 10.0])
+
+
+def test_empty_input():
+    result = clamped_cumsum([], 1.0, 0.0, 10.0)
+    assert result.shape == (0,) and result.dtype == np.float64
+
+
+def test_lower_above_upper_raises():
+    with pytest.raises(ValueError):
+        clamped_cumsum([1.0, 2.0], 0.0, [0.0, 5.0], [1.0, 4.0])
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.services.energy_data_service import EnergyDataService
+
+
+SOURCE = Path(__file__).resolve().parent.parent / "data" / "true_data.csv"
+ROWS = 24 * 6
+
+
+@pytest.fixture(scope="module")
+def source_lines():
+    with open(SOURCE, "rb") as f:
+        return [next(f) for _ in range(1 + ROWS + 48)]
+
+
+def make_service(path: Path) -> EnergyDataService:
+    """Servicio sobre un CSV temporal (demanda, producción y mix en el mismo fichero)"""
+    service = EnergyDataService()
+    service.demand_path = service.production_path = service.grid_mix_path = path
+    return service
+
+
+def assert_matches_full_load(service: EnergyDataService, path: Path):
+    fresh = make_service(path)
+    fresh.load_data()
+    pd.testing.assert_frame_equal(service.df_daily_full, fresh.df_daily_full)
+    assert len(service.surplus_calculator) == len(fresh.surplus_calculator)
+
+
+@pytest.fixture
+def loaded(tmp_path, source_lines):
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"".join(source_lines[:1 + ROWS]))
+    service = make_service(path)
+    service.load_data()
+    return service, path
+
+
+def test_append_reads_only_new_rows(loaded, source_lines):
+    service, path = loaded
+    with open(path, "ab") as f:
+        f.write(b"".join(source_lines[1 + ROWS:1 + ROWS + 30]))
+
+    result = service.refresh()
+    assert result["mode"] == "append" and result["rows"] == 30
+    assert_matches_full_load(service, path)
+    assert service.refresh()["mode"] == "none"
+
+
+def test_partial_last_line_waits_for_the_rest(loaded, source_lines):
+    service, path = loaded
+    extra = source_lines[1 + ROWS:1 + ROWS + 6]
+    half = len(extra[-1]) // 2
+    with open(path, "ab") as f:
+        f.write(b"".join(extra[:-1]) + extra[-1][:half])
+
+    result = service.refresh()
+    assert result["mode"] == "append" and result["rows"] == 5
+
+    with open(path, "ab") as f:
+        f.write(extra[-1][half:])
+    result = service.refresh()
+    assert result["mode"] == "append" and result["rows"] == 1
+    assert_matches_full_load(service, path)
+
+
+def test_truncated_file_reloads(loaded, source_lines):
+    service, path = loaded
+    path.write_bytes(b"".join(source_lines[:1 + ROWS - 24]))
+
+    assert service.refresh()["mode"] == "reload"
+    assert_matches_full_load(service, path)
+
+
+def test_rewritten_prefix_reloads(loaded, source_lines):
+    """El CSV crece pero las últimas filas ya leídas cambiaron: no es un append"""
+    service, path = loaded
+    lines = list(source_lines[:1 + ROWS + 24])
+    # Mismo número de bytes: el salto de línea sigue justo antes del offset anterior
+    fields = lines[ROWS].split(b",")
+    fields[-1] = (b"8" if fields[-1].startswith(b"9") else b"9") + fields[-1][1:]
+    lines[ROWS] = b",".join(fields)
+    path.write_bytes(b"".join(lines))
+
+    assert service.refresh()["mode"] == "reload"
+    assert_matches_full_load(service, path)
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_loader import DataLoader
+from src.streaming_surplus import StreamingSurplusAggregator, HOURLY_COLUMNS
+from src.surplus_calculator import SurplusCalculator, DAILY_COLUMNS
+
+
+SOURCE = Path(__file__).resolve().parent.parent / "data" / "true_data.csv"
+DEMAND_COL = "Energy Consumption kWh"
+PRODUCTION_COL = "Producción Planta"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# 37 filas: los cortes entre trozos caen a media mañana, media tarde, ... nunca a medianoche
+CHUNKSIZE = 37
+
+
+@pytest.fixture(scope="module")
+def csv_path(tmp_path_factory):
+    """Diez días del CSV real en un fichero temporal"""
+    path = tmp_path_factory.mktemp("streaming") / "meter.csv"
+    pd.read_csv(SOURCE, nrows=24 * 10).to_csv(path, index=False)
+    return path
+
+
+def make_loader(csv_path) -> DataLoader:
+    return DataLoader(
+        str(csv_path),
+        datetime_col="Datetime",
+        usecols=["Datetime", DEMAND_COL, PRODUCTION_COL],
+        dtype={DEMAND_COL: "float64", PRODUCTION_COL: "float64"},
+        datetime_format=DATETIME_FORMAT,
+        use_cache=False
+    )
+
+
+@pytest.fixture(scope="module")
+def calculator(csv_path):
+    """Referencia en memoria: carga completa + SurplusCalculator"""
+    df = make_loader(csv_path).load()
+    calculator = SurplusCalculator(
+        df[["Datetime", DEMAND_COL]].rename(columns={DEMAND_COL: "Demand"}),
+        df[["Datetime", PRODUCTION_COL]].rename(columns={PRODUCTION_COL: "Production"}),
+    )
+    calculator.calculate()
+    return calculator
+
+
+def test_iter_chunks_matches_load(csv_path):
+    chunks = list(make_loader(csv_path).iter_chunks(CHUNKSIZE))
+    assert len(chunks) > 1 and any(chunk["Datetime"].iloc[0].hour != 0 for chunk in chunks[1:])
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), make_loader(csv_path).load())
+
+
+def test_streaming_daily_matches_in_memory(csv_path, calculator):
+    aggregator = StreamingSurplusAggregator().ingest_csv(
+        str(csv_path), DEMAND_COL, PRODUCTION_COL,
+        datetime_format=DATETIME_FORMAT, chunksize=CHUNKSIZE
+    )
+    streamed = aggregator.get_daily()
+    expected = calculator.get_daily_aggregated_all()
+
+    assert aggregator.rows_processed == len(calculator)
+    np.testing.assert_array_equal(streamed["Datetime"].to_numpy(), expected["Datetime"].to_numpy())
+    # Mismos días partidos entre trozos: solo cambia el orden de las sumas
+    np.testing.assert_allclose(streamed[DAILY_COLUMNS].to_numpy(), expected[DAILY_COLUMNS].to_numpy(),
+                               rtol=1e-12, atol=1e-9)
+
+
+def test_streaming_window_matches_last_hours(csv_path, calculator):
+    aggregator = StreamingSurplusAggregator(window_rows=50).ingest_csv(
+        str(csv_path), DEMAND_COL, PRODUCTION_COL,
+        datetime_format=DATETIME_FORMAT, chunksize=CHUNKSIZE
+    )
+    window = aggregator.get_recent_window()
+    expected = calculator.get_last_hours(50).reset_index(drop=True)
+
+    np.testing.assert_array_equal(window["Datetime"].to_numpy(), expected["Datetime"].to_numpy())
+    for col in HOURLY_COLUMNS[1:]:
+        np.testing.assert_allclose(window[col].to_numpy(), expected[col].to_numpy(), err_msg=col)
@@ -0,0 +1,287 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.surplus_calculator import SurplusCalculator, DAILY_COLUMNS
+from src.services.energy_data_service import EnergyDataService
+from src.services.rollup_cube import RollupCube
+from src.utils.cumulative_totals import CumulativeTotals, ENERGY_COLUMNS
+
+
+FLOW_COLUMNS = ['SelfConsumption', 'ImportfromGrid', 'ExportToGrid']
+
+
+def hourly_frames(days=75, start="2021-12-02 05:00", seed=0):
+    """
+    Demanda y producción horarias sintéticas (kWh). Empiezan a media mañana (primer
+    día parcial), cruzan fines de mes y de año, y llevan algunos NaN.
+    """
+    rng = np.random.default_rng(seed)
+    datetimes = pd.date_range(start, periods=24 * days, freq="h")
+    sun = np.clip(np.sin((datetimes.hour.to_numpy() - 6) / 12 * np.pi), 0.0, None)
+    demand = rng.uniform(50.0, 400.0, len(datetimes))
+    production = sun * rng.uniform(0.0, 900.0, len(datetimes))
+    demand[::97] = np.nan
+    production[5::131] = np.nan
+    return (pd.DataFrame({'Datetime': datetimes, 'Demand': demand}),
+            pd.DataFrame({'Datetime': datetimes, 'Production': production}))
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return hourly_frames()
+
+
+@pytest.fixture(scope="module")
+def calculator(frames):
+    calculator = SurplusCalculator(*frames)
+    calculator.calculate()
+    return calculator
+
+
+@pytest.fixture(scope="module")
+def service():
+    """Servicio sobre los datos reales (data/true_data.csv)"""
+    service = EnergyDataService()
+    service.load_data()
+    return service
+
+
+@pytest.fixture(scope="module")
+def reference(frames):
+    """Resultado horario con el cálculo original fila a fila (df.apply)"""
+    df = frames[0].merge(frames[1], on='Datetime', how='inner')
+    df['SelfConsumption'] = df[['Production', 'Demand']].min(axis=1)
+    df['ImportfromGrid'] = df.apply(lambda row: max(row['Demand'] - row['Production'], 0), axis=1)
+    df['ExportToGrid'] = df.apply(lambda row: max(row['Production'] - row['Demand'], 0), axis=1)
+    return df
+
+
+# --------------------------------------------------
+# Flujos (compute_flows)
+# --------------------------------------------------
+def test_flows_match_row_wise_apply(calculator, reference):
+    result = calculator.result
+    for col in FLOW_COLUMNS:
+        np.testing.assert_array_equal(result[col].to_numpy(), reference[col].to_numpy(), err_msg=col)
+
+
+# --------------------------------------------------
+# Ventanas por búsqueda binaria (frente a máscara booleana)
+# --------------------------------------------------
+# Inicio de la serie, media mañana, medianoche exacta, última hora del día,
+# antes del inicio y cerca / después del final
+WINDOW_STARTS = ["2021-12-02 05:00", "2021-12-10 13:00", "2022-01-01", "2021-12-31 23:00",
+                 "2021-11-30", "2022-02-14 20:00", "2022-03-01"]
+
+
+def mask_from(df, start_date):
+    return df[df['Datetime'] >= pd.Timestamp(start_date)]
+
+
+def daily_groupby(df):
+    """Diario de referencia: el groupby original sobre dt.date (NaN como 0)"""
+    df = df.assign(Date=df['Datetime'].dt.date)
+    daily = df.groupby('Date')[DAILY_COLUMNS].sum().reset_index()
+    daily['Datetime'] = pd.to_datetime(daily['Date'])
+    return daily[['Datetime'] + DAILY_COLUMNS]
+
+
+def assert_daily(result, expected):
+    np.testing.assert_array_equal(result['Datetime'].to_numpy(), expected['Datetime'].to_numpy())
+    np.testing.assert_allclose(result[DAILY_COLUMNS].to_numpy(), expected[DAILY_COLUMNS].to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize("start_date", WINDOW_STARTS)
+@pytest.mark.parametrize("hours", [1, 24, 169])
+def test_last_hours_from_matches_mask(calculator, start_date, hours):
+    expected = mask_from(calculator.result, start_date).head(hours)
+    pd.testing.assert_frame_equal(calculator.get_last_hours_from(start_date, hours=hours).reset_index(drop=True),
+                                  expected.reset_index(drop=True))
+
+
+@pytest.mark.parametrize("start_date", WINDOW_STARTS)
+@pytest.mark.parametrize("days", [1, 3, 7, 40])
+def test_daily_aggregated_from_matches_mask(calculator, start_date, days):
+    expected = daily_groupby(mask_from(calculator.result, start_date)).head(days)
+    assert_daily(calculator.get_daily_aggregated_from(start_date, days=days), expected)
+
+
+@pytest.mark.parametrize("start_date", ["2020-01-01", "2021-03-27", "2022-10-30 12:00", "2023-12-29", "2024-01-05"])
+@pytest.mark.parametrize("days", [1, 7, 31])
+def test_daily_filtered_matches_mask(service, start_date, days):
+    expected = mask_from(service.get_daily_full(), start_date).head(days)
+    pd.testing.assert_frame_equal(service.get_daily_filtered(start_date, days).reset_index(drop=True),
+                                  expected.reset_index(drop=True))
+
+
+# --------------------------------------------------
+# Totales de ventana con sumas acumuladas
+# --------------------------------------------------
+def assert_totals(totals: dict, expected: pd.Series):
+    assert set(totals) == set(ENERGY_COLUMNS)
+    for col in ENERGY_COLUMNS:
+        assert totals[col] == pytest.approx(expected[col], rel=1e-12, abs=1e-9), col
+
+
+@pytest.mark.parametrize("start_date", WINDOW_STARTS)
+@pytest.mark.parametrize("hours", [1, 24, 169])
+def test_hourly_window_totals_match_sum(calculator, start_date, hours):
+    expected = mask_from(calculator.result, start_date).head(hours)[ENERGY_COLUMNS].sum()
+    assert_totals(calculator.get_window_totals(start_date, hours=hours), expected)
+
+
+@pytest.mark.parametrize("start_date", WINDOW_STARTS)
+@pytest.mark.parametrize("days", [1, 3, 7])
+def test_daily_window_totals_stop_at_day_boundary(calculator, start_date, days):
+    """
+    La ventana de `days` días acaba a medianoche aunque empiece a media jornada
+    (los días se cuentan desde el de la primera fila, como get_daily_aggregated_from)
+    """
+    window = mask_from(calculator.result, start_date)
+    if len(window):
+        end = window['Datetime'].iloc[0].floor('D') + pd.Timedelta(days=days)
+        window = window[window['Datetime'] < end]
+    expected = window[ENERGY_COLUMNS].sum()
+    assert_totals(calculator.get_window_totals(start_date, days=days), expected)
+
+
+@pytest.mark.parametrize("start_date", ["2020-01-01", "2021-03-27", "2023-12-29", "2024-01-05"])
+@pytest.mark.parametrize("days", [1, 7, 31])
+def test_service_window_totals_match_daily_sum(service, start_date, days):
+    expected = mask_from(service.get_daily_full(), start_date).head(days)[ENERGY_COLUMNS].sum()
+    assert_totals(service.get_daily_window_totals(start_date, days), expected)
+
+
+def test_totals_many_matches_each_window(calculator):
+    daily = calculator.get_daily_aggregated_all()
+    cumulative = CumulativeTotals(daily)
+    starts = np.array([0, 0, 5, 30, len(daily) - 1, len(daily) + 3])
+    stops = starts + np.array([0, 7, 1, 31, 7, 2])
+
+    many = cumulative.totals_many(starts, stops)
+    for row, (start, stop) in enumerate(zip(starts, stops)):
+        expected = daily.iloc[start:stop][ENERGY_COLUMNS].sum()
+        assert_totals(many.iloc[row].to_dict(), expected)
+
+
+# --------------------------------------------------
+# Cubo semana / mes / año (frente a resample)
+# --------------------------------------------------
+RESAMPLE_FREQ = {"W": "W-SUN", "M": "ME", "Y": "YE"}
+
+
+def resample_from(daily, level, start_date=None):
+    if start_date is not None:
+        daily = mask_from(daily, start_date)
+    columns = [col for col in daily.columns if col != 'Datetime']
+    return daily.set_index('Datetime')[columns].resample(RESAMPLE_FREQ[level]).sum().reset_index()
+
+
+def assert_rollup(result, expected):
+    np.testing.assert_array_equal(result['Datetime'].to_numpy(), expected['Datetime'].to_numpy())
+    columns = [col for col in expected.columns if col != 'Datetime']
+    np.testing.assert_allclose(result[columns].to_numpy(), expected[columns].to_numpy(), rtol=1e-12, atol=1e-9)
+
+
+@pytest.mark.parametrize("level", ["W", "M", "Y"])
+@pytest.mark.parametrize("start_date", [None, "2021-12-02", "2021-12-15", "2022-01-01", "2022-01-31", "2022-02-14"])
+def test_rollup_cube_matches_resample(calculator, level, start_date):
+    daily = calculator.get_daily_aggregated_all()
+    cube = RollupCube(daily, columns=DAILY_COLUMNS)
+    assert_rollup(cube.query(level, start_date=start_date), resample_from(daily, level, start_date))
+
+
+@pytest.mark.parametrize("period", ["W", "M", "Y"])
+@pytest.mark.parametrize("start_date", [None, "2020-01-01", "2021-03-27", "2022-10-30", "2023-12-29"])
+def test_service_aggregated_surplus_matches_resample(service, period, start_date):
+    result = service.get_aggregated_surplus(start_date=start_date, period=period)
+    assert_rollup(result, resample_from(service.get_daily_full(), period, start_date))
+
+
+# --------------------------------------------------
+# Diario por ordinales de día (frente a groupby sobre dt.date)
+# --------------------------------------------------
+def test_daily_aggregated_all_matches_groupby(calculator):
+    assert_daily(calculator.get_daily_aggregated_all(), daily_groupby(calculator.result))
+
+
+@pytest.mark.parametrize("hours", [1, 5, 24, 100, 168, 24 * 200])
+def test_daily_aggregated_last_hours_matches_groupby(calculator, hours):
+    expected = daily_groupby(calculator.result.tail(hours)).tail(7)
+    assert_daily(calculator.get_daily_aggregated(hours), expected)
+
+
+def test_daily_aggregation_skips_missing_days(calculator):
+    """Días sin filas no aparecen (como groupby), aunque la serie tenga huecos"""
+    result = calculator.result
+    day = result['Datetime'].dt.floor('D')
+    gappy = result[(day != pd.Timestamp("2021-12-25")) & (day != pd.Timestamp("2022-01-10"))]
+    gappy_calculator = SurplusCalculator.from_result(gappy)
+    assert_daily(gappy_calculator.get_daily_aggregated_all(), daily_groupby(gappy))
+    assert_daily(gappy_calculator.get_daily_aggregated_from("2021-12-24 12:00", days=3),
+                 daily_groupby(mask_from(gappy, "2021-12-24 12:00")).head(3))
+
+
+def test_service_daily_full_matches_groupby(service):
+    assert_daily(service.get_daily_full(), daily_groupby(service.surplus_calculator.result))
+
+
+# --------------------------------------------------
+# Modo compacto (float32, índice implícito) frente al normal
+# --------------------------------------------------
+# Redondeo a float32: error relativo ≤ 2^-24 por valor; las sumas (en float64, de
+# valores ≥ 0) acumulan como mucho ese mismo error relativo
+FLOAT32_RTOL = 1e-7
+
+
+@pytest.fixture(scope="module")
+def compact_calculator(frames):
+    calculator = SurplusCalculator(*frames, compact=True)
+    calculator.calculate()
+    assert calculator.is_compact
+    return calculator
+
+
+def assert_close_frames(result, expected, rtol=FLOAT32_RTOL):
+    assert list(result.columns) == list(expected.columns)
+    np.testing.assert_array_equal(result['Datetime'].to_numpy(), expected['Datetime'].to_numpy())
+    for col in expected.columns.drop('Datetime'):
+        np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), rtol=rtol, err_msg=col)
+
+
+def test_compact_result_matches_normal(compact_calculator, calculator):
+    assert len(compact_calculator) == len(calculator)
+    assert_close_frames(compact_calculator.result.reset_index(drop=True), calculator.result)
+    assert compact_calculator.get_date_range() == calculator.get_date_range()
+
+
+@pytest.mark.parametrize("start_date", WINDOW_STARTS)
+def test_compact_windows_match_normal(compact_calculator, calculator, start_date):
+    assert_close_frames(compact_calculator.get_last_hours_from(start_date, hours=50).reset_index(drop=True),
+                        calculator.get_last_hours_from(start_date, hours=50).reset_index(drop=True))
+    assert_close_frames(compact_calculator.get_daily_aggregated_from(start_date, days=7),
+                        calculator.get_daily_aggregated_from(start_date, days=7))
+
+    for kwargs in ({"hours": 30}, {"days": 3}):
+        compact_totals = compact_calculator.get_window_totals(start_date, **kwargs)
+        totals = calculator.get_window_totals(start_date, **kwargs)
+        assert compact_totals == pytest.approx(totals, rel=FLOAT32_RTOL, abs=1e-9)
+
+
+def test_compact_daily_matches_normal(compact_calculator, calculator):
+    assert_close_frames(compact_calculator.get_daily_aggregated_all(), calculator.get_daily_aggregated_all())
+    assert_close_frames(compact_calculator.get_daily_aggregated(100).reset_index(drop=True),
+                        calculator.get_daily_aggregated(100).reset_index(drop=True))
+    assert_close_frames(compact_calculator.get_last_hours(30).reset_index(drop=True),
+                        calculator.get_last_hours(30).reset_index(drop=True))
+
+
+def test_compact_service_matches_normal(service):
+    compact_service = EnergyDataService(compact_hourly=True)
+    compact_service.load_data()
+    assert compact_service.surplus_calculator.is_compact
+    assert_close_frames(compact_service.get_daily_full(), service.get_daily_full())
+    for period in ("W", "M", "Y"):
+        assert_close_frames(compact_service.get_aggregated_surplus("2021-03-27", period=period),
+                            service.get_aggregated_surplus("2021-03-27", period=period))
@@ -0,0 +1,66 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.optimization import sweep
+from src.optimization.sweep import run_sweep, sweep_combinations, sweep_frame
+
+
+PV_FACTOR = 0.05
+
+
+def sweep_arrays(days=20, seed=0):
+    """Series horarias sintéticas con la forma de build_sweep_arrays (intensidad con huecos)"""
+    rng = np.random.default_rng(seed)
+    hours = np.arange(24 * days)
+    demand = rng.uniform(300.0, 900.0, len(hours))
+    production = np.maximum(np.sin((hours % 24 - 6) / 12 * np.pi), 0.0) * rng.uniform(0.0, 2500.0, len(hours))
+    intensity = np.repeat(rng.uniform(0.1, 0.4, days), 24)
+    intensity[24 * 3:24 * 5] = np.nan
+    return {'Demand': demand, 'Production': production, 'Intensity': intensity}
+
+
+@pytest.fixture
+def segments(monkeypatch):
+    """Nombres de los bloques de memoria compartida que crea run_sweep"""
+    names = []
+
+    class RecordingArrays(sweep.SharedHourlyArrays):
+        def __init__(self, arrays):
+            super().__init__(arrays)
+            names.append(self.spec[0])
+
+    monkeypatch.setattr(sweep, "SharedHourlyArrays", RecordingArrays)
+    return names
+
+
+def assert_unlinked(names):
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+COMBINATIONS = sweep_combinations([0.5, 1.5], [0.0, 2000.0], [0.0, 1000.0])
+
+
+def test_parallel_matches_serial(segments):
+    arrays = sweep_arrays()
+    serial = sweep_frame(run_sweep(arrays, PV_FACTOR, COMBINATIONS, workers=1))
+    parallel = sweep_frame(run_sweep(arrays, PV_FACTOR, COMBINATIONS, workers=2, chunk_size=3))
+
+    assert len(parallel) == len(COMBINATIONS)
+    # Mismo cálculo en otro proceso: resultados idénticos, no solo cercanos
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert len(segments) == 1
+    assert_unlinked(segments)
+
+
+def test_closing_early_unlinks_segment(segments):
+    rows = run_sweep(sweep_arrays(), PV_FACTOR, COMBINATIONS, workers=2, chunk_size=1)
+    next(rows)
+    rows.close()
+
+    assert len(segments) == 1
+    assert_unlinked(segments)